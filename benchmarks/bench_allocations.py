@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from lumyn.core.decide import DecisionEngine, LumynConfig
+
+
+def _transcript(turns: int) -> list[dict[str, str]]:
+    return [
+        {"role": "user" if t % 2 == 0 else "agent", "text": f"turn {t}: " + "lorem ipsum " * 20}
+        for t in range(turns)
+    ]
+
+
+def _request(i: int, *, transcript_turns: int) -> dict[str, object]:
+    digest = "sha256:" + f"{i:064x}"[-64:]
+    return {
+        "schema_version": "decision_request.v0",
+        "subject": {"type": "service", "id": "support-agent", "tenant_id": "acme"},
+        "action": {
+            "type": "support.refund",
+            "intent": "Refund duplicate charge for order 82731",
+            "amount": {"value": 42.5, "currency": "USD"},
+            "tags": ["duplicate_charge"],
+        },
+        "evidence": {
+            "ticket_id": "ZD-1001",
+            "order_id": "82731",
+            "customer_id": "C-9",
+            "history": _transcript(transcript_turns),
+        },
+        "context": {
+            "mode": "inline",
+            "digest": digest,
+            "inline": {
+                "transcript": _transcript(transcript_turns),
+                "notes": _transcript(transcript_turns),
+            },
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=200, help="Transcript turns per request.")
+    parser.add_argument("--db", type=Path, help="SQLite file (default: a temporary one).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _run(args, db=args.db or Path(tmp) / "bench_alloc.db")
+
+
+def _run(args: argparse.Namespace, *, db: Path) -> None:
+    cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=db)
+    engine = DecisionEngine(cfg)
+    requests = [_request(i, transcript_turns=args.turns) for i in range(args.n + 1)]
+    engine.decide(requests[-1])  # warm policy, schema and statement caches
+
+    # Only allocations made while deciding are traced (the requests are built up front).
+    # `live` is what each decision keeps alive (mostly the returned record); `peak` is the
+    # transient high-water mark above that while the decision runs, i.e. the copies.
+    tracemalloc.start()
+    peaks: list[int] = []
+    records = []
+    before = tracemalloc.take_snapshot()
+    for i in range(args.n):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        records.append(engine.decide(requests[i]))
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - current)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    blocks = sum(s.count_diff for s in stats)
+    size = sum(s.size_diff for s in stats)
+    engine.close()
+
+    print(f"n={len(records)} turns={args.turns}")
+    print(f"live_blocks_per_decision={blocks / args.n:.0f}")
+    print(f"live_kib_per_decision={size / args.n / 1024:.1f}")
+    print(f"peak_kib_per_decision={sum(peaks) / len(peaks) / 1024:.1f}")
+
+
+if __name__ == "__main__":
+    main()
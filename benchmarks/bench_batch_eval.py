@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any
+
+from lumyn.engine.batch import evaluate_normalized_batch, evaluate_policy_batch
+from lumyn.engine.compiler import cached_compile_policy
+from lumyn.engine.evaluator import evaluate_policy
+from lumyn.engine.normalize import normalize_request
+from lumyn.policy.loader import load_policy
+
+
+def _requests(n: int, *, seed: int) -> list[dict[str, Any]]:
+    bases = [
+        json.loads(p.read_text(encoding="utf-8"))["request"]
+        for p in sorted(Path("vectors/v0").rglob("*.json"))
+    ]
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        base = rng.choice(bases)
+        evidence = {
+            **(base.get("evidence") or {}),
+            "chargeback_risk": round(rng.random(), 3),
+            "customer_age_days": rng.randrange(0, 2000),
+            "previous_refund_count_90d": rng.randrange(0, 8),
+        }
+        amount = {"value": round(rng.uniform(1, 2000), 2), "currency": "USD"}
+        out.append({**base, "action": {**base["action"], "amount": amount}, "evidence": evidence})
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--policy", default="policies/lumyn-support.v0.yml")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    loaded = load_policy(args.policy)
+    policy = dict(loaded.policy)
+    requests = _requests(args.n, seed=args.seed)
+
+    t0 = time.perf_counter()
+    row_verdicts = [
+        evaluate_policy(r, policy=policy, policy_hash=loaded.policy_hash).verdict for r in requests
+    ]
+    row_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = evaluate_policy_batch(requests, policy=policy, policy_hash=loaded.policy_hash)
+    batch_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch.results()
+    results_s = time.perf_counter() - t0
+
+    # Evaluation alone, on requests normalized up front (e.g. several candidate policies
+    # replayed over the same history).
+    rows = [normalize_request(r) for r in requests]
+    program = cached_compile_policy(policy, policy_hash=loaded.policy_hash)
+    t0 = time.perf_counter()
+    for n in rows:
+        program.evaluate(n)
+    row_eval_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    evaluate_normalized_batch(rows, policy=policy, policy_hash=loaded.policy_hash)
+    batch_eval_s = time.perf_counter() - t0
+
+    assert list(batch.verdicts) == row_verdicts
+    print(f"requests={args.n} policy={args.policy}")
+    print(f"row_by_row_rows_per_s={args.n / row_s:.0f}")
+    print(f"batch_verdicts_rows_per_s={args.n / batch_s:.0f} speedup={row_s / batch_s:.1f}x")
+    print(f"batch_full_results_rows_per_s={args.n / (batch_s + results_s):.0f}")
+    print(
+        f"pre_normalized_row_by_row_rows_per_s={args.n / row_eval_s:.0f} "
+        f"batch_rows_per_s={args.n / batch_eval_s:.0f} speedup={row_eval_s / batch_eval_s:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,8 @@ import statistics
 import time
 from pathlib import Path
 
-from lumyn.core.decide import LumynConfig, decide
+from lumyn.core.decide import DecisionEngine, LumynConfig, decide
+from lumyn.store.sqlite import SqliteStore
 
 
 def _request(i: int) -> dict[str, object]:
@@ -36,21 +37,59 @@ def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--n", type=int, default=200)
     parser.add_argument("--db", type=Path, default=Path(".lumyn/bench.db"))
+    parser.add_argument(
+        "--engine",
+        action="store_true",
+        help="Reuse one DecisionEngine instead of calling the stateless decide() wrapper.",
+    )
+    parser.add_argument(
+        "--persistence",
+        choices=["sync", "group_commit", "enqueue"],
+        default="sync",
+        help="Write path for decision records (write-behind modes imply --engine).",
+    )
+    parser.add_argument(
+        "--no-pool",
+        action="store_true",
+        help="Open a new SQLite connection per store call (pre-pooling behavior).",
+    )
     args = parser.parse_args()
+    if args.persistence != "sync":
+        args.engine = True
 
-    cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=args.db)
+    cfg = LumynConfig(
+        policy_path="policies/lumyn-support.v0.yml",
+        store_path=args.db,
+        persistence=args.persistence,
+    )
+    pooled = not args.no_pool
+    engine = DecisionEngine(cfg, store=SqliteStore(args.db, pooled=pooled)) if args.engine else None
 
     timings: list[float] = []
+    connections = 0
     for i in range(args.n):
         start = time.perf_counter()
-        decide(_request(i), config=cfg)
+        if engine is not None:
+            engine.decide(_request(i))
+        else:
+            # Mirror the stateless wrapper: a fresh store per call.
+            store = SqliteStore(args.db, pooled=pooled)
+            decide(_request(i), config=cfg, store=store)
+            connections += store.connections_opened
+            store.close()
         timings.append(time.perf_counter() - start)
+    if engine is not None:
+        engine.close()
+        connections = engine.store.connections_opened
+        engine.store.close()
 
     ms = [t * 1000.0 for t in timings]
-    print(f"n={len(ms)} db={args.db}")
+    print(f"n={len(ms)} db={args.db} engine={args.engine} pooled={pooled}")
+    print(f"persistence={args.persistence}")
     print(f"p50_ms={_percentile(ms, 0.50):.2f}")
     print(f"p95_ms={_percentile(ms, 0.95):.2f}")
     print(f"mean_ms={statistics.mean(ms):.2f}")
+    print(f"connections_per_decision={connections / max(1, len(ms)):.2f}")
 
 
 if __name__ == "__main__":
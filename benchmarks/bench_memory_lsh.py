@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from lumyn.engine.similarity import LshConfig, feature_tokens
+from lumyn.store.sqlite import SqliteStore
+
+ACTION_TYPE = "support.refund"
+
+
+def _feature(rng: random.Random, *, tags: int) -> dict[str, Any]:
+    return {
+        "action_type": ACTION_TYPE,
+        "amount_currency": rng.choice(["USD", "EUR", "GBP"]),
+        "amount_usd_bucket": rng.choice(["small", "medium", "large"]),
+        "tags": sorted({f"tag_{rng.randrange(tags)}" for _ in range(rng.randint(2, 8))}),
+    }
+
+
+def _near(rng: random.Random, feature: dict[str, Any], *, tags: int) -> dict[str, Any]:
+    near_tags = list(feature["tags"])
+    near_tags[rng.randrange(len(near_tags))] = f"tag_{rng.randrange(tags)}"
+    return {**feature, "tags": sorted(set(near_tags))}
+
+
+def _ms(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"p50={statistics.median(ordered) * 1000:.2f}ms p95={p95 * 1000:.2f}ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--tags", type=int, default=500)
+    parser.add_argument("--num-perm", type=int, default=64)
+    parser.add_argument("--bands", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    lsh = LshConfig(num_perm=args.num_perm, bands=args.bands)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SqliteStore(Path(tmp) / "bench.db", lsh=lsh)
+        store.init()
+        # Register the config up front so inserts pay for bucketing, as in LSH deployments.
+        store.index_memory_lsh()
+        features = [_feature(rng, tags=args.tags) for _ in range(args.n)]
+        t0 = time.perf_counter()
+        for i, feature in enumerate(features):
+            store.add_memory_item(
+                tenant_id=None,
+                label=rng.choice(["failure", "success"]),
+                action_type=ACTION_TYPE,
+                feature=feature,
+                summary=f"item {i}",
+                source_decision_id=None,
+            )
+        insert_s = time.perf_counter() - t0
+
+        # Queries are near-duplicates of stored items (one tag swapped), the case LSH targets.
+        queries = [_near(rng, rng.choice(features), tags=args.tags) for _ in range(args.queries)]
+        exact_s: list[float] = []
+        lsh_s: list[float] = []
+        recall: list[float] = []
+        for query in queries:
+            t0 = time.perf_counter()
+            exact = store.top_k_memory_matches(
+                tenant_id=None,
+                action_type=ACTION_TYPE,
+                tokens=feature_tokens(query),
+                top_k=args.top_k,
+            )
+            exact_s.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            approx = store.approximate_top_k_memory_matches(
+                tenant_id=None, action_type=ACTION_TYPE, query_feature=query, top_k=args.top_k
+            )
+            lsh_s.append(time.perf_counter() - t0)
+            # Recall by score, so ties broken differently by the two paths still count.
+            cutoff = exact[-1].score if exact else 0.0
+            hits = sum(1 for m in approx if m.score >= cutoff)
+            recall.append(min(hits, len(exact)) / len(exact) if exact else 1.0)
+
+    print(f"items={args.n} queries={args.queries} top_k={args.top_k} lsh={lsh.key}")
+    print(f"insert_items_per_s={args.n / insert_s:.0f}")
+    print(f"exact {_ms(exact_s)}")
+    print(f"lsh {_ms(lsh_s)}")
+    print(f"recall_at_{args.top_k}={statistics.fmean(recall):.3f}")
+
+
+if __name__ == "__main__":
+    main()
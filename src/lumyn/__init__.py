@@ -1,4 +1,19 @@
-from lumyn.core.decide import LumynConfig, decide, decide_v0, decide_v1
+from lumyn.core.decide import (
+    DecisionEngine,
+    LumynConfig,
+    decide,
+    decide_many,
+    decide_v0,
+    decide_v1,
+)
 from lumyn.version import __version__
 
-__all__ = ["LumynConfig", "__version__", "decide", "decide_v0", "decide_v1"]
+__all__ = [
+    "DecisionEngine",
+    "LumynConfig",
+    "__version__",
+    "decide",
+    "decide_many",
+    "decide_v0",
+    "decide_v1",
+]
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 from fastapi import FastAPI
 
+from lumyn.api.executor import DecisionExecutor
 from lumyn.api.routes_v0 import ApiV0Deps, build_routes_v0
 from lumyn.api.routes_v1 import ApiV1Deps, build_routes_v1
 from lumyn.config import Settings, load_settings, storage_path_from_url
-from lumyn.core.decide import LumynConfig
+from lumyn.core.decide import DecisionEngine, LumynConfig
 from lumyn.store.sqlite import SqliteStore
 from lumyn.telemetry.logging import configure_logging
 from lumyn.version import __version__
@@ -20,31 +24,70 @@ def create_app(*, settings: Settings | None = None) -> FastAPI:
     store_path = storage_path_from_url(settings.lumyn.storage_url)
     store = SqliteStore(store_path)
 
+    config = LumynConfig(
+        policy_path=settings.lumyn.policy_path,
+        store_path=store_path,
+        top_k=settings.lumyn.top_k,
+        mode=settings.lumyn.mode,
+        redaction_profile=settings.lumyn.redaction_profile,
+        persistence=settings.lumyn.persistence,
+        evaluation_memo_size=settings.lumyn.evaluation_memo_size,
+        evaluation_memo_ttl_seconds=settings.lumyn.evaluation_memo_ttl_seconds,
+        evaluation_mode=settings.lumyn.evaluation_mode,
+        memory_refresh_interval_s=settings.lumyn.memory_refresh_interval_s,
+        # The engine's own memory handle: shutdown must not close stores other engines in
+        # the process share.
+        memory_shared=False,
+    )
+    # One engine per app: policy, store and memory handles stay warm across requests.
+    engine = DecisionEngine(config, store=store)
+    # Decisions block on SQLite/embedding/vector I/O; keep them off the event loop.
+    executor = DecisionExecutor(
+        workers=settings.service.decide_workers,
+        max_pending=settings.service.decide_max_pending,
+    )
+
     deps = ApiV0Deps(
-        config=LumynConfig(
-            policy_path=settings.lumyn.policy_path,
-            store_path=store_path,
-            top_k=settings.lumyn.top_k,
-            mode=settings.lumyn.mode,
-            redaction_profile=settings.lumyn.redaction_profile,
-        ),
+        config=config,
         store=store,
         signing_secret=settings.service.signing_secret,
+        engine=engine,
+        executor=executor,
     )
 
-    app = FastAPI(title="Lumyn", version=__version__)
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        # Pay policy/schema/embedding-model setup at startup rather than on the first request.
+        # A failure here is not fatal: the same error surfaces on the decide routes.
+        try:
+            engine.warmup()
+        except Exception as e:
+            logging.getLogger("lumyn").warning("engine warmup failed: %s", e)
+        yield
+        # Drain the write-behind queue (if any) so enqueued records are committed on shutdown,
+        # then release the pooled SQLite connections and the engine's memory table handle.
+        executor.shutdown()
+        engine.close()
+        store.close()
+
+    app = FastAPI(title="Lumyn", version=__version__, lifespan=lifespan)
     app.include_router(build_routes_v0(deps=deps))
 
     deps_v1 = ApiV1Deps(
         config=deps.config,
         store=deps.store,
         signing_secret=deps.signing_secret,
+        engine=engine,
+        executor=executor,
     )
     app.include_router(build_routes_v1(deps=deps_v1))
 
     @app.get("/healthz")
     def healthz() -> dict[str, Any]:
-        return {"ok": True}
+        health: dict[str, Any] = {"ok": True, "decide_executor": executor.stats()}
+        if engine.evaluation_memo is not None:
+            health["evaluation_memo"] = engine.evaluation_memo.stats()
+        return health
 
     return app
 
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, status
+
+T = TypeVar("T")
+
+
+class DecisionExecutorSaturated(RuntimeError):
+    pass
+
+
+class DecisionExecutor:
+    """
+    Bounded worker pool for blocking decision work (SQLite I/O, embedding, vector search).
+
+    Async route handlers await `run()` so the event loop only handles I/O and HMAC checks.
+    At most `max_pending` calls may be queued or running at once; further calls are rejected
+    immediately with `DecisionExecutorSaturated` instead of piling up behind slow decisions.
+    """
+
+    def __init__(self, *, workers: int = 8, max_pending: int = 64) -> None:
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise DecisionExecutorSaturated(
+                    f"decision queue is full ({self._pending}/{self.max_pending})"
+                )
+            self._pending += 1
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="lumyn-decide"
+                )
+            pool = self._pool
+        # Carry the caller's context (e.g. the current tracing span) into the worker thread.
+        ctx = contextvars.copy_context()
+        try:
+            future = pool.submit(ctx.run, self._call, fn, *args)
+        except BaseException:
+            self._finish()
+            raise
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _call(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _on_done(self, _: Future[Any]) -> None:
+        self._finish(completed=True)
+
+    def _finish(self, *, completed: bool = False) -> None:
+        with self._lock:
+            self._pending -= 1
+            if completed:
+                self._completed += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "completed_total": self._completed,
+                "rejected_total": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Wait for running decisions and stop the workers; a later `run()` starts new ones."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+async def run_decision(executor: DecisionExecutor, fn: Callable[..., T], *args: Any) -> T:
+    """Run `fn` on the decision executor, mapping saturation to HTTP 503."""
+    try:
+        return await executor.run(fn, *args)
+    except DecisionExecutorSaturated as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"reason_code": "DECISION_QUEUE_FULL"},
+            headers={"Retry-After": "1"},
+        ) from e
@@ -8,8 +8,8 @@ from fastapi import APIRouter, HTTPException, Request, status
 from jsonschema.exceptions import ValidationError
 
 from lumyn.api.auth import require_hmac_signature
-from lumyn.core.decide import LumynConfig, decide
-from lumyn.policy.loader import load_policy
+from lumyn.api.executor import DecisionExecutor, run_decision
+from lumyn.core.decide import DecisionEngine, LumynConfig
 from lumyn.store.sqlite import SqliteStore
 from lumyn.telemetry.tracing import start_span
 
@@ -19,10 +19,14 @@ class ApiV0Deps:
     config: LumynConfig
     store: SqliteStore
     signing_secret: str | None = None
+    engine: DecisionEngine | None = None
+    executor: DecisionExecutor | None = None
 
 
 def build_routes_v0(*, deps: ApiV0Deps) -> APIRouter:
     router = APIRouter()
+    engine = deps.engine or DecisionEngine(deps.config, store=deps.store)
+    executor = deps.executor or DecisionExecutor()
 
     @router.post("/v0/decide")
     async def post_decide(request: Request, payload: dict[str, Any]) -> dict[str, Any]:
@@ -35,7 +39,7 @@ def build_routes_v0(*, deps: ApiV0Deps) -> APIRouter:
                     provided=request.headers.get("X-Lumyn-Signature"),
                 )
             try:
-                return decide(payload, config=deps.config, store=deps.store)
+                return await run_decision(executor, engine.decide, payload)
             except ValidationError as e:
                 raise HTTPException(
                     status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e.message)
@@ -85,7 +89,7 @@ def build_routes_v0(*, deps: ApiV0Deps) -> APIRouter:
     @router.get("/v0/policy")
     def get_policy() -> dict[str, Any]:
         with start_span("http.get /v0/policy"):
-            loaded = load_policy(deps.config.policy_path)
+            loaded = engine.loaded_policy
             return {
                 "policy_id": loaded.policy["policy_id"],
                 "policy_version": loaded.policy["policy_version"],
@@ -98,4 +102,4 @@ def build_routes_v0(*, deps: ApiV0Deps) -> APIRouter:
 def make_default_deps(*, policy_path: str | Path, store_path: str | Path, top_k: int) -> ApiV0Deps:
     cfg = LumynConfig(policy_path=policy_path, store_path=store_path, top_k=top_k)
     store = SqliteStore(store_path)
-    return ApiV0Deps(config=cfg, store=store)
+    return ApiV0Deps(config=cfg, store=store, engine=DecisionEngine(cfg, store=store))
@@ -8,9 +8,9 @@ from jsonschema import Draft202012Validator
 from jsonschema.exceptions import ValidationError
 
 from lumyn.api.auth import require_hmac_signature
-from lumyn.core.decide import LumynConfig, decide_v1
+from lumyn.api.executor import DecisionExecutor, run_decision
+from lumyn.core.decide import DecisionEngine, LumynConfig
 from lumyn.migrate.v0_v1 import decision_record_v0_to_v1
-from lumyn.policy.loader import load_policy
 from lumyn.schemas.loaders import load_json_schema
 from lumyn.store.sqlite import SqliteStore
 from lumyn.telemetry.tracing import start_span
@@ -21,13 +21,21 @@ class ApiV1Deps:
     config: LumynConfig
     store: SqliteStore
     signing_secret: str | None = None
+    engine: DecisionEngine | None = None
+    executor: DecisionExecutor | None = None
 
 
 def build_routes_v1(*, deps: ApiV1Deps) -> APIRouter:
     router = APIRouter()
+    engine = deps.engine or DecisionEngine(deps.config, store=deps.store)
+    executor = deps.executor or DecisionExecutor()
     request_schema = load_json_schema("schemas/decision_request.v1.schema.json")
     request_validator = Draft202012Validator(request_schema)
 
+    def _validate_and_decide(payload: dict[str, Any]) -> dict[str, Any]:
+        request_validator.validate(payload)
+        return engine.decide_v1(payload)
+
     @router.post("/v1/decide")
     async def post_decide(request: Request, payload: dict[str, Any]) -> dict[str, Any]:
         with start_span("http.post /v1/decide"):
@@ -39,13 +47,7 @@ def build_routes_v1(*, deps: ApiV1Deps) -> APIRouter:
                     provided=request.headers.get("X-Lumyn-Signature"),
                 )
             try:
-                request_validator.validate(payload)
-                record_v1 = decide_v1(
-                    payload,
-                    config=deps.config,
-                    store=deps.store,
-                )
-                return record_v1
+                return await run_decision(executor, _validate_and_decide, payload)
             except ValidationError as e:
                 raise HTTPException(
                     status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e.message)
@@ -74,7 +76,7 @@ def build_routes_v1(*, deps: ApiV1Deps) -> APIRouter:
     @router.get("/v1/policy")
     def get_policy() -> dict[str, Any]:
         with start_span("http.get /v1/policy"):
-            loaded = load_policy(deps.config.policy_path)
+            loaded = engine.loaded_policy
             return {
                 "policy_id": loaded.policy["policy_id"],
                 "policy_version": loaded.policy["policy_version"],
@@ -47,6 +47,7 @@ def main(
     typer.echo("ok")
     typer.echo(f"workspace: {paths.workspace}")
     typer.echo(f"policy_hash: {loaded.policy_hash}")
+    typer.echo(f"schema_version: {store.schema_version()}")
     typer.echo(f"decisions: {stats.decisions}")
     typer.echo(f"decision_events: {stats.decision_events}")
     typer.echo(f"memory_items: {stats.memory_items}")
@@ -7,7 +7,7 @@ import typer
 
 from lumyn.engine.normalize import normalize_request
 from lumyn.engine.normalize_v1 import normalize_request_v1
-from lumyn.memory.client import MemoryStore
+from lumyn.memory.client import get_memory_store
 from lumyn.memory.embed import ProjectionLayer
 from lumyn.memory.types import Experience, Verdict
 from lumyn.store.sqlite import SqliteStore
@@ -144,7 +144,7 @@ def main(
             original_verdict=original_verdict,
             timestamp=timestamp,
         )
-        mem_store = MemoryStore(db_path=paths.workspace / "memory")
+        mem_store = get_memory_store(paths.workspace / "memory")
         mem_store.add_experiences([exp])
 
     typer.echo(f"event_id: {event_id}")
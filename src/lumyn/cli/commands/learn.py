@@ -6,7 +6,7 @@ import typer
 from rich.console import Console
 
 from lumyn.engine.normalize_v1 import normalize_request_v1
-from lumyn.memory.client import MemoryStore
+from lumyn.memory.client import get_memory_store
 from lumyn.memory.embed import ProjectionLayer
 from lumyn.memory.types import Experience
 
@@ -60,7 +60,7 @@ def main(
         timestamp=timestamp,
     )
 
-    mem = MemoryStore(db_path=memory_path)
+    mem = get_memory_store(memory_path)
     mem.add_experiences([exp])
 
     console.print(f"[green]Learned from {decision_id}[/green]")
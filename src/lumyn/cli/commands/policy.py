@@ -5,6 +5,8 @@ from pathlib import Path
 import typer
 
 from lumyn.policy.loader import load_policy
+from lumyn.policy.validate import analyze_policy
+from lumyn.schemas.loaders import load_json_schema
 
 from ..util import die, resolve_workspace_paths
 
@@ -31,3 +33,38 @@ def validate(
     typer.echo(f"policy_id: {loaded.policy['policy_id']}")
     typer.echo(f"policy_version: {loaded.policy['policy_version']}")
     typer.echo(f"policy_hash: {loaded.policy_hash}")
+
+
+@app.command("analyze")
+def analyze(
+    *,
+    workspace: Path = typer.Option(Path(".lumyn"), "--workspace", help="Workspace directory."),
+    path: Path | None = typer.Option(
+        None,
+        "--path",
+        help="Policy path (defaults to workspace policy.yml).",
+    ),
+) -> None:
+    """List rules that can never fire (pruned at compile time) or never change a verdict."""
+    paths = resolve_workspace_paths(workspace)
+    policy_path = path or paths.policy_path
+    if not policy_path.exists():
+        die(f"policy not found: {policy_path}")
+
+    loaded = load_policy(policy_path)
+    version = "v1" if str(loaded.policy.get("schema_version")).startswith("policy.v1") else "v0"
+    analysis = analyze_policy(
+        loaded.policy,
+        request_schema=load_json_schema(f"schemas/decision_request.{version}.schema.json"),
+    )
+    pruned = [f for f in analysis.findings if f.pruned]
+    reported = [f for f in analysis.findings if not f.pruned]
+
+    typer.echo(f"policy_id: {loaded.policy['policy_id']}")
+    typer.echo(f"policy_hash: {loaded.policy_hash}")
+    typer.echo(f"pruned_rules: {len(pruned)}")
+    for finding in pruned:
+        typer.echo(f"- {finding.rule_id} [{finding.kind}] {finding.detail}")
+    typer.echo(f"warnings: {len(reported)}")
+    for finding in reported:
+        typer.echo(f"- {finding.rule_id} [{finding.kind}] {finding.detail}")
@@ -38,7 +38,15 @@ def main(
     typer.echo(f"mode: {settings.lumyn.mode}")
     typer.echo(f"redaction_profile: {settings.lumyn.redaction_profile}")
     typer.echo(f"top_k: {settings.lumyn.top_k}")
+    typer.echo(f"persistence: {settings.lumyn.persistence}")
+    memo_size = settings.lumyn.evaluation_memo_size
+    typer.echo(f"evaluation_memo: {memo_size if memo_size > 0 else 'disabled'}")
+    typer.echo(f"evaluation_mode: {settings.lumyn.evaluation_mode}")
     typer.echo(f"signing: {'enabled' if settings.service.signing_secret else 'disabled'}")
+    typer.echo(
+        f"decide_workers: {settings.service.decide_workers} "
+        f"(max_pending: {settings.service.decide_max_pending})"
+    )
 
     if dry_run:
         typer.echo(
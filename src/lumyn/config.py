@@ -14,11 +14,19 @@ class LumynSettings:
     mode: str
     redaction_profile: str
     top_k: int
+    persistence: str = "sync"
+    evaluation_memo_size: int = 0
+    evaluation_memo_ttl_seconds: float = 60.0
+    evaluation_mode: str = "full"
+    # Seconds a served engine may miss experiences other processes add to memory.
+    memory_refresh_interval_s: float = 1.0
 
 
 @dataclass(frozen=True, slots=True)
 class ServiceSettings:
     signing_secret: str | None
+    decide_workers: int = 8
+    decide_max_pending: int = 64
 
 
 @dataclass(frozen=True, slots=True)
@@ -55,6 +63,44 @@ def _env_get(env: Mapping[str, str], key: str) -> str | None:
     return value if value != "" else None
 
 
+def _int_setting(env: Mapping[str, str], key: str, default: object, *, minimum: int) -> int:
+    raw = _env_get(env, key) or str(default)
+    try:
+        value = int(raw)
+    except ValueError as e:
+        raise ValueError(f"{key} must be an integer") from e
+    if value < minimum:
+        raise ValueError(f"{key} must be >= {minimum}")
+    return value
+
+
+def _positive_int_setting(env: Mapping[str, str], key: str, default: object) -> int:
+    return _int_setting(env, key, default, minimum=1)
+
+
+def _non_negative_int_setting(env: Mapping[str, str], key: str, default: object) -> int:
+    return _int_setting(env, key, default, minimum=0)
+
+
+def _float_setting(env: Mapping[str, str], key: str, default: object, *, allow_zero: bool) -> float:
+    raw = _env_get(env, key) or str(default)
+    try:
+        value = float(raw)
+    except ValueError as e:
+        raise ValueError(f"{key} must be a number") from e
+    if value < 0 or (value == 0 and not allow_zero):
+        raise ValueError(f"{key} must be {'>=' if allow_zero else '>'} 0")
+    return value
+
+
+def _positive_float_setting(env: Mapping[str, str], key: str, default: object) -> float:
+    return _float_setting(env, key, default, allow_zero=False)
+
+
+def _non_negative_float_setting(env: Mapping[str, str], key: str, default: object) -> float:
+    return _float_setting(env, key, default, allow_zero=True)
+
+
 def load_settings(
     *,
     config_path: Path | None = None,
@@ -68,9 +114,16 @@ def load_settings(
         "mode": "enforce",
         "redaction_profile": "default",
         "top_k": 5,
+        "persistence": "sync",
+        "evaluation_memo_size": 0,
+        "evaluation_memo_ttl_seconds": 60.0,
+        "evaluation_mode": "full",
+        "memory_refresh_interval_s": 1.0,
     }
     service_defaults: dict[str, object] = {
         "signing_secret": "",
+        "decide_workers": 8,
+        "decide_max_pending": 64,
     }
 
     config_file_path = config_path
@@ -103,18 +156,44 @@ def load_settings(
     if redaction_profile not in {"default", "strict", "off"}:
         raise ValueError("LUMYN_REDACTION_PROFILE must be default|strict|off")
 
-    top_k_raw = _env_get(env, "LUMYN_TOP_K") or str(lumyn_defaults["top_k"])
-    try:
-        top_k = int(top_k_raw)
-    except ValueError as e:
-        raise ValueError("LUMYN_TOP_K must be an integer") from e
-    if top_k < 0:
-        raise ValueError("LUMYN_TOP_K must be >= 0")
+    top_k = _non_negative_int_setting(env, "LUMYN_TOP_K", lumyn_defaults["top_k"])
+
+    persistence = (
+        (_env_get(env, "LUMYN_PERSISTENCE") or str(lumyn_defaults["persistence"])).strip().lower()
+    )
+    if persistence not in {"sync", "group_commit", "enqueue"}:
+        raise ValueError("LUMYN_PERSISTENCE must be sync|group_commit|enqueue")
+
+    evaluation_memo_size = _non_negative_int_setting(
+        env, "LUMYN_EVALUATION_MEMO_SIZE", lumyn_defaults["evaluation_memo_size"]
+    )
+    evaluation_memo_ttl_seconds = _positive_float_setting(
+        env, "LUMYN_EVALUATION_MEMO_TTL_SECONDS", lumyn_defaults["evaluation_memo_ttl_seconds"]
+    )
+
+    evaluation_mode = (
+        (_env_get(env, "LUMYN_EVALUATION_MODE") or str(lumyn_defaults["evaluation_mode"]))
+        .strip()
+        .lower()
+    )
+    if evaluation_mode not in {"full", "verdict_only"}:
+        raise ValueError("LUMYN_EVALUATION_MODE must be full|verdict_only")
+
+    memory_refresh_interval_s = _non_negative_float_setting(
+        env, "LUMYN_MEMORY_REFRESH_INTERVAL_S", lumyn_defaults["memory_refresh_interval_s"]
+    )
 
     signing_secret = _env_get(env, "LUMYN_SIGNING_SECRET")
     if signing_secret is None:
         signing_secret = str(service_defaults["signing_secret"]).strip() or None
 
+    decide_workers = _positive_int_setting(
+        env, "LUMYN_DECIDE_WORKERS", service_defaults["decide_workers"]
+    )
+    decide_max_pending = _positive_int_setting(
+        env, "LUMYN_DECIDE_MAX_PENDING", service_defaults["decide_max_pending"]
+    )
+
     return Settings(
         lumyn=LumynSettings(
             storage_url=storage_url,
@@ -122,6 +201,15 @@ def load_settings(
             mode=mode,
             redaction_profile=redaction_profile,
             top_k=top_k,
+            persistence=persistence,
+            evaluation_memo_size=evaluation_memo_size,
+            evaluation_memo_ttl_seconds=evaluation_memo_ttl_seconds,
+            evaluation_mode=evaluation_mode,
+            memory_refresh_interval_s=memory_refresh_interval_s,
+        ),
+        service=ServiceSettings(
+            signing_secret=signing_secret,
+            decide_workers=decide_workers,
+            decide_max_pending=decide_max_pending,
         ),
-        service=ServiceSettings(signing_secret=signing_secret),
     )
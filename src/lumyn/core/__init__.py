@@ -1,3 +1,10 @@
-from lumyn.core.decide import LumynConfig, decide, decide_v0, decide_v1
+from lumyn.core.decide import (
+    DecisionEngine,
+    LumynConfig,
+    decide,
+    decide_many,
+    decide_v0,
+    decide_v1,
+)
 
-__all__ = ["LumynConfig", "decide", "decide_v0", "decide_v1"]
+__all__ = ["DecisionEngine", "LumynConfig", "decide", "decide_many", "decide_v0", "decide_v1"]
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import copy
 import sqlite3
+import threading
+from collections.abc import Sequence
 from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, cast
 
 from jsonschema import Draft202012Validator
 
@@ -16,21 +18,25 @@ from lumyn.engine.consensus import (
 from lumyn.engine.energy import compute_energy_v1
 from lumyn.engine.evaluator import EvaluationResult, evaluate_policy
 from lumyn.engine.evaluator_v1 import EvaluationResultV1, evaluate_policy_v1
-from lumyn.engine.normalize import normalize_request
+from lumyn.engine.memo import EvaluationMemo
+from lumyn.engine.normalize import NormalizedRequest, normalize_request
 from lumyn.engine.normalize_v1 import (
+    NormalizedRequestV1,
     build_memory_snapshot_v1,
     compute_inputs_digest_v1,
     normalize_request_v1,
 )
 from lumyn.engine.redaction import redact_request_for_persistence
-from lumyn.engine.similarity import top_k_matches
-from lumyn.memory.client import MemoryStore
+from lumyn.engine.similarity import LshConfig, SimilarityMatch, feature_tokens
+from lumyn.memory.client import MemoryStore, get_memory_store
 from lumyn.memory.embed import ProjectionLayer
-from lumyn.policy.loader import LoadedPolicy, load_policy, read_policy_text
+from lumyn.memory.types import MemoryHit
+from lumyn.policy.loader import LoadedPolicy, PolicyCache, read_policy_text
 from lumyn.records.emit import RiskSignals, build_decision_record, compute_inputs_digest
 from lumyn.records.emit_v1 import RiskSignalsV1, build_decision_record_v1
 from lumyn.schemas.loaders import load_json_schema
 from lumyn.store.sqlite import SqliteStore
+from lumyn.store.write_behind import GroupCommitWriter
 from lumyn.telemetry.logging import log_decision_record
 from lumyn.telemetry.tracing import start_span
 from lumyn.version import __version__
@@ -45,11 +51,40 @@ class LumynConfig:
     redaction_profile: str = "default"
     memory_enabled: bool = True
     memory_path: str | Path = ".lumyn/memory"
+    # How stale (seconds) v1 memory reads may be with respect to experiences other processes
+    # add; 0 checks on every search, None never (see `lumyn.memory.client.MemoryStore`).
+    memory_refresh_interval_s: float | None = 0.0
+    # Use the process-wide memory store for `memory_path` (see `get_memory_store()`). When
+    # False the engine opens its own and closes it on `close()`.
+    memory_shared: bool = True
+    # "sync" commits every record in its own transaction before returning. "group_commit" and
+    # "enqueue" route records through a write-behind queue (see `lumyn.store.write_behind`)
+    # and return after the group commit or right after enqueueing, respectively.
+    persistence: str = "sync"
+    write_batch_size: int = 64
+    write_flush_interval_ms: float = 5.0
+    write_queue_size: int = 1024
+    # Memoize policy evaluations of identical inputs (see `lumyn.engine.memo`); 0 disables.
+    evaluation_memo_size: int = 0
+    evaluation_memo_ttl_seconds: float = 60.0
+    # "full" evaluates every rule (auditable records). "verdict_only" stops once the verdict
+    # is settled and marks records as partial explanations (see `evaluate_policy`).
+    evaluation_mode: str = "full"
+    # "exact" scores every v0 memory item sharing a feature token with the request. "lsh"
+    # only re-ranks items sharing a MinHash band with it (approximate, for large memories);
+    # the store then buckets every new memory item under this config, whichever writer adds it.
+    memory_similarity: str = "exact"
+    memory_lsh_num_perm: int = 64
+    memory_lsh_bands: int = 16
+
+
+@lru_cache(maxsize=8)
+def _request_validator(schema_path: str) -> Draft202012Validator:
+    return Draft202012Validator(load_json_schema(schema_path))
 
 
 def _validate_request_or_raise(request: dict[str, Any]) -> None:
-    schema = load_json_schema("schemas/decision_request.v0.schema.json")
-    Draft202012Validator(schema).validate(request)
+    _request_validator("schemas/decision_request.v0.schema.json").validate(request)
 
 
 def _is_storage_error(exc: Exception) -> bool:
@@ -111,34 +146,394 @@ def _abstain_storage_unavailable_record_v1(
 
 
 def _validate_request_v1_or_raise(request: dict[str, Any]) -> None:
-    schema = load_json_schema("schemas/decision_request.v1.schema.json")
-    Draft202012Validator(schema).validate(request)
-
+    _request_validator("schemas/decision_request.v1.schema.json").validate(request)
+
+
+# (tenant_id, action_type, query feature tokens): one v0 experience-memory lookup.
+_MemoryQuery = tuple[str | None, str, frozenset[str]]
+
+
+@dataclass(slots=True)
+class _PreparedRequest:
+    """Per-request state shared by the single and batch decide paths."""
+
+    request_eval: dict[str, Any]
+    normalized: NormalizedRequest | NormalizedRequestV1
+    v1: bool
+    tenant_id: str | None
+    tenant_key: str
+    request_id: str | None
+    redaction_profile: str
+    # (redacted request, inputs_digest) once the record has been built.
+    redacted: tuple[dict[str, Any], str] | None = None
+
+
+class DecisionEngine:
+    """
+    Long-lived decision engine built once from a `LumynConfig`.
+
+    The engine owns the loaded policy, the SQLite store and (v1) the projection layer and
+    memory store handles, so that per-request setup (policy parsing, schema bootstrap,
+    policy text reads, model/table construction) happens once instead of on every call.
+    Unless an explicit `loaded_policy` is given, the policy comes from a `PolicyCache`, so
+    edits to the policy file are picked up without restarting a long-lived engine.
+
+    Requests are never mutated, but returned records share unchanged request subtrees (e.g.
+    evidence, inline transcripts) with the caller's request: treat both as read-only.
+
+    The module-level `decide()`, `decide_v0()` and `decide_v1()` functions are thin wrappers
+    around a short-lived engine and keep their historical behavior.
+    """
+
+    def __init__(
+        self,
+        config: LumynConfig | None = None,
+        *,
+        store: SqliteStore | None = None,
+        loaded_policy: LoadedPolicy | None = None,
+    ) -> None:
+        self.config = config or LumynConfig()
+        if self.config.evaluation_mode not in {"full", "verdict_only"}:
+            raise ValueError("evaluation_mode must be full|verdict_only")
+        self._verdict_only = self.config.evaluation_mode == "verdict_only"
+        if self.config.memory_similarity not in {"exact", "lsh"}:
+            raise ValueError("memory_similarity must be exact|lsh")
+        self._approximate_memory = self.config.memory_similarity == "lsh"
+        # Stores passed in by the caller stay open on `close()`; the caller owns them.
+        self._owns_store = store is None
+        # A store passed in must have been created with the `LshConfig` to search with.
+        self.store = store or SqliteStore(
+            self.config.store_path,
+            lsh=LshConfig(
+                num_perm=self.config.memory_lsh_num_perm, bands=self.config.memory_lsh_bands
+            )
+            if self._approximate_memory
+            else None,
+        )
+        self._loaded_policy = loaded_policy
+        self._policy_cache = PolicyCache(self.config.policy_path) if loaded_policy is None else None
+        self._policy_text: str | None = None
+        self._store_ready = False
+        self._projection: Any = None
+        self._memory_store: Any = None
+        self._consensus = ConsensusEngine()
+        self._writer: GroupCommitWriter | None = None
+        self.evaluation_memo = (
+            EvaluationMemo(
+                max_entries=self.config.evaluation_memo_size,
+                ttl_seconds=self.config.evaluation_memo_ttl_seconds,
+            )
+            if self.config.evaluation_memo_size > 0
+            else None
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def loaded_policy(self) -> LoadedPolicy:
+        if self._loaded_policy is not None:
+            return self._loaded_policy
+        return cast(PolicyCache, self._policy_cache).get()
+
+    def _read_policy_text(self, loaded_policy: LoadedPolicy) -> str:
+        if self._policy_cache is not None:
+            text = self._policy_cache.policy_text_for(loaded_policy.policy_hash)
+            if text is not None:
+                return text
+        if self._policy_text is None:
+            self._policy_text = read_policy_text(self.config.policy_path)
+        return self._policy_text
+
+    def _prepare_store(self, loaded_policy: LoadedPolicy) -> None:
+        if not self._store_ready:
+            self.store.init()
+            self._store_ready = True
+        # Known hashes skip both the policy text read and the snapshot write transaction.
+        if self.store.has_policy_snapshot(loaded_policy.policy_hash):
+            return
+        self.store.put_policy_snapshot(
+            policy_hash=loaded_policy.policy_hash,
+            policy_id=str(loaded_policy.policy["policy_id"]),
+            policy_version=str(loaded_policy.policy["policy_version"]),
+            policy_text=self._read_policy_text(loaded_policy),
+        )
 
-def decide_v0(
-    request: dict[str, Any],
-    *,
-    config: LumynConfig | None = None,
-    store: SqliteStore | None = None,
-    loaded_policy: LoadedPolicy | None = None,
-) -> dict[str, Any]:
-    cfg = config or LumynConfig()
-    with start_span("lumyn.decide", attributes={"top_k": cfg.top_k}):
-        request_eval = copy.deepcopy(request)
+    def _projection_layer(self) -> Any:
+        if self._projection is None:
+            with self._lock:
+                if self._projection is None:
+                    self._projection = ProjectionLayer()
+        return self._projection
+
+    def _memory(self) -> Any:
+        if self._memory_store is None:
+            with self._lock:
+                if self._memory_store is None:
+                    # Shared per path unless `memory_shared` is off: the LanceDB connection
+                    # and table then outlive the engine.
+                    open_store = get_memory_store if self.config.memory_shared else MemoryStore
+                    self._memory_store = open_store(
+                        self.config.memory_path,
+                        refresh_interval_s=self.config.memory_refresh_interval_s,
+                    )
+        return self._memory_store
+
+    def _write_behind(self) -> GroupCommitWriter | None:
+        if self.config.persistence == "sync":
+            return None
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = GroupCommitWriter(
+                        self.store,
+                        durability=self.config.persistence,
+                        batch_size=self.config.write_batch_size,
+                        flush_interval_ms=self.config.write_flush_interval_ms,
+                        max_queue=self.config.write_queue_size,
+                    )
+        return self._writer
+
+    def close(self) -> None:
+        """
+        Flush and stop the write-behind writer (if one was started) and release the pooled
+        SQLite connections of a store the engine created itself, and its own (unshared)
+        memory store.
+        """
+        with self._lock:
+            writer, self._writer = self._writer, None
+            # A shared memory store stays open for other engines; see `close_memory_stores()`.
+            memory_store, self._memory_store = self._memory_store, None
+        if writer is not None:
+            writer.close()
+        if memory_store is not None and not self.config.memory_shared:
+            memory_store.close()
+        if self._owns_store:
+            self.store.close()
+
+    def warmup(self) -> None:
+        """
+        Load the policy and bootstrap the store ahead of the first decision.
+
+        For v1 policies with memory enabled this also loads the shared embedding model and opens
+        the memory table.
+        """
+        loaded_policy = self.loaded_policy
+        self._prepare_store(loaded_policy)
+        version = loaded_policy.policy.get("schema_version", "policy.v0")
+        if self.config.memory_enabled and version.startswith("policy.v1"):
+            self._projection_layer()
+            self._memory().refresh()
+
+    def decide(
+        self,
+        request: dict[str, Any],
+        *,
+        loaded_policy: LoadedPolicy | None = None,
+        shadow_policies: Sequence[LoadedPolicy] = (),
+    ) -> dict[str, Any]:
+        """
+        Decide `request` against the enforced policy and return the persisted record.
+
+        Each of `shadow_policies` (same schema version as the enforced policy) is evaluated
+        against the same normalized request; their verdicts are reported under
+        `record["extensions"]["shadow"]` and never affect the decision. Normalization, memory
+        lookup and persistence happen once, whatever the number of shadow policies.
+
+        The request is not copied: `record["request"]` shares the nested objects redaction
+        leaves unchanged (e.g. `action`, `evidence`) with `request`. The persisted record is
+        serialized before this returns, so later changes to either do not reach the store.
+        """
+        loaded_policy = loaded_policy or self.loaded_policy
+        if _is_v1_policy(loaded_policy):
+            return self.decide_v1(
+                request, loaded_policy=loaded_policy, shadow_policies=shadow_policies
+            )
+        return self.decide_v0(request, loaded_policy=loaded_policy, shadow_policies=shadow_policies)
+
+    def decide_v0(
+        self,
+        request: dict[str, Any],
+        *,
+        loaded_policy: LoadedPolicy | None = None,
+        shadow_policies: Sequence[LoadedPolicy] = (),
+    ) -> dict[str, Any]:
+        with start_span("lumyn.decide", attributes={"top_k": self.config.top_k}):
+            prepared = self._prepare(request, v1=False)
+            loaded_policy = loaded_policy or self.loaded_policy
+            _check_shadow_policies(shadow_policies, v1=False)
+
+            try:
+                self._prepare_store(loaded_policy)
+            except Exception as e:
+                if _is_storage_error(e):
+                    return self._storage_unavailable(prepared, loaded_policy)
+                raise
+
+            existing = self._existing_record(prepared)
+            if existing is not None:
+                log_decision_record(existing)
+                return existing
+
+            record = self._build_record_v0(prepared, loaded_policy, shadow_policies=shadow_policies)
+            return self._persist(record, prepared, loaded_policy)
+
+    def decide_v1(
+        self,
+        request: dict[str, Any],
+        *,
+        loaded_policy: LoadedPolicy | None = None,
+        shadow_policies: Sequence[LoadedPolicy] = (),
+    ) -> dict[str, Any]:
+        cfg = self.config
+        with start_span("lumyn.decide_v1", attributes={"top_k": cfg.top_k}):
+            prepared = self._prepare(request, v1=True)
+            loaded_policy = loaded_policy or self.loaded_policy
+            _check_shadow_policies(shadow_policies, v1=True)
+
+            try:
+                # Store policy snapshot - unchanged for v1 (policy text is same)
+                self._prepare_store(loaded_policy)
+            except Exception as e:
+                if _is_storage_error(e):
+                    return self._storage_unavailable(prepared, loaded_policy)
+                raise
+
+            existing = self._existing_record(prepared)
+            if existing is not None:
+                # Note: existing record might be v0 or v1.
+                # Ideally we verify schema version? For now return as is.
+                log_decision_record(existing)
+                return existing
+
+            # Experience memory similarity (BEM Integration)
+            memory_hits: list[MemoryHit] = []
+            projection_model: str | None = None
+            if cfg.memory_enabled:
+                # 1. Project
+                proj = self._projection_layer()
+                vector = proj.embed_request(prepared.normalized)
+                projection_model = getattr(proj, "model_name", "unknown")
+
+                # 2. Search
+                memory_hits = self._memory().search(vector, limit=cfg.top_k)
+
+            record = self._build_record_v1(
+                prepared,
+                loaded_policy,
+                memory_hits=memory_hits,
+                projection_model=projection_model,
+                shadow_policies=shadow_policies,
+            )
+            return self._persist(record, prepared, loaded_policy)
+
+    def decide_many(
+        self,
+        requests: Sequence[dict[str, Any]],
+        *,
+        loaded_policy: LoadedPolicy | None = None,
+        shadow_policies: Sequence[LoadedPolicy] = (),
+    ) -> list[dict[str, Any]]:
+        """
+        Decide a batch of requests and return their records in input order.
+
+        Compared to calling `decide()` in a loop, the batch shares one loaded policy and one
+        store bootstrap, embeds every v1 request in a single `embed_batch` call, runs one
+        multi-vector memory search, and persists all new records (and idempotency keys) in a
+        single SQLite transaction. Requests repeating a `request_id` already seen earlier in
+        the batch (same tenant) resolve to the earlier record, as they would sequentially.
+        `shadow_policies` are evaluated as in `decide()`.
+        """
+        loaded_policy = loaded_policy or self.loaded_policy
+        v1 = _is_v1_policy(loaded_policy)
+        _check_shadow_policies(shadow_policies, v1=v1)
+        cfg = self.config
+        span_name = "lumyn.decide_many_v1" if v1 else "lumyn.decide_many"
+        with start_span(span_name, attributes={"top_k": cfg.top_k, "batch": len(requests)}):
+            prepared_list = [self._prepare(request, v1=v1) for request in requests]
+
+            try:
+                self._prepare_store(loaded_policy)
+            except Exception as e:
+                if _is_storage_error(e):
+                    return [self._storage_unavailable(p, loaded_policy) for p in prepared_list]
+                raise
+
+            results: list[dict[str, Any] | None] = [None] * len(prepared_list)
+            first_index_by_key: dict[tuple[str, str], int] = {}
+            duplicate_of: dict[int, int] = {}
+            pending: list[int] = []
+            for idx, prepared in enumerate(prepared_list):
+                if prepared.request_id is not None:
+                    key = (prepared.tenant_key, prepared.request_id)
+                    if key in first_index_by_key:
+                        duplicate_of[idx] = first_index_by_key[key]
+                        continue
+                    first_index_by_key[key] = idx
+                existing = self._existing_record(prepared)
+                if existing is not None:
+                    results[idx] = existing
+                    continue
+                pending.append(idx)
+
+            built: dict[int, dict[str, Any]] = {}
+            if v1:
+                hits_per_request: list[list[MemoryHit]] = [[] for _ in pending]
+                projection_model: str | None = None
+                if cfg.memory_enabled and pending:
+                    proj = self._projection_layer()
+                    vectors = proj.embed_batch([prepared_list[i].normalized for i in pending])
+                    projection_model = getattr(proj, "model_name", "unknown")
+                    hits_per_request = self._memory().search_many(vectors, limit=cfg.top_k)
+                for idx, hits in zip(pending, hits_per_request, strict=True):
+                    built[idx] = self._build_record_v1(
+                        prepared_list[idx],
+                        loaded_policy,
+                        memory_hits=hits,
+                        projection_model=projection_model,
+                        shadow_policies=shadow_policies,
+                    )
+            else:
+                memory_cache: dict[_MemoryQuery, list[SimilarityMatch]] = {}
+                for idx in pending:
+                    built[idx] = self._build_record_v0(
+                        prepared_list[idx],
+                        loaded_policy,
+                        memory_cache=memory_cache,
+                        shadow_policies=shadow_policies,
+                    )
+
+            for idx, record in self._persist_many(built, prepared_list, loaded_policy).items():
+                results[idx] = record
+
+            for idx, first in duplicate_of.items():
+                results[idx] = results[first]
+
+            out = cast(list[dict[str, Any]], results)
+            for idx, record in enumerate(out):
+                if idx not in built:
+                    log_decision_record(record)
+            return out
+
+    def _prepare(self, request: dict[str, Any], *, v1: bool) -> _PreparedRequest:
+        cfg = self.config
+        # Copy-on-write: the pipeline only replaces top-level keys and copies the nested dicts
+        # it changes (`policy`, `evidence`, `context`), so the caller's request is never
+        # mutated and large unchanged subtrees (transcripts, evidence) are shared, not copied.
+        request_eval = dict(request)
         if cfg.mode in {"enforce", "advisory"}:
             policy_obj = request_eval.get("policy")
             if isinstance(policy_obj, dict):
-                policy_obj.setdefault("mode", cfg.mode)
+                if "mode" not in policy_obj:
+                    request_eval["policy"] = {**policy_obj, "mode": cfg.mode}
             else:
                 request_eval["policy"] = {"mode": cfg.mode}
 
-        _validate_request_or_raise(request_eval)
-
-        if loaded_policy is None:
-            loaded_policy = load_policy(cfg.policy_path)
-        policy = dict(loaded_policy.policy)
-
-        normalized = normalize_request(request_eval)
+        normalized: NormalizedRequest | NormalizedRequestV1
+        if v1:
+            _validate_request_v1_or_raise(request_eval)
+            normalized = normalize_request_v1(request_eval)
+        else:
+            _validate_request_or_raise(request_eval)
+            normalized = normalize_request(request_eval)
 
         tenant_id = (
             request_eval.get("subject", {}).get("tenant_id")
@@ -154,48 +549,84 @@ def decide_v0(
             if isinstance(redaction, dict) and isinstance(redaction.get("profile"), str):
                 redaction_profile = redaction["profile"]
 
-        store_impl = store or SqliteStore(cfg.store_path)
-        try:
-            store_impl.init()
-            store_impl.put_policy_snapshot(
-                policy_hash=loaded_policy.policy_hash,
-                policy_id=str(loaded_policy.policy["policy_id"]),
-                policy_version=str(loaded_policy.policy["policy_version"]),
-                policy_text=read_policy_text(cfg.policy_path),
-            )
-        except Exception as e:
-            if _is_storage_error(e):
-                request_for_record = copy.deepcopy(request_eval)
-                redaction_result = redact_request_for_persistence(
-                    request_for_record, profile=redaction_profile
-                )
-                inputs_digest = compute_inputs_digest(
-                    redaction_result.request, normalized=normalized
-                )
-                record = _abstain_storage_unavailable_record(
-                    request_for_record=redaction_result.request,
-                    loaded_policy=loaded_policy,
-                    inputs_digest=inputs_digest,
-                )
-                log_decision_record(record)
-                return record
-            raise
-
         request_id = (
             request_eval.get("request_id")
             if isinstance(request_eval.get("request_id"), str)
             else None
         )
-        tenant_key = tenant_id or "__global__"
-        if request_id is not None:
-            existing_id = store_impl.get_decision_id_for_request_id(
-                tenant_key=tenant_key, request_id=request_id
+
+        return _PreparedRequest(
+            request_eval=request_eval,
+            normalized=normalized,
+            v1=v1,
+            tenant_id=tenant_id,
+            tenant_key=tenant_id or "__global__",
+            request_id=request_id,
+            redaction_profile=redaction_profile,
+        )
+
+    def _redacted_request(self, prepared: _PreparedRequest) -> tuple[dict[str, Any], str]:
+        redaction_result = redact_request_for_persistence(
+            prepared.request_eval, profile=prepared.redaction_profile
+        )
+        if prepared.v1:
+            inputs_digest = compute_inputs_digest_v1(
+                redaction_result.request, normalized=cast(NormalizedRequestV1, prepared.normalized)
             )
-            if existing_id is not None:
-                existing = store_impl.get_decision_record(existing_id)
-                if existing is not None:
-                    log_decision_record(existing)
-                    return existing
+        else:
+            inputs_digest = compute_inputs_digest(
+                redaction_result.request, normalized=cast(NormalizedRequest, prepared.normalized)
+            )
+        return redaction_result.request, inputs_digest
+
+    def _storage_unavailable(
+        self,
+        prepared: _PreparedRequest,
+        loaded_policy: LoadedPolicy,
+        *,
+        redacted: tuple[dict[str, Any], str] | None = None,
+    ) -> dict[str, Any]:
+        request_for_record, inputs_digest = redacted or self._redacted_request(prepared)
+        build = (
+            _abstain_storage_unavailable_record_v1
+            if prepared.v1
+            else _abstain_storage_unavailable_record
+        )
+        record = build(
+            request_for_record=request_for_record,
+            loaded_policy=loaded_policy,
+            inputs_digest=inputs_digest,
+        )
+        log_decision_record(record)
+        return record
+
+    def _existing_record(self, prepared: _PreparedRequest) -> dict[str, Any] | None:
+        if prepared.request_id is None:
+            return None
+        if self._writer is not None:
+            pending = self._writer.pending_record(
+                tenant_key=prepared.tenant_key, request_id=prepared.request_id
+            )
+            if pending is not None:
+                return pending
+        existing_id = self.store.get_decision_id_for_request_id(
+            tenant_key=prepared.tenant_key, request_id=prepared.request_id
+        )
+        if existing_id is None:
+            return None
+        return self.store.get_decision_record(existing_id)
+
+    def _build_record_v0(
+        self,
+        prepared: _PreparedRequest,
+        loaded_policy: LoadedPolicy,
+        *,
+        memory_cache: dict[_MemoryQuery, list[SimilarityMatch]] | None = None,
+        shadow_policies: Sequence[LoadedPolicy] = (),
+    ) -> dict[str, Any]:
+        request_eval = prepared.request_eval
+        normalized = cast(NormalizedRequest, prepared.normalized)
+        policy = dict(loaded_policy.policy)
 
         # Experience memory similarity (MVP): compare feature dicts.
         query_feature = {
@@ -219,34 +650,59 @@ def decide_v0(
             ).get("tags", []),
         }
 
-        memory_items = store_impl.list_memory_items(
-            tenant_id=tenant_id, action_type=normalized.action_type, limit=500
-        )
-        candidates: list[dict[str, Any]] = []
-        for item in memory_items:
-            candidates.append(
-                {
-                    "memory_id": item.memory_id,
-                    "label": item.label,
-                    "feature": item.feature,
-                    "summary": item.summary,
-                }
-            )
-
-        matches = top_k_matches(query_feature=query_feature, candidates=candidates, top_k=cfg.top_k)
+        # Only memory items sharing a feature token are scored (via the store's token index).
+        tokens = frozenset(feature_tokens(query_feature))
+        cache_key = (prepared.tenant_id, normalized.action_type, tokens)
+        if memory_cache is not None and cache_key in memory_cache:
+            matches = memory_cache[cache_key]
+        else:
+            if self._approximate_memory:
+                matches = self.store.approximate_top_k_memory_matches(
+                    tenant_id=prepared.tenant_id,
+                    action_type=normalized.action_type,
+                    query_feature=query_feature,
+                    top_k=self.config.top_k,
+                )
+            else:
+                matches = self.store.top_k_memory_matches(
+                    tenant_id=prepared.tenant_id,
+                    action_type=normalized.action_type,
+                    tokens=tokens,
+                    top_k=self.config.top_k,
+                )
+            if memory_cache is not None:
+                memory_cache[cache_key] = matches
         failure_matches = [m for m in matches if m.label == "failure"]
         failure_similarity_score = failure_matches[0].score if failure_matches else 0.0
 
         evidence_obj = request_eval.get("evidence")
-        evidence: dict[str, Any]
-        if isinstance(evidence_obj, dict):
-            evidence = evidence_obj
-        else:
-            evidence = {}
-            request_eval["evidence"] = evidence
+        evidence = dict(evidence_obj) if isinstance(evidence_obj, dict) else {}
         evidence["failure_similarity_score"] = float(failure_similarity_score)
-
-        evaluation = evaluate_policy(request_eval, policy=policy)
+        request_eval["evidence"] = evidence
+
+        # Normalize the evaluated request once for the enforced and every shadow policy.
+        evaluated = normalize_request(request_eval)
+        evaluation = evaluate_policy(
+            request_eval,
+            policy=policy,
+            policy_hash=loaded_policy.policy_hash,
+            memo=self.evaluation_memo,
+            normalized=evaluated,
+            verdict_only=self._verdict_only,
+        )
+        shadow = [
+            _shadow_entry(
+                shadow_policy,
+                evaluate_policy(
+                    request_eval,
+                    policy=dict(shadow_policy.policy),
+                    policy_hash=shadow_policy.policy_hash,
+                    memo=self.evaluation_memo,
+                    normalized=evaluated,
+                ),
+            )
+            for shadow_policy in shadow_policies
+        ]
 
         # Uncertainty MVP: deterministic heuristic.
         uncertainty = 0.2
@@ -256,14 +712,11 @@ def decide_v0(
             uncertainty += 0.3
         uncertainty = min(1.0, max(0.0, uncertainty))
 
-        request_for_record = copy.deepcopy(request_eval)
-        redaction_result = redact_request_for_persistence(
-            request_for_record, profile=redaction_profile
-        )
-        inputs_digest = compute_inputs_digest(redaction_result.request, normalized=normalized)
+        request_for_record, inputs_digest = self._redacted_request(prepared)
+        prepared.redacted = (request_for_record, inputs_digest)
 
         record = build_decision_record(
-            request=redaction_result.request,
+            request=request_for_record,
             loaded_policy=loaded_policy,
             evaluation=evaluation,
             inputs_digest=inputs_digest,
@@ -282,169 +735,49 @@ def decide_v0(
             ),
             engine_version=__version__,
         )
-
-        # Persist before returning (MVP contract).
-        try:
-            store_impl.put_decision_record(record)
-        except Exception as e:
-            if isinstance(e, sqlite3.IntegrityError) and request_id is not None:
-                existing_id = store_impl.get_decision_id_for_request_id(
-                    tenant_key=tenant_key,
-                    request_id=request_id,
-                )
-                if existing_id is not None:
-                    existing = store_impl.get_decision_record(existing_id)
-                    if existing is not None:
-                        log_decision_record(existing)
-                        return existing
-            if _is_storage_error(e):
-                record = _abstain_storage_unavailable_record(
-                    request_for_record=redaction_result.request,
-                    loaded_policy=loaded_policy,
-                    inputs_digest=inputs_digest,
-                )
-                log_decision_record(record)
-                return record
-            raise
-
-        log_decision_record(record)
+        if shadow:
+            record["extensions"]["shadow"] = shadow
         return record
 
-
-# Backward compatibility alias
-def decide(
-    request: dict[str, Any],
-    *,
-    config: LumynConfig | None = None,
-    store: SqliteStore | None = None,
-    loaded_policy: LoadedPolicy | None = None,
-) -> dict[str, Any]:
-    cfg = config or LumynConfig()
-
-    if loaded_policy is None:
-        # Load policy once to determine version
-        try:
-            loaded_policy = load_policy(cfg.policy_path)
-        except Exception:
-            # If loading fails, let v0 handle it (or fail inside v0 path)
-            # But v0 path creates defaults if missing?
-            # Actually load_policy raises if file missing/invalid.
-            # But decide_v0 handles FileNotFoundError?
-            # No, decide_v0 calls load_policy which expects file handling.
-            # Let's just raise here if it fails, consistent with previous behavior.
-            raise
-
-    version = loaded_policy.policy.get("schema_version", "policy.v0")
-    if version.startswith("policy.v1"):
-        return decide_v1(request, config=config, store=store, loaded_policy=loaded_policy)
-    else:
-        return decide_v0(request, config=config, store=store, loaded_policy=loaded_policy)
-
-
-def decide_v1(
-    request: dict[str, Any],
-    *,
-    config: LumynConfig | None = None,
-    store: SqliteStore | None = None,
-    loaded_policy: LoadedPolicy | None = None,
-) -> dict[str, Any]:
-    cfg = config or LumynConfig()
-    with start_span("lumyn.decide_v1", attributes={"top_k": cfg.top_k}):
-        request_eval = copy.deepcopy(request)
-        if cfg.mode in {"enforce", "advisory"}:
-            policy_obj = request_eval.get("policy")
-            if isinstance(policy_obj, dict):
-                policy_obj.setdefault("mode", cfg.mode)
-            else:
-                request_eval["policy"] = {"mode": cfg.mode}
-
-        _validate_request_v1_or_raise(request_eval)
-
-        if loaded_policy is None:
-            loaded_policy = load_policy(cfg.policy_path)
+    def _build_record_v1(
+        self,
+        prepared: _PreparedRequest,
+        loaded_policy: LoadedPolicy,
+        *,
+        memory_hits: list[MemoryHit],
+        projection_model: str | None,
+        shadow_policies: Sequence[LoadedPolicy] = (),
+    ) -> dict[str, Any]:
+        cfg = self.config
         policy = dict(loaded_policy.policy)
 
-        normalized = normalize_request_v1(request_eval)
-
-        tenant_id = (
-            request_eval.get("subject", {}).get("tenant_id")
-            if isinstance(request_eval.get("subject"), dict)
-            else None
-        )
-        tenant_id = tenant_id if isinstance(tenant_id, str) else None
-
-        redaction_profile = cfg.redaction_profile
-        ctx = request_eval.get("context")
-        if isinstance(ctx, dict):
-            redaction = ctx.get("redaction")
-            if isinstance(redaction, dict) and isinstance(redaction.get("profile"), str):
-                redaction_profile = redaction["profile"]
-
-        store_impl = store or SqliteStore(cfg.store_path)
-        try:
-            store_impl.init()
-            # Store policy snapshot - unchanged for v1 (policy text is same)
-            store_impl.put_policy_snapshot(
-                policy_hash=loaded_policy.policy_hash,
-                policy_id=str(loaded_policy.policy["policy_id"]),
-                policy_version=str(loaded_policy.policy["policy_version"]),
-                policy_text=read_policy_text(cfg.policy_path),
-            )
-        except Exception as e:
-            if _is_storage_error(e):
-                request_for_record = copy.deepcopy(request_eval)
-                redaction_result = redact_request_for_persistence(
-                    request_for_record, profile=redaction_profile
-                )
-                inputs_digest = compute_inputs_digest_v1(
-                    redaction_result.request, normalized=normalized
-                )
-                record = _abstain_storage_unavailable_record_v1(
-                    request_for_record=redaction_result.request,
-                    loaded_policy=loaded_policy,
-                    inputs_digest=inputs_digest,
-                )
-                log_decision_record(record)
-                return record
-            raise
-
-        request_id = (
-            request_eval.get("request_id")
-            if isinstance(request_eval.get("request_id"), str)
-            else None
-        )
-        tenant_key = tenant_id or "__global__"
-        if request_id is not None:
-            existing_id = store_impl.get_decision_id_for_request_id(
-                tenant_key=tenant_key, request_id=request_id
-            )
-            if existing_id is not None:
-                existing = store_impl.get_decision_record(existing_id)
-                if existing is not None:
-                    # Note: existing record might be v0 or v1.
-                    # Ideally we verify schema version? For now return as is.
-                    log_decision_record(existing)
-                    return existing
-
-        # Experience memory similarity (BEM Integration)
         failure_similarity_score = 0.0
         success_similarity_score = 0.0
-        memory_hits = []
         memory_snapshot: dict[str, Any] | None = None
 
-        if cfg.memory_enabled:
-            # 1. Project
-            proj = ProjectionLayer()
-            vector = proj.embed_request(normalized)
-
-            # 2. Search
-            mem_store = MemoryStore(db_path=cfg.memory_path)
-            memory_hits = mem_store.search(vector, limit=cfg.top_k)
-
-            # 3. Arbitrate (Consensus Engine)
-            # Eval happens first? Yes, eval provides Heuristic input.
-
-        evaluation = evaluate_policy_v1(request_eval, policy=policy)
+        normalized = cast(NormalizedRequestV1, prepared.normalized)
+        evaluation = evaluate_policy_v1(
+            prepared.request_eval,
+            policy=policy,
+            policy_hash=loaded_policy.policy_hash,
+            memo=self.evaluation_memo,
+            normalized=normalized,
+            verdict_only=self._verdict_only,
+        )
+        # Shadow verdicts are the policies' own; memory consensus only applies to the enforced one.
+        shadow = [
+            _shadow_entry(
+                shadow_policy,
+                evaluate_policy_v1(
+                    prepared.request_eval,
+                    policy=dict(shadow_policy.policy),
+                    policy_hash=shadow_policy.policy_hash,
+                    memo=self.evaluation_memo,
+                    normalized=normalized,
+                ),
+            )
+            for shadow_policy in shadow_policies
+        ]
 
         uncertainty = 0.2
         if cfg.memory_enabled:
@@ -455,8 +788,8 @@ def decide_v1(
                 if h.experience.outcome == 1 and h.score > success_similarity_score:
                     success_similarity_score = h.score
 
-            ce = ConsensusEngine()
-            consensus = ce.arbitrate(evaluation, memory_hits)
+            # Arbitrate (Consensus Engine): eval provides the Heuristic input.
+            consensus = self._consensus.arbitrate(evaluation, memory_hits)
 
             # Update Verdict if Consensus changed it
             if consensus.verdict != evaluation.verdict:
@@ -472,7 +805,7 @@ def decide_v1(
             uncertainty = consensus.uncertainty
 
             memory_snapshot = build_memory_snapshot_v1(
-                projection_model=getattr(proj, "model_name", "unknown"),
+                projection_model=projection_model or "unknown",
                 query_top_k=cfg.top_k,
                 risk_threshold=DEFAULT_RISK_THRESHOLD,
                 success_allow_threshold=SUCCESS_ALLOW_THRESHOLD,
@@ -494,14 +827,11 @@ def decide_v1(
                 uncertainty = 0.5  # Default: no memory = no context = uncertain
         uncertainty = min(1.0, max(0.0, uncertainty))
 
-        request_for_record = copy.deepcopy(request_eval)
-        redaction_result = redact_request_for_persistence(
-            request_for_record, profile=redaction_profile
-        )
-        inputs_digest = compute_inputs_digest_v1(redaction_result.request, normalized=normalized)
+        request_for_record, inputs_digest = self._redacted_request(prepared)
+        prepared.redacted = (request_for_record, inputs_digest)
 
         record = build_decision_record_v1(
-            request=redaction_result.request,
+            request=request_for_record,
             loaded_policy=loaded_policy,
             evaluation=evaluation,
             inputs_digest=inputs_digest,
@@ -551,29 +881,161 @@ def decide_v1(
                 "uncertainty_penalty": energy.uncertainty_penalty,
                 "success_memory_credit": energy.success_memory_credit,
             }
+        if shadow:
+            record["extensions"]["shadow"] = shadow
+        return record
 
+    def _persist(
+        self,
+        record: dict[str, Any],
+        prepared: _PreparedRequest,
+        loaded_policy: LoadedPolicy,
+    ) -> dict[str, Any]:
+        # Persist before returning (MVP contract); with `persistence="enqueue"` the record is
+        # only queued for the next group commit.
         try:
-            store_impl.put_decision_record(record)
+            writer = self._write_behind()
+            if writer is None:
+                self.store.put_decision_record(record)
+            else:
+                writer.submit(record)
         except Exception as e:
-            if isinstance(e, sqlite3.IntegrityError) and request_id is not None:
-                existing_id = store_impl.get_decision_id_for_request_id(
-                    tenant_key=tenant_key,
-                    request_id=request_id,
-                )
-                if existing_id is not None:
-                    existing = store_impl.get_decision_record(existing_id)
-                    if existing is not None:
-                        log_decision_record(existing)
-                        return existing
+            if isinstance(e, sqlite3.IntegrityError) and prepared.request_id is not None:
+                existing = self._existing_record(prepared)
+                if existing is not None:
+                    log_decision_record(existing)
+                    return existing
             if _is_storage_error(e):
-                record = _abstain_storage_unavailable_record_v1(
-                    request_for_record=redaction_result.request,
-                    loaded_policy=loaded_policy,
-                    inputs_digest=inputs_digest,
+                return self._storage_unavailable(
+                    prepared, loaded_policy, redacted=prepared.redacted
                 )
-                log_decision_record(record)
-                return record
             raise
 
         log_decision_record(record)
         return record
+
+    def _persist_many(
+        self,
+        built: dict[int, dict[str, Any]],
+        prepared_list: list[_PreparedRequest],
+        loaded_policy: LoadedPolicy,
+    ) -> dict[int, dict[str, Any]]:
+        if not built:
+            return {}
+        try:
+            # The batch is already one group commit; drain queued single writes first so
+            # records land in submission order.
+            if self._writer is not None:
+                self._writer.flush()
+            self.store.put_decision_records(list(built.values()))
+        except Exception as e:
+            if isinstance(e, sqlite3.IntegrityError):
+                # A concurrent writer claimed one of the request_ids: the transaction rolled
+                # back, so resolve each record individually with the single-record semantics.
+                return {
+                    idx: self._persist(record, prepared_list[idx], loaded_policy)
+                    for idx, record in built.items()
+                }
+            if _is_storage_error(e):
+                return {
+                    idx: self._storage_unavailable(
+                        prepared_list[idx],
+                        loaded_policy,
+                        redacted=prepared_list[idx].redacted,
+                    )
+                    for idx in built
+                }
+            raise
+
+        for record in built.values():
+            log_decision_record(record)
+        return dict(built)
+
+
+def _is_v1_policy(loaded_policy: LoadedPolicy) -> bool:
+    version = loaded_policy.policy.get("schema_version", "policy.v0")
+    return str(version).startswith("policy.v1")
+
+
+def _check_shadow_policies(shadow_policies: Sequence[LoadedPolicy], *, v1: bool) -> None:
+    for shadow_policy in shadow_policies:
+        if _is_v1_policy(shadow_policy) != v1:
+            expected = "policy.v1" if v1 else "policy.v0"
+            raise ValueError(
+                f"shadow policy {shadow_policy.policy.get('policy_id')!r} must be {expected}, "
+                "like the enforced policy"
+            )
+
+
+def _shadow_entry(
+    loaded_policy: LoadedPolicy, evaluation: EvaluationResult | EvaluationResultV1
+) -> dict[str, Any]:
+    return {
+        "policy_id": str(loaded_policy.policy.get("policy_id")),
+        "policy_version": str(loaded_policy.policy.get("policy_version")),
+        "policy_hash": loaded_policy.policy_hash,
+        "verdict": evaluation.verdict,
+        "reason_codes": list(evaluation.reason_codes),
+        "matched_rules": [r.rule_id for r in evaluation.matched_rules],
+    }
+
+
+def decide_v0(
+    request: dict[str, Any],
+    *,
+    config: LumynConfig | None = None,
+    store: SqliteStore | None = None,
+    loaded_policy: LoadedPolicy | None = None,
+    shadow_policies: Sequence[LoadedPolicy] = (),
+) -> dict[str, Any]:
+    engine = DecisionEngine(config, store=store, loaded_policy=loaded_policy)
+    try:
+        return engine.decide_v0(request, shadow_policies=shadow_policies)
+    finally:
+        engine.close()
+
+
+# Backward compatibility alias
+def decide(
+    request: dict[str, Any],
+    *,
+    config: LumynConfig | None = None,
+    store: SqliteStore | None = None,
+    loaded_policy: LoadedPolicy | None = None,
+    shadow_policies: Sequence[LoadedPolicy] = (),
+) -> dict[str, Any]:
+    engine = DecisionEngine(config, store=store, loaded_policy=loaded_policy)
+    try:
+        return engine.decide(request, shadow_policies=shadow_policies)
+    finally:
+        engine.close()
+
+
+def decide_many(
+    requests: Sequence[dict[str, Any]],
+    *,
+    config: LumynConfig | None = None,
+    store: SqliteStore | None = None,
+    loaded_policy: LoadedPolicy | None = None,
+    shadow_policies: Sequence[LoadedPolicy] = (),
+) -> list[dict[str, Any]]:
+    engine = DecisionEngine(config, store=store, loaded_policy=loaded_policy)
+    try:
+        return engine.decide_many(requests, shadow_policies=shadow_policies)
+    finally:
+        engine.close()
+
+
+def decide_v1(
+    request: dict[str, Any],
+    *,
+    config: LumynConfig | None = None,
+    store: SqliteStore | None = None,
+    loaded_policy: LoadedPolicy | None = None,
+    shadow_policies: Sequence[LoadedPolicy] = (),
+) -> dict[str, Any]:
+    engine = DecisionEngine(config, store=store, loaded_policy=loaded_policy)
+    try:
+        return engine.decide_v1(request, shadow_policies=shadow_policies)
+    finally:
+        engine.close()
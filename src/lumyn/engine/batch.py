@@ -0,0 +1,389 @@
+from __future__ import annotations
+
+import operator
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from lumyn.engine.compiler import (
+    CompiledPolicy,
+    CompiledRule,
+    cached_compile_policy,
+    compile_policy,
+)
+from lumyn.engine.conditions import NUMERIC_CONDITIONS
+from lumyn.engine.evaluator import VERDICT_PRECEDENCE, EvaluationResult, MatchedRule
+from lumyn.engine.normalize import NormalizedRequest, normalize_request
+
+Mask = npt.NDArray[np.bool_]
+
+_MISSING = object()
+# Integers from here on may not be exact as float64; such columns are compared per value.
+_EXACT_INT = 2**53
+
+_VECTOR_OPS: dict[Callable[[Any, Any], bool], Callable[[Any, Any], Mask]] = {
+    operator.gt: np.greater,
+    operator.ge: np.greater_equal,
+    operator.lt: np.less,
+    operator.le: np.less_equal,
+}
+
+
+class _Unsupported(Exception):
+    """The policy needs the row-by-row evaluator (e.g. conditions that raise lazily)."""
+
+
+# Exact types counted as numbers by the row-by-row evaluator's `isinstance` checks.
+_NUMBER_KIND: dict[type, int] = {float: 1, int: 2, bool: 2}
+
+
+def _number_kind(value: Any) -> int:
+    kind = _NUMBER_KIND.get(type(value))
+    if kind is not None:
+        return kind
+    if isinstance(value, int):
+        return 2
+    return 1 if isinstance(value, float) else 0
+
+
+class _Columns:
+    """Columnar view of normalized requests, built per field on first use."""
+
+    def __init__(self, rows: Sequence[NormalizedRequest]) -> None:
+        self.rows = rows
+        self.size = len(rows)
+        action_codes: dict[str, int] = {}
+        self.action_type = np.fromiter(
+            (action_codes.setdefault(n.action_type, len(action_codes)) for n in rows),
+            dtype=np.int32,
+            count=self.size,
+        )
+        self.action_codes = action_codes
+        self._evidence = [n.evidence for n in rows]
+        self._raw_cache: dict[str, list[Any]] = {}
+        self._categorical: dict[str, tuple[npt.NDArray[np.intp], list[Any]]] = {}
+        self._numeric: dict[str, tuple[npt.NDArray[np.float64], Mask, Mask, bool]] = {}
+
+    def _raw(self, field: str) -> list[Any]:
+        raw = self._raw_cache.get(field)
+        if raw is not None:
+            return raw
+        if field == "amount_currency":
+            raw = [n.amount_currency for n in self.rows]
+        elif field == "amount_usd":
+            raw = [n.amount_usd for n in self.rows]
+        elif field == "fx_rate_to_usd_present":
+            raw = [n.fx_rate_to_usd_present for n in self.rows]
+        else:
+            key = field.removeprefix("evidence.")
+            raw = [evidence.get(key, _MISSING) for evidence in self._evidence]
+        self._raw_cache[field] = raw
+        return raw
+
+    def categorical(self, field: str) -> tuple[npt.NDArray[np.intp], list[Any]]:
+        """Dictionary-encode a field: `(codes, uniques)`; missing evidence is `_MISSING`."""
+        cached = self._categorical.get(field)
+        if cached is not None:
+            return cached
+        raw = self._raw(field)
+        # Keyed by type too: 1, 1.0 and True are equal but typed checks tell them apart.
+        keys = list(zip(map(type, raw), raw, strict=True))
+        try:
+            index = {key: code for code, key in enumerate(dict.fromkeys(keys))}
+            codes = np.fromiter(map(index.__getitem__, keys), dtype=np.intp, count=self.size)
+            uniques = [value for _, value in index]
+        except TypeError:  # unhashable values: each gets its own code
+            index = {}
+            uniques = []
+            codes = np.empty(self.size, dtype=np.intp)
+            for i, key in enumerate(keys):
+                try:
+                    code = index.setdefault(key, len(uniques))
+                except TypeError:
+                    code = len(uniques)
+                if code == len(uniques):
+                    uniques.append(key[1])
+                codes[i] = code
+        self._categorical[field] = (codes, uniques)
+        return codes, uniques
+
+    def numeric(self, field: str) -> tuple[npt.NDArray[np.float64], Mask, Mask, bool]:
+        """`(values, is_number, is_int, exact)` with NaN where a value is not a number."""
+        cached = self._numeric.get(field)
+        if cached is not None:
+            return cached
+        codes, uniques = self.categorical(field)
+        kinds = np.fromiter((_number_kind(v) for v in uniques), dtype=np.int8, count=len(uniques))
+        exact = True
+        table = np.full(len(uniques), np.nan)
+        for i in np.flatnonzero(kinds):
+            value = uniques[i]
+            if kinds[i] == 2 and abs(value) >= _EXACT_INT:
+                exact = False
+            else:
+                table[i] = value
+        row_kinds = kinds[codes]
+        result = (table[codes], row_kinds > 0, row_kinds == 2, exact)
+        self._numeric[field] = result
+        return result
+
+    def where(self, field: str, test: Callable[[Any], bool]) -> Mask:
+        """Evaluate a scalar `test` once per distinct value of `field` and broadcast it."""
+        codes, uniques = self.categorical(field)
+        table = np.fromiter(
+            (test(None if v is _MISSING else v) for v in uniques),
+            dtype=np.bool_,
+            count=len(uniques),
+        )
+        return table[codes]
+
+    def action_type_in(self, action_types: frozenset[str]) -> Mask:
+        codes = [self.action_codes[a] for a in action_types if a in self.action_codes]
+        return np.isin(self.action_type, codes)
+
+
+def _condition_mask(key: str, expected: Any, cols: _Columns) -> Mask:
+    numeric = NUMERIC_CONDITIONS.get(key)
+    if numeric is not None:
+        field, op, cast, types = numeric
+        try:
+            threshold = cast(expected)
+        except (TypeError, ValueError) as e:
+            raise _Unsupported(key) from e
+        values, is_number, is_int, exact = cols.numeric(field)
+        valid = is_int if types == (int,) else is_number
+        if exact and abs(threshold) <= _EXACT_INT:
+            return valid & _VECTOR_OPS[op](values, float(threshold))
+        return cols.where(field, lambda v: isinstance(v, types) and op(v, threshold))
+
+    if key == "amount_currency_is":
+        return cols.where("amount_currency", lambda v: bool(v == expected))
+    if key == "amount_currency_ne":
+        return cols.where("amount_currency", lambda v: bool(v != expected))
+    if key == "evidence.fx_rate_to_usd_present":
+        if not isinstance(expected, bool):
+            return np.zeros(cols.size, dtype=np.bool_)
+        return cols.where("fx_rate_to_usd_present", lambda v: bool(v) is expected)
+    if key == "evidence.payment_instrument_risk_is":
+        return cols.where("evidence.payment_instrument_risk", lambda v: bool(v == expected))
+    if key == "evidence.payment_instrument_risk_in":
+        if not isinstance(expected, list):
+            return np.zeros(cols.size, dtype=np.bool_)
+        allowed = frozenset(v for v in expected if isinstance(v, str))
+        return cols.where(
+            "evidence.payment_instrument_risk", lambda v: isinstance(v, str) and v in allowed
+        )
+    if key == "evidence.manual_approval_is":
+        if not isinstance(expected, bool):
+            return np.zeros(cols.size, dtype=np.bool_)
+        return cols.where(
+            "evidence.manual_approval", lambda v: isinstance(v, bool) and v is expected
+        )
+
+    raise _Unsupported(key)
+
+
+def _expr_mask(expr: Any, cols: _Columns) -> Mask:
+    mask = np.ones(cols.size, dtype=np.bool_)
+    if not isinstance(expr, dict):
+        return mask
+    for key, expected in expr.items():
+        mask &= _condition_mask(key, expected, cols)
+    return mask
+
+
+def _guard_mask(rule: Mapping[str, Any], cols: _Columns) -> Mask:
+    mask = np.ones(cols.size, dtype=np.bool_)
+    expr_if = rule.get("if")
+    if expr_if is not None:
+        mask &= _expr_mask(expr_if, cols)
+    expr_if_all = rule.get("if_all")
+    if expr_if_all is not None:
+        if not isinstance(expr_if_all, list):
+            return np.zeros(cols.size, dtype=np.bool_)
+        for expr in expr_if_all:
+            mask &= _expr_mask(expr, cols)
+    expr_if_any = rule.get("if_any")
+    if expr_if_any is not None:
+        if not isinstance(expr_if_any, list):
+            return np.zeros(cols.size, dtype=np.bool_)
+        any_of = np.zeros(cols.size, dtype=np.bool_)
+        for expr in expr_if_any:
+            any_of |= _expr_mask(expr, cols)
+        mask &= any_of
+    return mask
+
+
+def _missing_evidence_mask(program: CompiledPolicy, cols: _Columns) -> Mask:
+    mask = np.zeros(cols.size, dtype=np.bool_)
+    for action_type, keys in program.required_evidence.items():
+        rows = cols.action_type_in(frozenset((action_type,)))
+        if not rows.any():
+            continue
+        missing = np.zeros(cols.size, dtype=np.bool_)
+        for key in keys:
+            codes, uniques = cols.categorical(f"evidence.{key}")
+            table = np.fromiter(
+                (v is _MISSING or v in (None, "") for v in uniques),
+                dtype=np.bool_,
+                count=len(uniques),
+            )
+            missing |= table[codes]
+        mask |= rows & missing
+    return mask
+
+
+class BatchEvaluation:
+    """
+    Results of evaluating one v0 policy over many requests.
+
+    `verdicts` is available as an array; the full `EvaluationResult` of a row (matched
+    rules, reason codes, queries, obligations) is assembled on demand by `result(i)`.
+    """
+
+    def __init__(
+        self,
+        *,
+        verdicts: npt.NDArray[np.object_],
+        rules: Sequence[CompiledRule] = (),
+        matched: npt.NDArray[np.bool_] | None = None,
+        program: CompiledPolicy | None = None,
+        results: Sequence[EvaluationResult] | None = None,
+    ) -> None:
+        self.verdicts = verdicts
+        self._rules = tuple(rules)
+        self._matched = matched
+        self._program = program
+        self._results = results
+
+    def __len__(self) -> int:
+        return len(self.verdicts)
+
+    def result(self, i: int) -> EvaluationResult:
+        if self._results is not None:
+            return self._results[i]
+        matched = self._matched
+        program = self._program
+        assert matched is not None and program is not None
+
+        matched_rules: list[MatchedRule] = []
+        reason_codes: list[str] = []
+        queries: list[dict[str, str]] = []
+        obligations: list[dict[str, Any]] = []
+        for j in np.flatnonzero(matched[:, i]):
+            rule = self._rules[j]
+            matched_rules.append(
+                MatchedRule(
+                    rule_id=rule.rule_id,
+                    stage=rule.stage,
+                    effect=str(rule.effect),
+                    reason_codes=list(rule.reason_codes),
+                )
+            )
+            reason_codes.extend(rule.reason_codes)
+            queries.extend(dict(q) for q in rule.queries)
+            obligations.extend({**o, "source": dict(o["source"])} for o in rule.obligations)
+
+        if not matched_rules:
+            matched_rules.append(
+                MatchedRule(
+                    rule_id="DEFAULT",
+                    stage="DEFAULT",
+                    effect=program.default_verdict,
+                    reason_codes=[program.default_reason_code],
+                )
+            )
+            reason_codes.append(program.default_reason_code)
+
+        verdict = self.verdicts[i]
+        return EvaluationResult(
+            verdict=verdict,
+            reason_codes=reason_codes,
+            matched_rules=matched_rules,
+            queries=queries if verdict == "QUERY" else [],
+            obligations=obligations,
+        )
+
+    def results(self) -> list[EvaluationResult]:
+        return [self.result(i) for i in range(len(self))]
+
+
+def evaluate_policy_batch(
+    requests: Sequence[dict[str, Any]],
+    *,
+    policy: dict[str, Any],
+    policy_hash: str | None = None,
+) -> BatchEvaluation:
+    """
+    Evaluate a v0 policy over many requests at once (offline replay, diffs, what-if runs).
+
+    Requests are normalized into columns (action type codes, `amount_usd` as float64 and
+    one column per field the policy reads); every condition becomes a boolean mask over
+    all rows and verdicts follow the same stage order and `VERDICT_PRECEDENCE` as
+    `evaluate_policy`, whose results `result(i)` reproduces row for row. Policies the
+    masks cannot express exactly (conditions that only fail when evaluated) are run
+    row by row instead.
+    """
+    return evaluate_normalized_batch(
+        [normalize_request(request) for request in requests],
+        policy=policy,
+        policy_hash=policy_hash,
+    )
+
+
+def evaluate_normalized_batch(
+    rows: Sequence[NormalizedRequest],
+    *,
+    policy: dict[str, Any],
+    policy_hash: str | None = None,
+) -> BatchEvaluation:
+    """`evaluate_policy_batch()` for requests that were already normalized.
+
+    Replays that evaluate several candidate policies over the same history should
+    normalize once and call this per policy.
+    """
+    program = (
+        compile_policy(policy)
+        if policy_hash is None
+        else cached_compile_policy(policy, policy_hash=policy_hash)
+    )
+    cols = _Columns(rows)
+    rules = [rule for rule in program.rules if rule.effect is not None]
+
+    matched = np.zeros((len(rules), cols.size), dtype=np.bool_)
+    missing_evidence: Mask | None = None
+    try:
+        row = 0
+        for rule in program.rules:
+            # Rules with an unusable `then` never match, but their conditions are still
+            # checked for keys that would make the row-by-row evaluator raise.
+            guard = _guard_mask(rule.source, cols)
+            if rule.effect is None:
+                continue
+            if rule.action_types is not None:
+                guard &= cols.action_type_in(rule.action_types)
+            if rule.requires_missing_evidence:
+                if missing_evidence is None:
+                    missing_evidence = _missing_evidence_mask(program, cols)
+                guard &= missing_evidence
+            matched[row] = guard
+            row += 1
+    except _Unsupported:
+        results = [program.evaluate(n) for n in rows]
+        return BatchEvaluation(
+            verdicts=np.array([r.verdict for r in results], dtype=object), results=results
+        )
+
+    precedence = np.array([VERDICT_PRECEDENCE[str(r.effect)] for r in rules], dtype=np.int8)
+    if rules:
+        best = np.where(matched, precedence[:, None], -1).max(axis=0)
+    else:
+        best = np.full(cols.size, -1, dtype=np.int8)
+    by_rank = {rank: verdict for verdict, rank in VERDICT_PRECEDENCE.items()}
+    verdicts = np.empty(cols.size, dtype=object)
+    verdicts[:] = program.default_verdict
+    for rank, verdict in by_rank.items():
+        verdicts[best == rank] = verdict
+    return BatchEvaluation(verdicts=verdicts, rules=rules, matched=matched, program=program)
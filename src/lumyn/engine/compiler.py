@@ -0,0 +1,1043 @@
+from __future__ import annotations
+
+import json
+import math
+import operator
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field, replace
+from typing import Any, Generic, Protocol, TypeVar, cast
+
+from lumyn.engine.conditions import (
+    NUMERIC_CONDITIONS,
+    STAGES_V1,
+    V1_ORDERINGS,
+    VERDICT_PRECEDENCE_V1,
+    LazyCondition,
+    Predicate,
+    PredicateV1,
+    always,
+    compile_condition,
+    compile_condition_v1,
+    compile_then,
+    field_getter,
+    field_getter_v1,
+    never,
+    parse_condition_key_v1,
+    then_v1,
+    when_action_types,
+    when_action_types_v1,
+)
+from lumyn.engine.evaluator import STAGES, VERDICT_PRECEDENCE, EvaluationResult, MatchedRule
+from lumyn.engine.evaluator_v1 import _expr_matches
+from lumyn.engine.normalize import NormalizedRequest
+from lumyn.engine.normalize_v1 import NormalizedRequestV1
+from lumyn.policy.loader import compute_policy_hash
+from lumyn.policy.validate import find_unreachable_rules
+from lumyn.records.emit_v1 import EvaluationResultV1, MatchedRuleV1
+
+T = TypeVar("T")
+N = TypeVar("N", NormalizedRequest, NormalizedRequestV1)
+
+
+def predicate_key(key: str, expected: Any) -> tuple[str, str] | None:
+    """
+    Identity of a `(key, expected)` condition, e.g. for sharing its result across rules.
+
+    `expected` is compared by its canonical JSON (so `1`, `1.0` and `true` stay distinct);
+    `None` when it is not JSON-serializable.
+    """
+    try:
+        return key, json.dumps(expected, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class _Threshold(Generic[N]):
+    """A numeric condition `isinstance(value, types) and op(value, threshold)` on one field."""
+
+    field: str
+    get: Callable[[N], Any]
+    types: tuple[type, ...]
+    op: Callable[[Any, Any], bool]
+    threshold: float
+
+
+Test = tuple[int, Callable[[N], bool]]
+
+
+@dataclass(frozen=True, slots=True)
+class IntervalIndex(Generic[N]):
+    """
+    Threshold conditions on one numeric field, answered with one bisect.
+
+    `breakpoints` are the sorted distinct thresholds; they split the number line into
+    `2 * len(breakpoints) + 1` regions (below, at and between breakpoints) and `masks[r]` is
+    the bits of the conditions that hold for values in region `r`.
+    """
+
+    get: Callable[[N], Any]
+    types: tuple[type, ...]
+    breakpoints: tuple[float, ...]
+    masks: tuple[int, ...]
+
+    def lookup(self, normalized: N) -> int:
+        val = self.get(normalized)
+        if not isinstance(val, self.types) or val != val:  # NaN compares false to everything
+            return 0
+        i = bisect_left(self.breakpoints, cast(float, val))
+        if i < len(self.breakpoints) and self.breakpoints[i] == val:
+            return self.masks[2 * i + 1]
+        return self.masks[2 * i]
+
+
+# For a breakpoint `j`, whether `op(value, breakpoints[j])` holds when `value` is in the
+# region just below breakpoint `i` (`at=False`) or equal to it (`at=True`).
+_REGION_TESTS: dict[Callable[[Any, Any], bool], Callable[[int, int, bool], bool]] = {
+    operator.lt: lambda i, j, at: j > i if at else j >= i,
+    operator.le: lambda i, j, at: j >= i,
+    operator.gt: lambda i, j, at: j < i,
+    operator.ge: lambda i, j, at: j <= i if at else j < i,
+}
+
+
+def _interval_index(conditions: list[tuple[int, _Threshold[N]]]) -> IntervalIndex[N]:
+    breakpoints = sorted({c.threshold for _, c in conditions})
+    position = {value: j for j, value in enumerate(breakpoints)}
+    masks: list[int] = []
+    for i in range(len(breakpoints) + 1):
+        for at in (False, True):
+            if at and i == len(breakpoints):
+                break
+            mask = 0
+            for bit, c in conditions:
+                if _REGION_TESTS[c.op](i, position[c.threshold], at):
+                    mask |= bit
+            masks.append(mask)
+    first = conditions[0][1]
+    return IntervalIndex(
+        get=first.get, types=first.types, breakpoints=tuple(breakpoints), masks=tuple(masks)
+    )
+
+
+class _PredicateTable(Generic[N]):
+    """
+    The distinct conditions of one policy, one bit each.
+
+    Identical `(key, expected)` conditions repeated across rules and stages share a bit.
+    Only conditions that cannot raise are interned, so testing them all up front, once per
+    request, is indistinguishable from the interpreter testing them rule by rule.
+    Threshold conditions on the same numeric field are grouped into an `IntervalIndex`.
+    """
+
+    def __init__(self) -> None:
+        self.tests: list[Callable[[N], bool]] = []
+        self._bits: dict[tuple[str, str], int] = {}
+        self._thresholds: dict[int, _Threshold[N]] = {}
+
+    def bit(
+        self,
+        key: str,
+        expected: Any,
+        test: Callable[[N], bool],
+        threshold: _Threshold[N] | None = None,
+    ) -> int:
+        ident = predicate_key(key, expected)
+        if ident is not None and ident in self._bits:
+            return self._bits[ident]
+        bit = 1 << len(self.tests)
+        self.tests.append(test)
+        if ident is not None:
+            self._bits[ident] = bit
+        if threshold is not None and not math.isnan(threshold.threshold):
+            self._thresholds[bit] = threshold
+        return bit
+
+    def select(self, mask: int) -> tuple[tuple[Test[N], ...], tuple[IntervalIndex[N], ...]]:
+        """The tests for the bits in `mask`, with threshold conditions grouped by field."""
+        tests: list[Test[N]] = []
+        groups: dict[tuple[str, tuple[type, ...]], list[tuple[int, _Threshold[N]]]] = {}
+        for i, test in enumerate(self.tests):
+            bit = 1 << i
+            if not mask & bit:
+                continue
+            threshold = self._thresholds.get(bit)
+            if threshold is None:
+                tests.append((bit, test))
+            else:
+                groups.setdefault((threshold.field, threshold.types), []).append((bit, threshold))
+        intervals: list[IntervalIndex[N]] = []
+        for conditions in groups.values():
+            if len(conditions) == 1:
+                bit, _ = conditions[0]
+                tests.append((bit, self.tests[bit.bit_length() - 1]))
+            else:
+                intervals.append(_interval_index(conditions))
+        return tuple(tests), tuple(intervals)
+
+
+@dataclass(frozen=True, slots=True)
+class BitGuard:
+    """
+    A rule guard over the request's predicate bits (see `PredicateBits`).
+
+    The guard holds when every `required` bit is set and, for rules with an `if_any`, one
+    alternative holds: any bit of `any_bits` (single-condition alternatives) or all bits of
+    one of `any_terms`.
+    """
+
+    required: int
+    has_any: bool = False
+    any_bits: int = 0
+    any_terms: tuple[int, ...] = ()
+
+    @property
+    def mask(self) -> int:
+        mask = self.required | self.any_bits
+        for term in self.any_terms:
+            mask |= term
+        return mask
+
+    def matches(self, bits: int) -> bool:
+        if bits & self.required != self.required:
+            return False
+        if not self.has_any or bits & self.any_bits:
+            return True
+        return any(bits & term == term for term in self.any_terms)
+
+
+def _any_of(alternatives: list[int]) -> BitGuard | None:
+    """`if_any` part of a `BitGuard`; `None` when some alternative always holds."""
+    if 0 in alternatives:
+        return None
+    single = 0
+    terms: list[int] = []
+    for mask in alternatives:
+        if mask & (mask - 1):
+            terms.append(mask)
+        else:
+            single |= mask
+    return BitGuard(required=0, has_any=True, any_bits=single, any_terms=tuple(terms))
+
+
+class _BitRule(Protocol):
+    @property
+    def bits(self) -> BitGuard | None: ...
+
+
+@dataclass(frozen=True, slots=True)
+class PredicateBits(Generic[N]):
+    """
+    Per action type, the interned conditions its rules can test: `(bit, test)` pairs and
+    one `IntervalIndex` per numeric field with several thresholds.
+
+    `evaluate()` tests each of them once and returns the request's predicate bitset, which
+    rule guards (`BitGuard`) then combine with integer masks.
+    """
+
+    by_action_type: Mapping[str, tuple[tuple[Test[N], ...], tuple[IntervalIndex[N], ...]]]
+    wildcard: tuple[tuple[Test[N], ...], tuple[IntervalIndex[N], ...]]
+
+    def evaluate(self, action_type: str, normalized: N) -> int:
+        tests, intervals = self.by_action_type.get(action_type, self.wildcard)
+        bits = 0
+        for bit, test in tests:
+            if test(normalized):
+                bits |= bit
+        for interval in intervals:
+            bits |= interval.lookup(normalized)
+        return bits
+
+
+def _rules_mask(rules: Iterable[_BitRule]) -> int:
+    mask = 0
+    for rule in rules:
+        if rule.bits is not None:
+            mask |= rule.bits.mask
+    return mask
+
+
+def _predicate_bits(index: RuleIndex[Any], table: _PredicateTable[N]) -> PredicateBits[N]:
+    wildcard = 0
+    for rules in index.wildcard.values():
+        wildcard |= _rules_mask(rules)
+    by_action_type: dict[str, int] = {}
+    for (_, action_type), rules in index.by_stage_action.items():
+        by_action_type[action_type] = by_action_type.get(action_type, wildcard) | _rules_mask(rules)
+    return PredicateBits(
+        by_action_type={a: table.select(mask) for a, mask in by_action_type.items()},
+        wildcard=table.select(wildcard),
+    )
+
+
+def _compile_expr(expr: Any) -> Predicate:
+    # Non-object expressions match, like an empty one (interpreter semantics).
+    if not isinstance(expr, dict) or not expr:
+        return always
+    predicates = tuple(compile_condition(key, expected) for key, expected in expr.items())
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda n: all(p(n) for p in predicates)
+
+
+def _never_after(parts: list[Predicate]) -> Predicate:
+    # A malformed `if_all`/`if_any` never matches, but the conditions before it still run
+    # (and can raise) first.
+    checks = tuple(p for p in parts if p is not always)
+    if not checks:
+        return never
+
+    def guard(n: NormalizedRequest) -> bool:
+        for p in checks:
+            if not p(n):
+                break
+        return False
+
+    return guard
+
+
+def _compile_guard(rule: Mapping[str, Any]) -> Predicate:
+    """Combine a rule's `if`, `if_all` and `if_any` in the interpreter's evaluation order."""
+    parts: list[Predicate] = []
+
+    expr_if = rule.get("if")
+    if expr_if is not None:
+        parts.append(_compile_expr(expr_if))
+
+    expr_if_all = rule.get("if_all")
+    if expr_if_all is not None:
+        if not isinstance(expr_if_all, list):
+            return _never_after(parts)
+        all_of = tuple(_compile_expr(expr) for expr in expr_if_all)
+        parts.append(lambda n: all(p(n) for p in all_of))
+
+    expr_if_any = rule.get("if_any")
+    if expr_if_any is not None:
+        if not isinstance(expr_if_any, list):
+            return _never_after(parts)
+        any_of = tuple(_compile_expr(expr) for expr in expr_if_any)
+        parts.append(lambda n: any(p(n) for p in any_of))
+
+    parts = [p for p in parts if p is not always]
+    if not parts:
+        return always
+    if len(parts) == 1:
+        return parts[0]
+    guards = tuple(parts)
+    return lambda n: all(p(n) for p in guards)
+
+
+def _threshold(key: str, expected: Any) -> _Threshold[NormalizedRequest] | None:
+    numeric = NUMERIC_CONDITIONS.get(key)
+    if numeric is None:
+        return None
+    field, op, cast, types = numeric
+    try:
+        threshold = cast(expected)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return _Threshold(field=field, get=field_getter(field), types=types, op=op, threshold=threshold)
+
+
+def _bit_guard(
+    rule: Mapping[str, Any], table: _PredicateTable[NormalizedRequest]
+) -> BitGuard | None:
+    """
+    `rule`'s guard as a `BitGuard` over `table`.
+
+    `None` when the rule keeps its predicate guard: it has a condition that can only fail
+    when evaluated, or a malformed `if_all`/`if_any` block that never matches.
+    """
+
+    def expr_bits(expr: Any) -> int | None:
+        if not isinstance(expr, dict):
+            return 0
+        mask = 0
+        for key, expected in expr.items():
+            test = compile_condition(key, expected)
+            if isinstance(test, LazyCondition):
+                return None
+            mask |= table.bit(key, expected, test, _threshold(key, expected))
+        return mask
+
+    required = 0
+    exprs_all = [rule.get("if")] if rule.get("if") is not None else []
+    expr_if_all = rule.get("if_all")
+    if expr_if_all is not None:
+        if not isinstance(expr_if_all, list):
+            return None
+        exprs_all.extend(expr_if_all)
+    for expr in exprs_all:
+        mask = expr_bits(expr)
+        if mask is None:
+            return None
+        required |= mask
+
+    expr_if_any = rule.get("if_any")
+    if expr_if_any is None:
+        return BitGuard(required=required)
+    if not isinstance(expr_if_any, list) or not expr_if_any:
+        return None
+    alternatives: list[int] = []
+    for expr in expr_if_any:
+        mask = expr_bits(expr)
+        if mask is None:
+            return None
+        alternatives.append(mask)
+    any_of = _any_of(alternatives)
+    return BitGuard(required=required) if any_of is None else replace(any_of, required=required)
+
+
+class _IndexedRule(Protocol):
+    @property
+    def stage(self) -> str: ...
+
+    @property
+    def action_types(self) -> frozenset[str] | None: ...
+
+
+R = TypeVar("R", bound=_IndexedRule)
+
+
+@dataclass(frozen=True, slots=True)
+class RuleIndex(Generic[R]):
+    """
+    Rules bucketed by `(stage, action_type)`, each bucket in evaluation order.
+
+    Rules without a `when` constraint are in the stage's wildcard bucket and merged into
+    every `(stage, action_type)` bucket at their original position; `action_type_in` rules
+    appear in the bucket of each listed action type.
+    """
+
+    by_stage_action: Mapping[tuple[str, str], tuple[R, ...]]
+    wildcard: Mapping[str, tuple[R, ...]]
+
+    def select(self, stage: str, action_type: str) -> tuple[R, ...]:
+        rules = self.by_stage_action.get((stage, action_type))
+        if rules is None:
+            return self.wildcard.get(stage, ())
+        return rules
+
+
+def index_rules(rules: Iterable[R]) -> RuleIndex[R]:
+    """Build a `RuleIndex` from rules given in evaluation order."""
+    wildcard: dict[str, list[R]] = {}
+    by_stage_action: dict[tuple[str, str], list[R]] = {}
+    for rule in rules:
+        stage = rule.stage
+        if rule.action_types is None:
+            wildcard.setdefault(stage, []).append(rule)
+            for (bucket_stage, _), bucket in by_stage_action.items():
+                if bucket_stage == stage:
+                    bucket.append(rule)
+            continue
+        for action_type in rule.action_types:
+            key = (stage, action_type)
+            if key not in by_stage_action:
+                by_stage_action[key] = list(wildcard.get(stage, ()))
+            by_stage_action[key].append(rule)
+    return RuleIndex(
+        by_stage_action={key: tuple(bucket) for key, bucket in by_stage_action.items()},
+        wildcard={stage: tuple(bucket) for stage, bucket in wildcard.items()},
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    rule_id: str
+    stage: str
+    # None: applies to every action type.
+    action_types: frozenset[str] | None
+    # REQUIREMENTS rules without conditions fire only when required evidence is missing.
+    requires_missing_evidence: bool
+    guard: Predicate
+    # The guard over the policy's predicate bits; `None` when only `guard` can decide.
+    bits: BitGuard | None
+    # None when the rule's `then` block is unusable (the interpreter skips such rules).
+    effect: str | None
+    reason_codes: tuple[str, ...]
+    queries: tuple[dict[str, str], ...]
+    obligations: tuple[dict[str, Any], ...]
+    # VERDICT_PRECEDENCE of `effect` (-1 when the rule can never match).
+    precedence: int
+    # The policy's rule object, for analyses that need its conditions (e.g. batch masks).
+    source: Mapping[str, Any] = field(repr=False, compare=False)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPolicy:
+    """
+    A v0 policy lowered into an ordered rule program.
+
+    Rules are kept in evaluation order (stage by stage, policy order within a stage) with
+    `when`, `if`/`if_all`/`if_any` and `then` resolved once, so evaluation is a loop over
+    pre-bound predicates instead of re-dispatching on condition keys for every request.
+    `index` narrows that loop to the rules that apply to the request's action type.
+    Conditions are deduplicated across rules: each distinct one is tested at most once per
+    request (`predicates`) and rule guards combine the resulting bits. Rules that can never
+    match (see `lumyn.policy.validate.find_unreachable_rules`) are left out.
+    """
+
+    policy_hash: str | None
+    rules: tuple[CompiledRule, ...]
+    index: RuleIndex[CompiledRule]
+    required_evidence: Mapping[str, tuple[str, ...]]
+    default_verdict: Any
+    default_reason_code: Any
+    # Request fields the program can read besides `action_type` (see `_policy_reads`).
+    reads: frozenset[str] | None
+    predicates: PredicateBits[NormalizedRequest]
+    # Highest precedence any rule can produce (-1 without usable rules).
+    max_precedence: int
+
+    def evaluate(
+        self, normalized: NormalizedRequest, *, verdict_only: bool = False
+    ) -> EvaluationResult:
+        """Evaluate the program (see `evaluate_policy()` for `verdict_only`)."""
+        action_type = normalized.action_type
+        bits = self.predicates.evaluate(action_type, normalized)
+
+        matched_rules: list[MatchedRule] = []
+        reason_codes: list[str] = []
+        queries: list[dict[str, str]] = []
+        obligations: list[dict[str, Any]] = []
+        best = -1
+
+        for stage in STAGES:
+            if verdict_only and best >= self.max_precedence:
+                break
+            for rule in self.index.select(stage, action_type):
+                if verdict_only and rule.precedence <= best:
+                    continue
+                if rule.requires_missing_evidence and not self._required_evidence_missing(
+                    action_type, normalized
+                ):
+                    continue
+                if rule.bits is None:
+                    if not rule.guard(normalized):
+                        continue
+                elif not rule.bits.matches(bits):
+                    continue
+                if rule.effect is None:
+                    continue
+
+                matched_rules.append(
+                    MatchedRule(
+                        rule_id=rule.rule_id,
+                        stage=rule.stage,
+                        effect=rule.effect,
+                        reason_codes=list(rule.reason_codes),
+                    )
+                )
+                reason_codes.extend(rule.reason_codes)
+                queries.extend(dict(q) for q in rule.queries)
+                obligations.extend({**o, "source": dict(o["source"])} for o in rule.obligations)
+                best = max(best, rule.precedence)
+
+        if not matched_rules:
+            matched_rules.append(
+                MatchedRule(
+                    rule_id="DEFAULT",
+                    stage="DEFAULT",
+                    effect=self.default_verdict,
+                    reason_codes=[self.default_reason_code],
+                )
+            )
+            reason_codes.append(self.default_reason_code)
+
+        final_verdict = max(
+            matched_rules, key=lambda r: VERDICT_PRECEDENCE.get(r.effect, -1)
+        ).effect
+
+        if final_verdict != "QUERY":
+            queries = []
+
+        return EvaluationResult(
+            verdict=final_verdict,
+            reason_codes=reason_codes,
+            matched_rules=matched_rules,
+            queries=queries,
+            obligations=obligations,
+            partial=verdict_only,
+        )
+
+    def _required_evidence_missing(self, action_type: str, normalized: NormalizedRequest) -> bool:
+        required = self.required_evidence.get(action_type)
+        if required is None:
+            return False
+        evidence = normalized.evidence
+        return any(key not in evidence or evidence.get(key) in (None, "") for key in required)
+
+
+def _live_rules(policy: Mapping[str, Any], *, schema_version: str) -> list[Any]:
+    """`policy`'s rules without those that can never match (see `find_unreachable_rules`)."""
+    rules_raw = policy.get("rules", [])
+    if not isinstance(rules_raw, list):
+        return []
+    unreachable = find_unreachable_rules(policy, schema_version=schema_version)
+    pruned = {finding.index for finding in unreachable}
+    return [rule for i, rule in enumerate(rules_raw) if i not in pruned]
+
+
+def compile_policy(policy: Mapping[str, Any], *, policy_hash: str | None = None) -> CompiledPolicy:
+    """Compile a v0 policy into a `CompiledPolicy` (see `cached_compile_policy`)."""
+    required_evidence_raw = policy.get("required_evidence")
+    required_evidence: dict[str, tuple[str, ...]] = {}
+    if isinstance(required_evidence_raw, dict):
+        for action_type, keys in required_evidence_raw.items():
+            if isinstance(keys, list):
+                required_evidence[action_type] = tuple(k for k in keys if isinstance(k, str))
+
+    rules_list = _live_rules(policy, schema_version="policy.v0")
+
+    table: _PredicateTable[NormalizedRequest] = _PredicateTable()
+    compiled: list[CompiledRule] = []
+    for stage in STAGES:
+        for rule in rules_list:
+            if not isinstance(rule, dict) or rule.get("stage") != stage:
+                continue
+            rule_id = str(rule.get("id"))
+            effect, reason_codes, queries, obligations = compile_then(
+                rule_id, stage, rule.get("then", {})
+            )
+            compiled.append(
+                CompiledRule(
+                    rule_id=rule_id,
+                    stage=stage,
+                    action_types=when_action_types(rule.get("when")),
+                    requires_missing_evidence=stage == "REQUIREMENTS"
+                    and not any(rule.get(k) is not None for k in ("if", "if_all", "if_any")),
+                    guard=_compile_guard(rule),
+                    bits=_bit_guard(rule, table),
+                    effect=effect,
+                    reason_codes=reason_codes,
+                    queries=queries,
+                    obligations=obligations,
+                    precedence=-1 if effect is None else VERDICT_PRECEDENCE[effect],
+                    source=rule,
+                )
+            )
+
+    defaults_raw = policy.get("defaults")
+    defaults: Mapping[str, Any] = defaults_raw if isinstance(defaults_raw, dict) else {}
+    index = index_rules(compiled)
+    return CompiledPolicy(
+        policy_hash=policy_hash,
+        rules=tuple(compiled),
+        index=index,
+        required_evidence=required_evidence,
+        default_verdict=defaults.get("default_verdict", "ESCALATE"),
+        default_reason_code=defaults.get("default_reason_code", "NO_MATCH_DEFAULT_ESCALATE"),
+        reads=_policy_reads(rules_list, required_evidence, _condition_field),
+        predicates=_predicate_bits(index, table),
+        max_precedence=max((r.precedence for r in compiled), default=-1),
+    )
+
+
+_CONDITION_FIELDS: dict[str, str] = {
+    **{key: spec[0] for key, spec in NUMERIC_CONDITIONS.items()},
+    "amount_currency_is": "amount_currency",
+    "amount_currency_ne": "amount_currency",
+    "evidence.fx_rate_to_usd_present": "fx_rate_to_usd_present",
+    "evidence.payment_instrument_risk_is": "evidence.payment_instrument_risk",
+    "evidence.payment_instrument_risk_in": "evidence.payment_instrument_risk",
+    "evidence.manual_approval_is": "evidence.manual_approval",
+}
+
+
+def _condition_field(key: str) -> str | None:
+    return _CONDITION_FIELDS.get(key)
+
+
+def _policy_reads(
+    rules: list[Any],
+    required_evidence: Mapping[str, tuple[str, ...]],
+    condition_field: Callable[[str], str | None],
+    *,
+    strict: bool = False,
+) -> frozenset[str] | None:
+    """
+    Normalized request fields (`amount_usd`, `evidence.<key>`, ...) any rule can read.
+
+    `action_type` is always read and not listed. Returns `None` when the rules cannot be
+    analysed (with `strict`, malformed condition blocks that are evaluated as written).
+    Unknown condition keys read nothing: they either never match or raise.
+    """
+    reads: set[str] = {f"evidence.{key}" for keys in required_evidence.values() for key in keys}
+
+    def add_expr(expr: Any) -> bool:
+        if not expr:
+            return True
+        if not isinstance(expr, dict):
+            return not strict
+        for key in expr:
+            field = condition_field(key)
+            if field is not None:
+                reads.add(field)
+        return True
+
+    for rule in rules:
+        if not isinstance(rule, dict):
+            continue
+        if not add_expr(rule.get("if")):
+            return None
+        for block in ("if_all", "if_any"):
+            exprs = rule.get(block)
+            if not exprs:
+                continue
+            if not isinstance(exprs, list):
+                if strict:
+                    return None
+                continue
+            if not all(add_expr(expr) for expr in exprs):
+                return None
+    return frozenset(reads)
+
+
+_COMPILED_CACHE_SIZE = 32
+_compiled_cache: OrderedDict[str, CompiledPolicy] = OrderedDict()
+_compiled_cache_lock = threading.Lock()
+
+
+def _content_hash(policy: Mapping[str, Any]) -> str | None:
+    try:
+        return compute_policy_hash(policy)
+    except (TypeError, ValueError):  # not JSON-serializable
+        return None
+
+
+def cached_compile_policy(
+    policy: Mapping[str, Any], *, policy_hash: str | None = None
+) -> CompiledPolicy:
+    """
+    `compile_policy()` memoized by `policy_hash` (small process-wide LRU).
+
+    Without a `policy_hash` the policy's content hash (`compute_policy_hash()`) is used, so
+    one-off callers pay a canonical JSON dump per call instead of a compile. Policies that
+    are not JSON-serializable are compiled on every call.
+    """
+    if policy_hash is None:
+        policy_hash = _content_hash(policy)
+        if policy_hash is None:
+            return compile_policy(policy)
+    with _compiled_cache_lock:
+        compiled = _compiled_cache.get(policy_hash)
+        if compiled is not None:
+            _compiled_cache.move_to_end(policy_hash)
+            return compiled
+    compiled = compile_policy(policy, policy_hash=policy_hash)
+    with _compiled_cache_lock:
+        _compiled_cache[policy_hash] = compiled
+        while len(_compiled_cache) > _COMPILED_CACHE_SIZE:
+            _compiled_cache.popitem(last=False)
+    return compiled
+
+
+# --- policy.v1 --------------------------------------------------------------------------
+
+
+def _condition_field_v1(key: str) -> str | None:
+    parsed = parse_condition_key_v1(key)
+    return None if parsed is None else parsed[0]
+
+
+def _compile_expr_v1(expr: Any) -> PredicateV1:
+    if not expr:
+        return always
+    if not isinstance(expr, dict):
+        # Malformed expression: defer to the interpreter so it fails the same way.
+        return lambda n: _expr_matches(expr, n)
+    tests: list[PredicateV1] = []
+    for key, expected in expr.items():
+        condition = compile_condition_v1(key, expected)
+        if condition is None:
+            tests.append(never)
+            break  # `all()` stops at the first false condition
+        tests.append(condition.test)
+    if len(tests) == 1:
+        return tests[0]
+    compiled = tuple(tests)
+    return lambda n: all(t(n) for t in compiled)
+
+
+def _compile_guard_v1(rule: Mapping[str, Any]) -> PredicateV1:
+    parts: list[PredicateV1] = []
+
+    expr_if = rule.get("if")
+    if expr_if:
+        parts.append(_compile_expr_v1(expr_if))
+
+    # Non-list if_all/if_any are malformed; they are left to the interpreter's semantics.
+    expr_if_all = rule.get("if_all")
+    if isinstance(expr_if_all, list) and expr_if_all:
+        all_of = tuple(_compile_expr_v1(cond) for cond in expr_if_all)
+        parts.append(lambda n: all(p(n) for p in all_of))
+    elif expr_if_all:
+        parts.append(lambda n: all(_expr_matches(cond, n) for cond in expr_if_all))
+
+    expr_if_any = rule.get("if_any")
+    if isinstance(expr_if_any, list) and expr_if_any:
+        any_of = tuple(_compile_expr_v1(cond) for cond in expr_if_any)
+        parts.append(lambda n: any(p(n) for p in any_of))
+    elif expr_if_any:
+        parts.append(lambda n: any(_expr_matches(cond, n) for cond in expr_if_any))
+
+    parts = [p for p in parts if p is not always]
+    if not parts:
+        return always
+    if len(parts) == 1:
+        return parts[0]
+    guards = tuple(parts)
+    return lambda n: all(p(n) for p in guards)
+
+
+def _bit_guard_v1(
+    rule: Mapping[str, Any], table: _PredicateTable[NormalizedRequestV1]
+) -> BitGuard | None:
+    """v1 counterpart of `_bit_guard()`; unknown condition keys also keep the predicate guard."""
+
+    def expr_bits(expr: Any) -> int | None:
+        if not expr:
+            return 0
+        if not isinstance(expr, dict):
+            return None
+        mask = 0
+        for key, expected in expr.items():
+            condition = compile_condition_v1(key, expected)
+            if condition is None or not condition.total:
+                return None
+            threshold = None
+            if condition.op in V1_ORDERINGS:
+                threshold = _Threshold(
+                    field=condition.field,
+                    get=field_getter_v1(condition.field),
+                    types=(int, float),
+                    op=V1_ORDERINGS[condition.op],
+                    threshold=condition.expected,
+                )
+            mask |= table.bit(key, expected, condition.test, threshold)
+        return mask
+
+    exprs_all: list[Any] = [rule.get("if")]
+    expr_if_all = rule.get("if_all")
+    if expr_if_all:
+        if not isinstance(expr_if_all, list):
+            return None
+        exprs_all.extend(expr_if_all)
+    required = 0
+    for expr in exprs_all:
+        mask = expr_bits(expr)
+        if mask is None:
+            return None
+        required |= mask
+
+    expr_if_any = rule.get("if_any")
+    if not expr_if_any:
+        return BitGuard(required=required)
+    if not isinstance(expr_if_any, list):
+        return None
+    alternatives: list[int] = []
+    for expr in expr_if_any:
+        mask = expr_bits(expr)
+        if mask is None:
+            return None
+        alternatives.append(mask)
+    any_of = _any_of(alternatives)
+    return BitGuard(required=required) if any_of is None else replace(any_of, required=required)
+
+
+def _defaults_v1(policy: Mapping[str, Any]) -> tuple[Any, Any]:
+    defaults = policy.get("defaults", {})
+    default_verdict = defaults.get("default_verdict", "ESCALATE")
+    if default_verdict == "TRUST":
+        default_verdict = "ALLOW"
+    if default_verdict == "QUERY":
+        default_verdict = "DENY"
+    return default_verdict, defaults.get("default_reason_code", "NO_MATCH_DEFAULT_ESCALATE")
+
+
+def _precedence_v1(then: Any) -> int:
+    try:
+        effect = then_v1(then)[0]
+    except Exception:
+        return max(VERDICT_PRECEDENCE_V1.values())
+    return -1 if effect is None else VERDICT_PRECEDENCE_V1[effect]
+
+
+def _deferred(fn: Callable[..., T], *args: Any) -> Callable[[], T]:
+    """Run `fn` now if it succeeds, otherwise re-run (and raise) only when it is needed."""
+    try:
+        result = fn(*args)
+    except Exception:
+        return lambda: fn(*args)
+    return lambda: result
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRuleV1:
+    rule_id: str
+    stage: str
+    # None: applies to every action type.
+    action_types: frozenset[str] | None
+    guard: PredicateV1
+    # The guard over the policy's predicate bits; `None` when only `guard` can decide.
+    bits: BitGuard | None
+    then: Callable[[], tuple[str | None, tuple[Any, ...], tuple[Any, ...], tuple[Any, ...]]]
+    # VERDICT_PRECEDENCE_V1 of the effect; -1 when the rule can never match, and the highest
+    # precedence when its `then` block only fails once evaluated.
+    precedence: int
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPolicyV1:
+    """
+    A v1 policy lowered into an ordered rule program.
+
+    Every condition key is parsed once into a `(field, op, expected)` triple, so
+    evaluation is a dict lookup and a comparison per condition, and only the rules in
+    `index` for the request's action type are visited. As for v0, each distinct condition
+    is tested at most once per request (`predicates`).
+    """
+
+    policy_hash: str | None
+    rules: tuple[CompiledRuleV1, ...]
+    index: RuleIndex[CompiledRuleV1]
+    defaults: Callable[[], tuple[Any, Any]]
+    # Request fields the program can read besides `action_type` (see `_policy_reads`).
+    reads: frozenset[str] | None
+    predicates: PredicateBits[NormalizedRequestV1]
+    # Highest precedence any rule can produce (-1 without usable rules).
+    max_precedence: int
+
+    def evaluate(
+        self, normalized: NormalizedRequestV1, *, verdict_only: bool = False
+    ) -> EvaluationResultV1:
+        """Evaluate the program (see `evaluate_policy_v1()` for `verdict_only`)."""
+        action_type = normalized.action_type
+        bits = self.predicates.evaluate(action_type, normalized)
+
+        matched_rules: list[MatchedRuleV1] = []
+        reason_codes: list[str] = []
+        queries: list[dict[str, str]] = []
+        obligations: list[dict[str, Any]] = []
+        best = -1
+
+        for stage in STAGES_V1:
+            if verdict_only and best >= self.max_precedence:
+                break
+            for rule in self.index.select(stage, action_type):
+                if verdict_only and rule.precedence <= best:
+                    continue
+                if rule.bits is None:
+                    if not rule.guard(normalized):
+                        continue
+                elif not rule.bits.matches(bits):
+                    continue
+                effect, then_reason_codes, then_queries, then_obligations = rule.then()
+                if effect is None:
+                    continue
+
+                matched_rules.append(
+                    MatchedRuleV1(
+                        rule_id=rule.rule_id,
+                        stage=rule.stage,
+                        effect=effect,
+                        reason_codes=list(then_reason_codes),
+                    )
+                )
+                reason_codes.extend(then_reason_codes)
+                queries.extend(then_queries)
+                obligations.extend(then_obligations)
+                best = max(best, rule.precedence)
+
+        if not matched_rules:
+            default_verdict, default_reason = self.defaults()
+            matched_rules.append(
+                MatchedRuleV1(
+                    rule_id="DEFAULT",
+                    stage="DEFAULT",
+                    effect=default_verdict,
+                    reason_codes=[default_reason],
+                )
+            )
+            reason_codes.append(default_reason)
+
+        final_verdict = max(
+            matched_rules, key=lambda r: VERDICT_PRECEDENCE_V1.get(r.effect, -1)
+        ).effect
+
+        if final_verdict != "DENY":
+            queries = []
+
+        return EvaluationResultV1(
+            verdict=final_verdict,
+            reason_codes=reason_codes,
+            matched_rules=matched_rules,
+            queries=queries,
+            obligations=obligations,
+            partial=verdict_only,
+        )
+
+
+def compile_policy_v1(
+    policy: Mapping[str, Any], *, policy_hash: str | None = None
+) -> CompiledPolicyV1:
+    """Compile a v1 policy into a `CompiledPolicyV1` (see `cached_compile_policy_v1`)."""
+    rules_list = _live_rules(policy, schema_version="policy.v1")
+
+    table: _PredicateTable[NormalizedRequestV1] = _PredicateTable()
+    compiled: list[CompiledRuleV1] = []
+    for stage in STAGES_V1:
+        for rule in rules_list:
+            if not isinstance(rule, dict) or rule.get("stage") != stage:
+                continue
+            then = rule.get("then", {})
+            compiled.append(
+                CompiledRuleV1(
+                    rule_id=str(rule.get("id")),
+                    stage=stage,
+                    action_types=when_action_types_v1(rule.get("when", {})),
+                    guard=_compile_guard_v1(rule),
+                    bits=_bit_guard_v1(rule, table),
+                    then=_deferred(then_v1, then),
+                    precedence=_precedence_v1(then),
+                )
+            )
+
+    index = index_rules(compiled)
+    return CompiledPolicyV1(
+        policy_hash=policy_hash,
+        rules=tuple(compiled),
+        index=index,
+        defaults=_deferred(_defaults_v1, policy),
+        reads=_policy_reads(rules_list, {}, _condition_field_v1, strict=True),
+        predicates=_predicate_bits(index, table),
+        max_precedence=max((r.precedence for r in compiled), default=-1),
+    )
+
+
+_compiled_cache_v1: OrderedDict[str, CompiledPolicyV1] = OrderedDict()
+
+
+def cached_compile_policy_v1(
+    policy: Mapping[str, Any], *, policy_hash: str | None = None
+) -> CompiledPolicyV1:
+    """`compile_policy_v1()` memoized like `cached_compile_policy()`."""
+    if policy_hash is None:
+        policy_hash = _content_hash(policy)
+        if policy_hash is None:
+            return compile_policy_v1(policy)
+    with _compiled_cache_lock:
+        compiled = _compiled_cache_v1.get(policy_hash)
+        if compiled is not None:
+            _compiled_cache_v1.move_to_end(policy_hash)
+            return compiled
+    compiled = compile_policy_v1(policy, policy_hash=policy_hash)
+    with _compiled_cache_lock:
+        _compiled_cache_v1[policy_hash] = compiled
+        while len(_compiled_cache_v1) > _COMPILED_CACHE_SIZE:
+            _compiled_cache_v1.popitem(last=False)
+    return compiled
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import operator
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from lumyn.engine.evaluator import VERDICT_PRECEDENCE, _eval_condition
+from lumyn.engine.normalize import NormalizedRequest
+from lumyn.engine.normalize_v1 import NormalizedRequestV1
+
+# Condition and `then` block semantics shared by the rule compiler (`lumyn.engine.compiler`)
+# and the static policy analysis (`lumyn.policy.validate`).
+
+Predicate = Callable[[NormalizedRequest], bool]
+PredicateV1 = Callable[[NormalizedRequestV1], bool]
+
+
+def always(_: Any) -> bool:
+    return True
+
+
+def never(_: Any) -> bool:
+    return False
+
+
+# Numeric comparisons: condition key -> (field, operator, cast, accepted value types).
+NUMERIC_CONDITIONS: dict[str, tuple[str, Callable[[Any, Any], bool], type, tuple[type, ...]]] = {
+    "amount_usd_gt": ("amount_usd", operator.gt, float, (int, float)),
+    "amount_usd_gte": ("amount_usd", operator.ge, float, (int, float)),
+    "amount_usd_lt": ("amount_usd", operator.lt, float, (int, float)),
+    "amount_usd_lte": ("amount_usd", operator.le, float, (int, float)),
+    "evidence.failure_similarity_score_gte": (
+        "evidence.failure_similarity_score",
+        operator.ge,
+        float,
+        (int, float),
+    ),
+    "evidence.chargeback_risk_gte": ("evidence.chargeback_risk", operator.ge, float, (int, float)),
+    "evidence.chargeback_risk_lt": ("evidence.chargeback_risk", operator.lt, float, (int, float)),
+    "evidence.previous_refund_count_90d_gte": (
+        "evidence.previous_refund_count_90d",
+        operator.ge,
+        int,
+        (int,),
+    ),
+    "evidence.previous_refund_count_90d_lt": (
+        "evidence.previous_refund_count_90d",
+        operator.lt,
+        int,
+        (int,),
+    ),
+    "evidence.customer_age_days_lt": ("evidence.customer_age_days", operator.lt, int, (int,)),
+    "evidence.customer_age_days_gte": ("evidence.customer_age_days", operator.ge, int, (int,)),
+    "evidence.account_takeover_risk_gte": (
+        "evidence.account_takeover_risk",
+        operator.ge,
+        float,
+        (int, float),
+    ),
+}
+
+
+def field_getter(field: str) -> Callable[[NormalizedRequest], Any]:
+    if field == "amount_currency":
+        return lambda n: n.amount_currency
+    if field == "amount_usd":
+        return lambda n: n.amount_usd
+    evidence_key = field.removeprefix("evidence.")
+    return lambda n: n.evidence.get(evidence_key)
+
+
+@dataclass(frozen=True, slots=True)
+class LazyCondition:
+    # Keeps the interpreter's exact (lazy) error behavior for conditions that cannot be
+    # pre-bound, e.g. unsupported keys or thresholds that do not cast.
+    key: str
+    expected: Any
+
+    def __call__(self, normalized: NormalizedRequest) -> bool:
+        return _eval_condition(self.key, self.expected, normalized)
+
+
+def compile_condition(key: str, expected: Any) -> Predicate:
+    """Resolve one `if` condition into a predicate with its operator and operand pre-bound."""
+    numeric = NUMERIC_CONDITIONS.get(key)
+    if numeric is not None:
+        field, op, cast, types = numeric
+        try:
+            threshold = cast(expected)
+        except (TypeError, ValueError, OverflowError):
+            return LazyCondition(key, expected)
+        get = field_getter(field)
+
+        def _numeric(n: NormalizedRequest) -> bool:
+            val = get(n)
+            return isinstance(val, types) and op(val, threshold)
+
+        return _numeric
+
+    if key == "amount_currency_is":
+        return lambda n: bool(n.amount_currency == expected)
+    if key == "amount_currency_ne":
+        return lambda n: bool(n.amount_currency != expected)
+
+    if key == "evidence.fx_rate_to_usd_present":
+        if not isinstance(expected, bool):
+            return never
+        return lambda n: bool(n.fx_rate_to_usd_present) is expected
+
+    if key == "evidence.payment_instrument_risk_is":
+        return lambda n: bool(n.evidence.get("payment_instrument_risk") == expected)
+    if key == "evidence.payment_instrument_risk_in":
+        if not isinstance(expected, list):
+            return never
+        allowed = frozenset(v for v in expected if isinstance(v, str))
+
+        def _in(n: NormalizedRequest) -> bool:
+            val = n.evidence.get("payment_instrument_risk")
+            return isinstance(val, str) and val in allowed
+
+        return _in
+
+    if key == "evidence.manual_approval_is":
+        if not isinstance(expected, bool):
+            return never
+
+        def _is(n: NormalizedRequest) -> bool:
+            val = n.evidence.get("manual_approval")
+            return isinstance(val, bool) and val is expected
+
+        return _is
+
+    return LazyCondition(key, expected)
+
+
+def when_action_types(when: Any) -> frozenset[str] | None:
+    """Action types a `when` block applies to; `None` means every action type."""
+    if not isinstance(when, dict) or not when:
+        return None
+    if "action_type" in when:
+        value = when["action_type"]
+        return frozenset((value,)) if isinstance(value, str) else frozenset()
+    if "action_type_in" in when:
+        values = when["action_type_in"]
+        if not isinstance(values, list):
+            return frozenset()
+        return frozenset(v for v in values if isinstance(v, str))
+    return frozenset()
+
+
+def compile_then(
+    rule_id: str, stage: str, then: Any
+) -> tuple[str | None, tuple[str, ...], tuple[dict[str, str], ...], tuple[dict[str, Any], ...]]:
+    """`(effect, reason_codes, queries, obligations)` of a v0 `then` block (effect `None`: none)."""
+    if not isinstance(then, dict):
+        return None, (), (), ()
+    effect = then.get("verdict")
+    if effect not in VERDICT_PRECEDENCE:
+        return None, (), (), ()
+    reason_codes = then.get("reason_codes", [])
+    if not isinstance(reason_codes, list) or not all(isinstance(c, str) for c in reason_codes):
+        return None, (), (), ()
+
+    queries: list[dict[str, str]] = []
+    then_queries = then.get("queries", [])
+    if isinstance(then_queries, list):
+        for item in then_queries:
+            if (
+                isinstance(item, dict)
+                and isinstance(item.get("field"), str)
+                and isinstance(item.get("question"), str)
+            ):
+                queries.append({"field": item["field"], "question": item["question"]})
+
+    obligations: list[dict[str, Any]] = []
+    then_obligations = then.get("obligations", [])
+    if isinstance(then_obligations, list):
+        for item in then_obligations:
+            if not isinstance(item, dict):
+                continue
+            obligation = dict(item)
+            source = obligation.get("source")
+            if isinstance(source, dict):
+                source = dict(source)
+                source.setdefault("rule_id", rule_id)
+                source.setdefault("stage", stage)
+            else:
+                source = {"rule_id": rule_id, "stage": stage}
+            obligation["source"] = source
+            obligations.append(obligation)
+
+    return effect, tuple(reason_codes), tuple(queries), tuple(obligations)
+
+
+# --- policy.v1 --------------------------------------------------------------------------
+
+# v1 Stages - matched against policy.v1 spec
+STAGES_V1 = ("REQUIREMENTS", "HARD_BLOCKS", "ESCALATIONS", "ALLOW_PATHS")
+
+# v1 Verdict Precedence
+# ABSTAIN (System/Input failure) > DENY > ESCALATE > ALLOW
+VERDICT_PRECEDENCE_V1 = {"ABSTAIN": 3, "DENY": 2, "ESCALATE": 1, "ALLOW": 0}
+
+V1_OPERATORS = ("is", "ne", "in", "gt", "gte", "lt", "lte")
+
+
+_V1_AMOUNT_CONDITIONS: dict[str, tuple[str, str]] = {
+    "amount_currency_is": ("amount_currency", "is"),
+    "amount_currency_ne": ("amount_currency", "ne"),
+    "amount_usd_gt": ("amount_usd", "gt"),
+    "amount_usd_gte": ("amount_usd", "gte"),
+    "amount_usd_lt": ("amount_usd", "lt"),
+    "amount_usd_lte": ("amount_usd", "lte"),
+}
+
+
+V1_ORDERINGS: dict[str, Callable[[Any, Any], bool]] = {
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+
+def parse_condition_key_v1(key: str) -> tuple[str, str] | None:
+    """
+    Split a v1 condition key into `(field, operator)`.
+
+    `field` is `amount_currency`, `amount_usd` or `evidence.<key>`; `None` means the key
+    never matches (unknown keys and `evidence.*` keys without an operator suffix).
+    """
+    amount = _V1_AMOUNT_CONDITIONS.get(key)
+    if amount is not None:
+        return amount
+    if not key.startswith("evidence."):
+        return None
+    op = key.split("_")[-1]
+    if op not in V1_OPERATORS:
+        return None
+    return key.removesuffix(f"_{op}"), op
+
+
+@dataclass(frozen=True, slots=True)
+class ConditionV1:
+    """One v1 condition resolved to `(field, op, expected)` with a pre-bound `test`."""
+
+    field: str
+    op: str
+    expected: Any
+    test: PredicateV1
+    # False when `test` can raise (a threshold that only fails once a value is compared).
+    total: bool = True
+
+
+def field_getter_v1(field: str) -> Callable[[NormalizedRequestV1], Any]:
+    if field == "amount_currency":
+        return lambda n: n.amount_currency
+    if field == "amount_usd":
+        return lambda n: n.amount_usd
+    evidence_key = field.removeprefix("evidence.")
+    return lambda n: n.evidence.get(evidence_key)
+
+
+def compile_condition_v1(key: str, expected: Any) -> ConditionV1 | None:
+    """Compile one v1 condition; `None` when the key can never match."""
+    parsed = parse_condition_key_v1(key)
+    if parsed is None:
+        return None
+    field, op = parsed
+    get = field_getter_v1(field)
+    test: PredicateV1
+
+    if op == "is":
+
+        def test(n: NormalizedRequestV1) -> bool:
+            return bool(get(n) == expected)
+
+    elif op == "ne":
+
+        def test(n: NormalizedRequestV1) -> bool:
+            return bool(get(n) != expected)
+
+    elif op == "in":
+        if not isinstance(expected, list):
+            return ConditionV1(field=field, op=op, expected=expected, test=never)
+        members = tuple(expected)
+        try:
+            lookup: frozenset[Any] | tuple[Any, ...] = frozenset(members)
+        except TypeError:
+            lookup = members
+
+        def test(n: NormalizedRequestV1) -> bool:
+            val = get(n)
+            try:
+                return val in lookup
+            except TypeError:  # unhashable value
+                return val in members
+
+    else:
+        compare = V1_ORDERINGS[op]
+        try:
+            threshold = float(expected)
+        except (TypeError, ValueError, OverflowError):
+            # Raise when a numeric value is actually compared, like the interpreter.
+            def test(n: NormalizedRequestV1) -> bool:
+                val = get(n)
+                return isinstance(val, int | float) and compare(val, float(expected))
+
+            return ConditionV1(field=field, op=op, expected=expected, test=test, total=False)
+
+        else:
+
+            def test(n: NormalizedRequestV1) -> bool:
+                val = get(n)
+                return isinstance(val, int | float) and compare(val, threshold)
+
+            return ConditionV1(field=field, op=op, expected=threshold, test=test)
+
+    return ConditionV1(field=field, op=op, expected=expected, test=test)
+
+
+def when_action_types_v1(when: Any) -> frozenset[str] | None:
+    # v1 `when` only constrains `action_type` (`action_type_in` is not part of policy.v1).
+    if not when:
+        return None
+    value = when.get("action_type")  # a malformed (non-object) `when` raises here
+    if not value:
+        return None
+    return frozenset((value,)) if isinstance(value, str) else frozenset()
+
+
+def then_v1(then: Any) -> tuple[str | None, tuple[Any, ...], tuple[Any, ...], tuple[Any, ...]]:
+    """Like `compile_then()` for v1; raises on a malformed block, as the interpreter does."""
+    effect = then.get("verdict")
+    if effect not in VERDICT_PRECEDENCE_V1:
+        if effect == "TRUST":
+            effect = "ALLOW"
+        elif effect == "QUERY":
+            effect = "DENY"
+        else:
+            return None, (), (), ()
+    reason_codes = tuple(list(then.get("reason_codes", [])))
+    queries = tuple(then.get("queries", [])) if effect == "DENY" else ()
+    obligations = tuple(then.get("obligations", []))
+    return effect, reason_codes, queries, obligations
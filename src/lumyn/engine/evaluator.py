@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from lumyn.engine.normalize import NormalizedRequest, normalize_request
 
+if TYPE_CHECKING:
+    from lumyn.engine.memo import EvaluationMemo
+
 STAGES = ("REQUIREMENTS", "HARD_BLOCKS", "ESCALATIONS", "TRUST_PATHS")
 VERDICT_PRECEDENCE = {"ABSTAIN": 3, "QUERY": 2, "ESCALATE": 1, "TRUST": 0}
 
@@ -24,21 +27,8 @@ class EvaluationResult:
     matched_rules: list[MatchedRule]
     queries: list[dict[str, str]]
     obligations: list[dict[str, Any]]
-
-
-def _when_matches(action_type: str, when: dict[str, Any] | None) -> bool:
-    if not when:
-        return True
-    if "action_type" in when:
-        value = when["action_type"]
-        return isinstance(value, str) and value == action_type
-    if "action_type_in" in when:
-        values = when["action_type_in"]
-        if not isinstance(values, list):
-            return False
-        allowed = [v for v in values if isinstance(v, str)]
-        return action_type in allowed
-    return False
+    # True for verdict-only evaluations: only the rules needed to settle the verdict ran.
+    partial: bool = False
 
 
 def _value_from_key(key: str, normalized: NormalizedRequest) -> Any:
@@ -122,169 +112,37 @@ def _eval_condition(key: str, expected: Any, normalized: NormalizedRequest) -> b
     raise ValueError(f"unsupported condition key: {key}")
 
 
-def _expr_matches(expr: dict[str, Any] | None, normalized: NormalizedRequest) -> bool:
-    if not expr:
-        return True
-    return all(_eval_condition(key, expected, normalized) for key, expected in expr.items())
-
-
-def _required_evidence_missing(
-    *,
-    action_type: str,
-    normalized: NormalizedRequest,
-    required_evidence: dict[str, Any],
-) -> bool:
-    required = required_evidence.get(action_type)
-    if not isinstance(required, list):
-        return False
-    for key in required:
-        if not isinstance(key, str):
-            continue
-        if key not in normalized.evidence or normalized.evidence.get(key) in (None, ""):
-            return True
-    return False
-
-
 def evaluate_policy(
     request: dict[str, Any],
     *,
     policy: dict[str, Any],
+    policy_hash: str | None = None,
+    memo: EvaluationMemo | None = None,
+    normalized: NormalizedRequest | None = None,
+    verdict_only: bool = False,
 ) -> EvaluationResult:
-    normalized = normalize_request(request)
-    action_type = normalized.action_type
-
-    matched_rules: list[MatchedRule] = []
-    reason_codes: list[str] = []
-    queries: list[dict[str, str]] = []
-    obligations: list[dict[str, Any]] = []
-
-    required_evidence = policy.get("required_evidence")
-    required_evidence_map: dict[str, Any] = (
-        dict(required_evidence) if isinstance(required_evidence, dict) else {}
-    )
-
-    rules = policy.get("rules", [])
-    rules_list = rules if isinstance(rules, list) else []
-
-    for stage in STAGES:
-        for rule in rules_list:
-            if not isinstance(rule, dict):
-                continue
-            if rule.get("stage") != stage:
-                continue
-            rule_id = str(rule.get("id"))
-
-            when = rule.get("when")
-            if not _when_matches(action_type, when if isinstance(when, dict) else None):
-                continue
-
-            if stage == "REQUIREMENTS" and not any(
-                rule.get(k) is not None for k in ("if", "if_all", "if_any")
-            ):
-                if not _required_evidence_missing(
-                    action_type=action_type,
-                    normalized=normalized,
-                    required_evidence=required_evidence_map,
-                ):
-                    continue
-
-            expr_if = rule.get("if")
-            if expr_if is not None and not _expr_matches(
-                expr_if if isinstance(expr_if, dict) else None, normalized
-            ):
-                continue
-
-            expr_if_all = rule.get("if_all")
-            if expr_if_all is not None:
-                if not isinstance(expr_if_all, list):
-                    continue
-                if not all(
-                    _expr_matches(expr if isinstance(expr, dict) else None, normalized)
-                    for expr in expr_if_all
-                ):
-                    continue
-
-            expr_if_any = rule.get("if_any")
-            if expr_if_any is not None:
-                if not isinstance(expr_if_any, list):
-                    continue
-                if not any(
-                    _expr_matches(expr if isinstance(expr, dict) else None, normalized)
-                    for expr in expr_if_any
-                ):
-                    continue
-
-            then = rule.get("then", {})
-            if not isinstance(then, dict):
-                continue
-            effect = then.get("verdict")
-            if effect not in VERDICT_PRECEDENCE:
-                continue
-            then_reason_codes = then.get("reason_codes", [])
-            if not isinstance(then_reason_codes, list) or not all(
-                isinstance(code, str) for code in then_reason_codes
-            ):
-                continue
-
-            matched_rules.append(
-                MatchedRule(
-                    rule_id=rule_id,
-                    stage=stage,
-                    effect=effect,
-                    reason_codes=list(then_reason_codes),
-                )
-            )
-            reason_codes.extend(then_reason_codes)
-
-            then_queries = then.get("queries", [])
-            if isinstance(then_queries, list):
-                for item in then_queries:
-                    if (
-                        isinstance(item, dict)
-                        and isinstance(item.get("field"), str)
-                        and isinstance(item.get("question"), str)
-                    ):
-                        queries.append({"field": item["field"], "question": item["question"]})
-
-            then_obligations = then.get("obligations", [])
-            if isinstance(then_obligations, list):
-                for item in then_obligations:
-                    if not isinstance(item, dict):
-                        continue
-                    obligation = dict(item)
-                    obligation.setdefault("source", {})
-                    source = obligation.get("source")
-                    if isinstance(source, dict):
-                        source.setdefault("rule_id", rule_id)
-                        source.setdefault("stage", stage)
-                    else:
-                        obligation["source"] = {"rule_id": rule_id, "stage": stage}
-                    obligations.append(obligation)
-
-    if not matched_rules:
-        defaults_raw = policy.get("defaults")
-        defaults: dict[str, Any] = defaults_raw if isinstance(defaults_raw, dict) else {}
-        default_verdict = defaults.get("default_verdict", "ESCALATE")
-        default_reason = defaults.get("default_reason_code", "NO_MATCH_DEFAULT_ESCALATE")
-        matched_rules.append(
-            MatchedRule(
-                rule_id="DEFAULT",
-                stage="DEFAULT",
-                effect=default_verdict,
-                reason_codes=[default_reason],
-            )
-        )
-        reason_codes.append(default_reason)
-
-    final_verdict = max(matched_rules, key=lambda r: VERDICT_PRECEDENCE.get(r.effect, -1)).effect
-
-    if final_verdict != "QUERY":
-        queries = []
-
-    return EvaluationResult(
-        verdict=final_verdict,
-        reason_codes=reason_codes,
-        matched_rules=matched_rules,
-        queries=queries,
-        obligations=obligations,
-    )
+    """
+    Evaluate a v0 policy against `request` by running its compiled rule program.
+
+    Programs are cached by the policy's `policy_hash`; without one its content hash is
+    computed on every call (see `cached_compile_policy()`), so pass it when it is known.
+    With a `memo` (and a `policy_hash`), repeated evaluations of the same inputs are served
+    from it. Callers that already normalized `request` (e.g. to evaluate it against several
+    policies) can pass `normalized` to skip normalizing it again.
+
+    With `verdict_only`, rules that can no longer change the verdict are skipped (together
+    with any error they would raise) and evaluation stops once the highest-precedence
+    verdict the policy can produce has matched. The result is marked `partial`: its matched
+    rules, reason codes, queries and obligations only cover the rules that ran. Such results
+    bypass the memo.
+    """
+    from lumyn.engine.compiler import cached_compile_policy
+
+    compiled = cached_compile_policy(policy, policy_hash=policy_hash)
+    if normalized is None:
+        normalized = normalize_request(request)
+    if verdict_only:
+        return compiled.evaluate(normalized, verdict_only=True)
+    if memo is not None and policy_hash is not None:
+        return memo.evaluate(compiled, normalized, lambda: compiled.evaluate(normalized))
+    return compiled.evaluate(normalized)
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from lumyn.engine.conditions import STAGES_V1
+from lumyn.engine.conditions import VERDICT_PRECEDENCE_V1 as VERDICT_PRECEDENCE_V1
 from lumyn.engine.normalize_v1 import NormalizedRequestV1, normalize_request_v1
-from lumyn.records.emit_v1 import EvaluationResultV1, MatchedRuleV1
+from lumyn.records.emit_v1 import EvaluationResultV1
 
-# v1 Stages - matched against policy.v1 spec
-STAGES = ("REQUIREMENTS", "HARD_BLOCKS", "ESCALATIONS", "ALLOW_PATHS")
+if TYPE_CHECKING:
+    from lumyn.engine.memo import EvaluationMemo
 
-# v1 Verdict Precedence
-# ABSTAIN (System/Input failure) > DENY > ESCALATE > ALLOW
-VERDICT_PRECEDENCE_V1 = {"ABSTAIN": 3, "DENY": 2, "ESCALATE": 1, "ALLOW": 0}
+# v1 stage order and verdict precedence live with the shared condition semantics.
+STAGES = STAGES_V1
 
 # Supported Condition Keys (v1 strict)
 SUPPORTED_KEYS = {
@@ -137,117 +138,33 @@ def evaluate_policy_v1(
     request: dict[str, Any],
     *,
     policy: dict[str, Any],
+    policy_hash: str | None = None,
+    memo: EvaluationMemo | None = None,
+    normalized: NormalizedRequestV1 | None = None,
+    verdict_only: bool = False,
 ) -> EvaluationResultV1:
-    normalized = normalize_request_v1(request)
-    action_type = normalized.action_type
-
-    matched_rules: list[MatchedRuleV1] = []
-    reason_codes: list[str] = []
-    queries: list[dict[str, str]] = []
-    obligations: list[dict[str, Any]] = []
-
-    # v1 policy logic ...
-    # This logic mimics the v0 loop but uses v1 dataclasses/verdicts
-
-    rules = policy.get("rules", [])
-    rules_list = rules if isinstance(rules, list) else []
-
-    for stage in STAGES:
-        for rule in rules_list:
-            if not isinstance(rule, dict):
-                continue
-            if rule.get("stage") != stage:
-                continue
-            rule_id = str(rule.get("id"))
-
-            when = rule.get("when", {})
-            # Simplified match
-            if when and when.get("action_type") and when["action_type"] != action_type:
-                continue
-
-            # Check if/if_all/if_any
-
-            # 1. "if": match ALL conditions in the dict (implicit AND)
-            expr_if = rule.get("if")
-            if expr_if and not _expr_matches(expr_if, normalized):
-                continue
-
-            # 2. "if_all": list of condition dicts, ALL must match
-            expr_if_all = rule.get("if_all")
-            if expr_if_all:
-                if not all(_expr_matches(cond, normalized) for cond in expr_if_all):
-                    continue
-
-            # 3. "if_any": list of condition dicts, AT LEAST ONE must match
-            expr_if_any = rule.get("if_any")
-            if expr_if_any:
-                if not any(_expr_matches(cond, normalized) for cond in expr_if_any):
-                    continue
-
-            then = rule.get("then", {})
-            effect = then.get("verdict")
-            if effect not in VERDICT_PRECEDENCE_V1:
-                # Mapper from v0 terms if we are using v0 policies in v1 engine?
-                # TRUST -> ALLOW, QUERY -> DENY
-                if effect == "TRUST":
-                    effect = "ALLOW"
-                elif effect == "QUERY":
-                    effect = "DENY"
-                elif effect not in VERDICT_PRECEDENCE_V1:
-                    continue
-
-            then_reason_codes = then.get("reason_codes", [])
-
-            matched_rules.append(
-                MatchedRuleV1(
-                    rule_id=rule_id,
-                    stage=stage,
-                    effect=effect,
-                    reason_codes=list(then_reason_codes),
-                )
-            )
-            reason_codes.extend(then_reason_codes)
-
-            # Queries (on DENY)
-            if effect == "DENY":
-                then_queries = then.get("queries", [])
-                for q in then_queries:
-                    queries.append(q)
-
-            # Obligations (on ALLOW/DENY?)
-            for o in then.get("obligations", []):
-                obligations.append(o)
-
-    # Defaults
-    if not matched_rules:
-        defaults = policy.get("defaults", {})
-        default_verdict = defaults.get("default_verdict", "ESCALATE")
-        if default_verdict == "TRUST":
-            default_verdict = "ALLOW"
-        if default_verdict == "QUERY":
-            default_verdict = "DENY"
-
-        default_reason = defaults.get("default_reason_code", "NO_MATCH_DEFAULT_ESCALATE")
-
-        matched_rules.append(
-            MatchedRuleV1(
-                rule_id="DEFAULT",
-                stage="DEFAULT",
-                effect=default_verdict,
-                reason_codes=[default_reason],
-            )
-        )
-        reason_codes.append(default_reason)
-
-    final_verdict = max(matched_rules, key=lambda r: VERDICT_PRECEDENCE_V1.get(r.effect, -1)).effect
-
-    if final_verdict != "DENY":
-        queries = []  # Only return queries if DENY? Or if verdict requires info? V0 is QUERY only.
-
-    return EvaluationResultV1(
-        verdict=final_verdict,
-        reason_codes=reason_codes,
-        matched_rules=matched_rules,
-        queries=queries,
-        obligations=obligations,
-    )
+    """
+    Evaluate a v1 policy against `request` by running its compiled rule program.
+
+    Programs are cached by the policy's `policy_hash`; without one its content hash is
+    computed on every call (see `cached_compile_policy()`), so pass it when it is known.
+    With a `memo` (and a `policy_hash`), repeated evaluations of the same inputs are served
+    from it. Callers that already normalized `request` (e.g. to evaluate it against several
+    policies) can pass `normalized` to skip normalizing it again.
+
+    With `verdict_only`, rules that can no longer change the verdict are skipped (together
+    with any error they would raise) and evaluation stops once the highest-precedence
+    verdict the policy can produce has matched. The result is marked `partial`: its matched
+    rules, reason codes, queries and obligations only cover the rules that ran. Such results
+    bypass the memo.
+    """
+    from lumyn.engine.compiler import cached_compile_policy_v1
+
+    compiled = cached_compile_policy_v1(policy, policy_hash=policy_hash)
+    if normalized is None:
+        normalized = normalize_request_v1(request)
+    if verdict_only:
+        return compiled.evaluate(normalized, verdict_only=True)
+    if memo is not None and policy_hash is not None:
+        return memo.evaluate(compiled, normalized, lambda: compiled.evaluate(normalized))
+    return compiled.evaluate(normalized)
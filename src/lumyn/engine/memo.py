@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import replace
+from typing import Any, Protocol, TypeVar
+
+from lumyn.engine.evaluator import EvaluationResult
+from lumyn.engine.normalize import NormalizedRequest
+from lumyn.engine.normalize_v1 import NormalizedRequestV1
+from lumyn.records.emit_v1 import EvaluationResultV1
+
+Result = TypeVar("Result", EvaluationResult, EvaluationResultV1)
+
+
+class _Program(Protocol):
+    @property
+    def policy_hash(self) -> str | None: ...
+
+    @property
+    def reads(self) -> frozenset[str] | None: ...
+
+
+def _fresh(result: Result) -> Result:
+    # Records embed these lists/dicts directly; hand every caller its own containers.
+    return replace(
+        result,
+        reason_codes=list(result.reason_codes),
+        matched_rules=[replace(r, reason_codes=list(r.reason_codes)) for r in result.matched_rules],
+        queries=[dict(q) for q in result.queries],
+        obligations=[
+            {k: dict(v) if isinstance(v, dict) else v for k, v in o.items()}
+            for o in result.obligations
+        ],
+    )
+
+
+class EvaluationMemo:
+    """
+    Bounded LRU/TTL memo of policy evaluations.
+
+    Entries are keyed by `(policy_hash, digest of action_type and the normalized fields the
+    compiled policy reads)`, so retries and near-duplicates (same action, amount and evidence
+    but a new request_id or context) reuse the earlier `EvaluationResult`. A new policy hash
+    never matches older entries; those age out of the LRU. Policies whose reads cannot be
+    determined, and requests whose inputs are not JSON-serializable, bypass the memo.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 4096,
+        ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bypassed = 0
+
+    def evaluate(
+        self,
+        program: _Program,
+        normalized: NormalizedRequest | NormalizedRequestV1,
+        evaluate: Callable[[], Result],
+    ) -> Result:
+        """Return the memoized result for `normalized`, calling `evaluate()` on a miss."""
+        key = self._key(program, normalized)
+        if key is None:
+            with self._lock:
+                self._bypassed += 1
+            return evaluate()
+
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                cached: Result = entry[1]
+                return _fresh(cached)
+            self._misses += 1
+
+        result = evaluate()
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, _fresh(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def _key(
+        self, program: _Program, normalized: NormalizedRequest | NormalizedRequestV1
+    ) -> str | None:
+        if program.policy_hash is None or program.reads is None:
+            return None
+        evidence = normalized.evidence
+        inputs: dict[str, Any] = {"action_type": normalized.action_type}
+        for field in program.reads:
+            if field.startswith("evidence."):
+                name = field.removeprefix("evidence.")
+                if name in evidence:  # missing and null evidence differ for requirements
+                    inputs[field] = evidence[name]
+            else:
+                inputs[field] = getattr(normalized, field)
+        try:
+            payload = json.dumps(inputs, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        except (TypeError, ValueError):
+            return None
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"{program.policy_hash}:{digest}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "bypassed": self._bypassed,
+            }
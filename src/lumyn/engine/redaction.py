@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import copy
 from dataclasses import dataclass
 from typing import Any
 
@@ -17,7 +16,10 @@ def redact_request_for_persistence(
     *,
     profile: str,
 ) -> RedactionResult:
-    request_out = copy.deepcopy(request)
+    # Copy-on-write: only the containers that change (`request`, `context`, `context.inline`,
+    # `context.redaction`) are copied; every other subtree is shared with `request`, which is
+    # left untouched.
+    request_out = dict(request)
     profile = profile.strip()
     if profile not in {"default", "strict", "off"}:
         profile = "default"
@@ -25,6 +27,8 @@ def redact_request_for_persistence(
     context = request_out.get("context")
     if not isinstance(context, dict):
         return RedactionResult(request=request_out, fields_removed=[], profile=profile)
+    context = dict(context)
+    request_out["context"] = context
 
     mode = context.get("mode")
     if mode != "inline":
@@ -65,6 +69,8 @@ def redact_request_for_persistence(
         "transcript",
     }
 
+    inline = dict(inline)
+    context["inline"] = inline
     for key in sorted(list(inline.keys()), key=str):
         if str(key).lower() in sensitive_keys:
             removed.append(f"/context/inline/{key}")
@@ -78,8 +84,7 @@ def _ensure_redaction_meta(
     context: dict[str, Any], *, profile: str, fields_removed: list[str]
 ) -> None:
     redaction = context.get("redaction")
-    if not isinstance(redaction, dict):
-        redaction = {}
-        context["redaction"] = redaction
+    redaction = dict(redaction) if isinstance(redaction, dict) else {}
+    context["redaction"] = redaction
     redaction["profile"] = profile
     redaction["fields_removed"] = list(fields_removed)
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
+import math
+import random
+import struct
+from collections.abc import Collection, Iterable
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 
@@ -30,6 +37,35 @@ def _as_feature_set(feature: dict[str, Any]) -> set[str]:
     return keys
 
 
+def feature_tokens(feature: dict[str, Any]) -> set[str]:
+    """The tokens `weighted_jaccard()` compares `feature` by, e.g. `tags[]=vip`."""
+    return _as_feature_set(feature)
+
+
+def _token_weight(token: str, weights: dict[str, float]) -> float:
+    key = token.split("=", 1)[0].split("[]", 1)[0]
+    return float(weights.get(key, 1.0))
+
+
+def _jaccard(
+    a_set: set[str], b_set: set[str], weights: dict[str, float], token_weights: dict[str, float]
+) -> float:
+    if not a_set and not b_set:
+        return 0.0
+
+    def weight(token: str) -> float:
+        w = token_weights.get(token)
+        if w is None:
+            w = token_weights[token] = _token_weight(token, weights)
+        return w
+
+    union_w = sum(weight(t) for t in a_set | b_set)
+    if union_w <= 0:
+        return 0.0
+    inter_w = sum(weight(t) for t in a_set & b_set)
+    return max(0.0, min(1.0, inter_w / union_w))
+
+
 def weighted_jaccard(
     a: dict[str, Any], b: dict[str, Any], *, weights: dict[str, float] | None = None
 ) -> float:
@@ -41,30 +77,29 @@ def weighted_jaccard(
     "action_type=").
     """
 
-    weights = weights or {}
-    a_set = _as_feature_set(a)
-    b_set = _as_feature_set(b)
+    return _jaccard(_as_feature_set(a), _as_feature_set(b), weights or {}, {})
 
-    if not a_set and not b_set:
-        return 0.0
 
-    def token_weight(token: str) -> float:
-        key = token.split("=", 1)[0].split("[]", 1)[0]
-        return float(weights.get(key, 1.0))
+class _Ranked:
+    """A scored candidate ordered worst-first: lower score, then larger `memory_id`."""
 
-    union = a_set | b_set
-    intersection = a_set & b_set
-    union_w = sum(token_weight(t) for t in union)
-    if union_w <= 0:
-        return 0.0
-    inter_w = sum(token_weight(t) for t in intersection)
-    return max(0.0, min(1.0, inter_w / union_w))
+    __slots__ = ("score", "memory_id", "candidate")
+
+    def __init__(self, score: float, memory_id: str, candidate: dict[str, Any]) -> None:
+        self.score = score
+        self.memory_id = memory_id
+        self.candidate = candidate
+
+    def __lt__(self, other: _Ranked) -> bool:
+        if self.score != other.score:
+            return self.score < other.score
+        return self.memory_id > other.memory_id
 
 
 def top_k_matches(
     *,
     query_feature: dict[str, Any],
-    candidates: list[dict[str, Any]],
+    candidates: Iterable[dict[str, Any]],
     top_k: int = 5,
     weights: dict[str, float] | None = None,
 ) -> list[SimilarityMatch]:
@@ -77,24 +112,132 @@ def top_k_matches(
     - summary: str
 
     Tie-breaking is deterministic: sort by (score desc, memory_id asc).
+
+    `candidates` may be any iterable (e.g. a generator streaming rows from a store): they are
+    consumed once while a heap keeps the best `top_k`, so memory is bounded by `top_k`.
+    Without `weights`, candidates whose token count alone caps their score below the current
+    k-th best (Jaccard <= min(|a|, |b|) / max(|a|, |b|)) are not scored.
     """
 
-    scored: list[SimilarityMatch] = []
+    if top_k <= 0:
+        return []
+    # The query's tokens and every token's weight are computed once for all candidates.
+    query_set = _as_feature_set(query_feature)
+    query_size = len(query_set)
+    prune = not weights
+    weights = weights or {}
+    token_weights: dict[str, float] = {}
+
+    heap: list[_Ranked] = []
     for c in candidates:
         memory_id = c.get("memory_id")
-        label = c.get("label")
         feature = c.get("feature")
         if (
             not isinstance(memory_id, str)
-            or not isinstance(label, str)
+            or not isinstance(c.get("label"), str)
             or not isinstance(feature, dict)
         ):
             continue
-        score = weighted_jaccard(query_feature, feature, weights=weights)
-        summary = c.get("summary") if isinstance(c.get("summary"), str) else None
-        scored.append(
-            SimilarityMatch(memory_id=memory_id, label=label, score=score, summary=summary)
+        feature_set = _as_feature_set(feature)
+        if prune and len(heap) == top_k:
+            size = len(feature_set)
+            # Divided like `_jaccard()` divides unit weights, so equal bounds compare equal.
+            bound = min(size, query_size) / max(size, query_size, 1)
+            if bound < heap[0].score:
+                continue
+        ranked = _Ranked(_jaccard(query_set, feature_set, weights, token_weights), memory_id, c)
+        if len(heap) < top_k:
+            heapq.heappush(heap, ranked)
+        elif heap[0] < ranked:
+            heapq.heapreplace(heap, ranked)
+
+    heap.sort(reverse=True)
+    return [
+        SimilarityMatch(
+            memory_id=r.memory_id,
+            label=r.candidate["label"],
+            score=r.score,
+            summary=r.candidate.get("summary")
+            if isinstance(r.candidate.get("summary"), str)
+            else None,
         )
+        for r in heap
+    ]
+
+
+# --- approximate search (weighted MinHash + banded LSH) ----------------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class LshConfig:
+    """
+    Weighted MinHash signature width and LSH band count for approximate memory search.
+
+    Items become candidates when all `num_perm // bands` signature values of one band agree
+    with the query's: more bands (fewer rows each) raise recall and the candidate count.
+    """
+
+    num_perm: int = 64
+    bands: int = 16
+
+    def __post_init__(self) -> None:
+        if self.num_perm <= 0 or self.bands <= 0 or self.num_perm % self.bands:
+            raise ValueError("num_perm must be a positive multiple of bands")
+
+    @property
+    def key(self) -> str:
+        """Identifies buckets computed with these parameters."""
+        return f"{self.num_perm}x{self.bands}"
 
-    scored.sort(key=lambda m: (-m.score, m.memory_id))
-    return scored[:top_k]
+
+_PRIME = (1 << 61) - 1
+
+
+@lru_cache(maxsize=8)
+def _permutations(num_perm: int) -> tuple[tuple[int, int], ...]:
+    # Fixed seed: signatures must agree across processes and releases.
+    rng = random.Random(0x6C756D796E)
+    return tuple((rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(num_perm))
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash_signature(
+    tokens: Collection[str], *, num_perm: int = 64, weights: dict[str, float] | None = None
+) -> tuple[int, ...]:
+    """
+    Weighted MinHash of a token set (see `feature_tokens()`); `()` for an empty set.
+
+    Each position holds the token winning an exponential race (`-ln(u) / weight`), so two
+    signatures agree at a position with probability `weighted_jaccard()` of their sets.
+    """
+    weights = weights or {}
+    hashed = [(_token_hash(t), _token_weight(t, weights)) for t in sorted(tokens)]
+    hashed = [(h, w) for h, w in hashed if w > 0]
+    if not hashed:
+        return ()
+    signature: list[int] = []
+    for a, b in _permutations(num_perm):
+        best, winner = math.inf, 0
+        for h, w in hashed:
+            u = ((a * h + b) % _PRIME + 1) / (_PRIME + 1)
+            race = -math.log(u) / w
+            if race < best:
+                best, winner = race, h
+        signature.append(winner)
+    return tuple(signature)
+
+
+def lsh_buckets(signature: tuple[int, ...], *, bands: int) -> list[int]:
+    """One bucket ID per band of `signature` (63-bit, so it fits an SQLite INTEGER)."""
+    if not signature:
+        return []
+    rows = len(signature) // bands
+    buckets: list[int] = []
+    for band in range(bands):
+        values = signature[band * rows : (band + 1) * rows]
+        digest = hashlib.blake2b(struct.pack(f">I{rows}Q", band, *values), digest_size=8)
+        buckets.append(int.from_bytes(digest.digest(), "big") >> 1)
+    return buckets
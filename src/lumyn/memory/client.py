@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import threading
 from collections.abc import Sequence
+from datetime import timedelta
 from pathlib import Path
+from typing import Any
 
 import lancedb  # type: ignore
 
@@ -12,13 +15,51 @@ from lumyn.memory.types import Experience, MemoryHit
 
 
 class MemoryStore:
-    def __init__(self, db_path: str | Path = ".lumyn/memory") -> None:
+    """
+    Experience memory in a LanceDB table.
+
+    The connection and the opened table are kept for the store's lifetime, so searches do
+    not reconnect or list tables. Experiences added through the store are visible to it
+    right away. Reads check for writes from other processes (e.g. `lumyn label`) once
+    `refresh_interval_s` has passed since the last check: on every read by default, only
+    on `refresh()` with `None`.
+    """
+
+    def __init__(
+        self, db_path: str | Path = ".lumyn/memory", *, refresh_interval_s: float | None = 0.0
+    ) -> None:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.db = lancedb.connect(self.db_path)
+        self.db = lancedb.connect(
+            self.db_path,
+            read_consistency_interval=(
+                None if refresh_interval_s is None else timedelta(seconds=refresh_interval_s)
+            ),
+        )
 
         # Ensure table exists
         self.table_name = "experiences"
+        self._table: Any = None
+        self._lock = threading.Lock()
+
+    def _open_table(self) -> Any:
+        """The experiences table, or None while nobody has added an experience yet."""
+        if self._table is None:
+            with self._lock:
+                if self._table is None and self.table_name in self.db.table_names():
+                    self._table = self.db.open_table(self.table_name)
+        return self._table
+
+    def refresh(self) -> None:
+        """Move the opened table to its latest version (e.g. after another process wrote)."""
+        tbl = self._open_table()
+        if tbl is not None:
+            tbl.checkout_latest()
+
+    def close(self) -> None:
+        """Drop the opened table handle; the next call opens the table again."""
+        with self._lock:
+            self._table = None
 
     def add_experiences(self, experiences: Sequence[Experience]) -> None:
         if not experiences:
@@ -36,18 +77,26 @@ class MemoryStore:
             for e in experiences
         ]
 
-        if self.table_name in self.db.table_names():
-            tbl = self.db.open_table(self.table_name)
+        tbl = self._open_table()
+        if tbl is not None:
             tbl.add(data)
-        else:
-            self.db.create_table(self.table_name, data=data)
+            return
+        with self._lock:
+            if self._table is None:
+                # Another process may have created it since `_open_table()` looked.
+                if self.table_name in self.db.table_names():
+                    self._table = self.db.open_table(self.table_name)
+                else:
+                    self._table = self.db.create_table(self.table_name, data=data)
+                    return
+            tbl = self._table
+        tbl.add(data)
 
     def search(self, query_vector: list[float], limit: int = 5) -> list[MemoryHit]:
-        if self.table_name not in self.db.table_names():
+        tbl = self._open_table()
+        if tbl is None:
             return []
 
-        tbl = self.db.open_table(self.table_name)
-
         # LanceDB search
         # metric="cosine" is default for vector search usually?
         # fastembed vectors are normalized? BGE usually are.
@@ -55,24 +104,83 @@ class MemoryStore:
 
         results_df = tbl.search(query_vector).limit(limit).to_pandas()
 
-        hits = []
-        for _, row in results_df.iterrows():
-            # Calculate similarity? LanceDB returns distance usually.
-            # _distance column
-            dist = row.get("_distance", 1.0)
-            # If using l2, sim = 1 / (1+dist)?
-            # If using cosine distance, sim = 1 - dist.
-            similarity = 1.0 - dist
-
-            exp = Experience(
-                decision_id=row["decision_id"],
-                vector=row["vector"],  # Might come back as array
-                outcome=int(row["outcome"]),
-                severity=int(row["severity"]),
-                original_verdict=row["original_verdict"],
-                timestamp=row["timestamp"],
-            )
-            similarity = 1.0 - dist
-            hits.append(MemoryHit(experience=exp, score=similarity))
+        return [_row_to_hit(row) for _, row in results_df.iterrows()]
+
+    def search_many(
+        self, query_vectors: Sequence[list[float]], limit: int = 5
+    ) -> list[list[MemoryHit]]:
+        """
+        Search several query vectors in one LanceDB call.
+
+        Returns one hit list per query vector, in input order, equivalent to calling
+        `search()` for each vector.
+        """
+        if not query_vectors:
+            return []
+        tbl = self._open_table()
+        if tbl is None:
+            return [[] for _ in query_vectors]
+
+        if len(query_vectors) == 1:
+            results_df = tbl.search(query_vectors[0]).limit(limit).to_pandas()
+            return [[_row_to_hit(row) for _, row in results_df.iterrows()]]
 
+        # Multi-vector queries return one result set per vector tagged with `query_index`.
+        results_df = tbl.search([list(v) for v in query_vectors]).limit(limit).to_pandas()
+        hits: list[list[MemoryHit]] = [[] for _ in query_vectors]
+        for _, row in results_df.iterrows():
+            hits[int(row["query_index"])].append(_row_to_hit(row))
         return hits
+
+
+# Process-wide memory stores keyed by resolved path and refresh interval, so engines (and the
+# per-call `decide()` wrappers) share one LanceDB connection and table handle per database.
+_STORES: dict[tuple[Path, float | None], MemoryStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_memory_store(
+    db_path: str | Path = ".lumyn/memory", *, refresh_interval_s: float | None = 0.0
+) -> MemoryStore:
+    """
+    Return the shared `MemoryStore` for `db_path`, connecting on first use.
+    """
+    key = (Path(db_path).resolve(), refresh_interval_s)
+    store = _STORES.get(key)
+    if store is None:
+        with _STORES_LOCK:
+            store = _STORES.get(key)
+            if store is None:
+                store = MemoryStore(db_path, refresh_interval_s=refresh_interval_s)
+                _STORES[key] = store
+    return store
+
+
+def close_memory_stores() -> None:
+    """
+    Close and forget every shared memory store (e.g. on service shutdown).
+    """
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+        _STORES.clear()
+    for store in stores:
+        store.close()
+
+
+def _row_to_hit(row: Any) -> MemoryHit:
+    # Calculate similarity? LanceDB returns distance usually.
+    # _distance column
+    dist = row.get("_distance", 1.0)
+    # If using l2, sim = 1 / (1+dist)?
+    # If using cosine distance, sim = 1 - dist.
+    similarity = 1.0 - dist
+
+    exp = Experience(
+        decision_id=row["decision_id"],
+        vector=row["vector"],  # Might come back as array
+        outcome=int(row["outcome"]),
+        severity=int(row["severity"]),
+        original_verdict=row["original_verdict"],
+        timestamp=row["timestamp"],
+    )
+    return MemoryHit(experience=exp, score=similarity)
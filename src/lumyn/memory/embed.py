@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from collections.abc import Sequence
 
 from fastembed import TextEmbedding
@@ -9,6 +10,32 @@ from lumyn.engine.normalize_v1 import NormalizedRequestV1
 # Model choice: BAAI/bge-small-en-v1.5 is small (133MB), fast, and good for retrieval
 DEFAULT_MODEL_NAME = "BAAI/bge-small-en-v1.5"
 
+# Process-wide embedding models keyed by model name. Loading a model reads the ONNX weights
+# and creates an inference session, so it must happen once per process, not per request.
+_MODELS: dict[str, TextEmbedding] = {}
+_MODELS_LOCK = threading.Lock()
+
+
+def get_embedding_model(model_name: str = DEFAULT_MODEL_NAME) -> TextEmbedding:
+    """
+    Return the shared embedding model for `model_name`, loading it on first use.
+    """
+    model = _MODELS.get(model_name)
+    if model is None:
+        with _MODELS_LOCK:
+            model = _MODELS.get(model_name)
+            if model is None:
+                model = TextEmbedding(model_name=model_name)
+                _MODELS[model_name] = model
+    return model
+
+
+def warmup_embedding_model(model_name: str = DEFAULT_MODEL_NAME) -> None:
+    """
+    Load `model_name` eagerly (e.g. at service start) so the first decision does not pay for it.
+    """
+    get_embedding_model(model_name)
+
 
 class ProjectionLayer:
     """
@@ -18,7 +45,7 @@ class ProjectionLayer:
 
     def __init__(self, model_name: str = DEFAULT_MODEL_NAME) -> None:
         self.model_name = model_name
-        self.model = TextEmbedding(model_name=model_name)
+        self.model = get_embedding_model(model_name)
 
     def embed_request(self, normalized: NormalizedRequestV1) -> list[float]:
         """
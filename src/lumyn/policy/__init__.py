@@ -1,3 +1,3 @@
-from lumyn.policy.loader import LoadedPolicy, load_policy
+from lumyn.policy.loader import LoadedPolicy, PolicyCache, load_policy
 
-__all__ = ["LoadedPolicy", "load_policy"]
+__all__ = ["LoadedPolicy", "PolicyCache", "load_policy"]
@@ -2,7 +2,11 @@ from __future__ import annotations
 
 import hashlib
 import json
+import logging
+import os
+import threading
 from collections.abc import Mapping
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -12,6 +16,8 @@ from lumyn.assets import read_builtin_text
 from lumyn.policy.spec import LoadedPolicy
 from lumyn.policy.validate import validate_policy_or_raise
 
+logger = logging.getLogger(__name__)
+
 
 def _canonical_json_bytes(obj: Any) -> bytes:
     return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode(
@@ -37,7 +43,21 @@ def load_policy(
     policy_schema_path: str | Path = "schemas/policy.v0.schema.json",
     reason_codes_path: str | Path = "schemas/reason_codes.v0.json",
 ) -> LoadedPolicy:
-    policy_text = read_policy_text(path)
+    return _load_policy_text(
+        read_policy_text(path),
+        path=path,
+        policy_schema_path=policy_schema_path,
+        reason_codes_path=reason_codes_path,
+    )
+
+
+def _load_policy_text(
+    policy_text: str,
+    *,
+    path: str | Path,
+    policy_schema_path: str | Path,
+    reason_codes_path: str | Path,
+) -> LoadedPolicy:
     policy = yaml.safe_load(policy_text)
     if not isinstance(policy, Mapping):
         raise ValueError(f"policy file did not parse to an object: {path}")
@@ -65,3 +85,104 @@ def load_policy(
         )
 
     return LoadedPolicy(policy=policy, policy_hash=compute_policy_hash(policy))
+
+
+@dataclass(frozen=True, slots=True)
+class _PolicyCacheEntry:
+    loaded: LoadedPolicy
+    policy_text: str
+    text_digest: str
+    stat_key: tuple[int, int] | None
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class PolicyCache:
+    """
+    Compile-once policy cache with hot reload.
+
+    `get()` returns the cached `LoadedPolicy` and only re-reads the file when its mtime or
+    size changed; it only re-parses/re-validates when the content hash changed too. A new
+    policy replaces the cached entry in a single swap and its `policy_hash` is logged.
+    If a changed file fails to load, the previous policy keeps serving and the error is
+    logged. A path that does not exist on disk serves the built-in policy of that name
+    until a file appears there.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        policy_schema_path: str | Path = "schemas/policy.v0.schema.json",
+        reason_codes_path: str | Path = "schemas/reason_codes.v0.json",
+    ) -> None:
+        self.path = Path(path)
+        self._policy_schema_path = policy_schema_path
+        self._reason_codes_path = reason_codes_path
+        self._entry: _PolicyCacheEntry | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> LoadedPolicy:
+        return self._current().loaded
+
+    def policy_text_for(self, policy_hash: str) -> str | None:
+        """Source text of the cached policy if it is the one with `policy_hash`."""
+        entry = self._entry
+        if entry is None or entry.loaded.policy_hash != policy_hash:
+            return None
+        return entry.policy_text
+
+    def _current(self) -> _PolicyCacheEntry:
+        entry = self._entry
+        # A missing file (`stat_key` None, built-in fallback) is re-checked like any other,
+        # so a policy file created later is picked up.
+        if entry is not None and entry.stat_key == _stat_key(self.path):
+            return entry
+        with self._lock:
+            return self._reload()
+
+    def _reload(self) -> _PolicyCacheEntry:
+        current = self._entry
+        stat_key = _stat_key(self.path)
+        if current is not None and current.stat_key == stat_key:
+            return current  # another thread reloaded while we waited for the lock
+        try:
+            policy_text = read_policy_text(self.path)
+            text_digest = hashlib.sha256(policy_text.encode("utf-8")).hexdigest()
+            if current is not None and current.text_digest == text_digest:
+                loaded = current.loaded  # touched but unchanged content
+            else:
+                loaded = _load_policy_text(
+                    policy_text,
+                    path=self.path,
+                    policy_schema_path=self._policy_schema_path,
+                    reason_codes_path=self._reason_codes_path,
+                )
+        except Exception as e:
+            if current is None:
+                raise
+            logger.warning(
+                "policy reload failed, keeping policy_hash=%s: %s", current.loaded.policy_hash, e
+            )
+            # Remember the bad file state so the next call does not retry until it changes.
+            self._entry = _PolicyCacheEntry(
+                loaded=current.loaded,
+                policy_text=current.policy_text,
+                text_digest=current.text_digest,
+                stat_key=stat_key,
+            )
+            return self._entry
+
+        entry = _PolicyCacheEntry(
+            loaded=loaded, policy_text=policy_text, text_digest=text_digest, stat_key=stat_key
+        )
+        self._entry = entry
+        if current is None or current.loaded.policy_hash != loaded.policy_hash:
+            logger.info("policy loaded path=%s policy_hash=%s", self.path, loaded.policy_hash)
+        return entry
@@ -1,13 +1,29 @@
 from __future__ import annotations
 
+import math
+import operator
 import re
-from collections.abc import Iterable, Mapping
+from collections.abc import Callable, Iterable, Mapping
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from jsonschema import Draft202012Validator
 
+from lumyn.engine.conditions import (
+    NUMERIC_CONDITIONS,
+    STAGES_V1,
+    VERDICT_PRECEDENCE_V1,
+    LazyCondition,
+    compile_condition,
+    compile_condition_v1,
+    compile_then,
+    never,
+    then_v1,
+    when_action_types,
+    when_action_types_v1,
+)
+from lumyn.engine.evaluator import STAGES, VERDICT_PRECEDENCE
 from lumyn.policy.errors import PolicyError
 from lumyn.schemas.loaders import load_json_schema
 
@@ -285,3 +301,440 @@ def validate_policy_or_raise(
     if result.ok:
         return
     raise PolicyError("invalid policy:\n- " + "\n- ".join(result.errors))
+
+
+# --- reachability analysis --------------------------------------------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class RuleFinding:
+    rule_id: str
+    # Position of the rule in the policy's `rules` list.
+    index: int
+    kind: str
+    detail: str
+    # True when the rule can never match, so compiled programs leave it out.
+    pruned: bool
+
+
+@dataclass(frozen=True, slots=True)
+class PolicyAnalysis:
+    findings: list[RuleFinding]
+
+    @property
+    def pruned_rule_ids(self) -> list[str]:
+        return [f.rule_id for f in self.findings if f.pruned]
+
+
+@dataclass(frozen=True, slots=True)
+class _Clause:
+    """One condition as `field <op> value`; op `never` is a condition that cannot hold."""
+
+    field: str
+    op: str
+    value: Any = None
+
+
+_NEVER = _Clause(field="", op="never")
+_ORDERINGS: dict[str, Callable[[Any, Any], bool]] = {
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class _Guard:
+    # Conditions that must all hold (`if` and `if_all`).
+    clauses: tuple[_Clause, ...]
+    # `if_any` alternatives (one must hold); `None` without an `if_any`.
+    alternatives: tuple[tuple[_Clause, ...], ...] | None
+
+
+@dataclass(frozen=True, slots=True)
+class _Rule:
+    index: int
+    rule_id: str
+    stage: str
+    action_types: frozenset[str] | None
+    requires_missing_evidence: bool
+    # `None` when the guard can raise, and is left alone by the analysis.
+    guard: _Guard | None
+    # Verdict precedence of the rule's `then` block (-1 when it never yields a verdict).
+    precedence: int
+    # `None` when the `then` block yields no verdict (or fails once the rule matches).
+    effect: str | None
+
+
+_V0_EQUALITY_FIELDS = {
+    "amount_currency_is": "amount_currency",
+    "evidence.fx_rate_to_usd_present": "fx_rate_to_usd_present",
+    "evidence.payment_instrument_risk_is": "evidence.payment_instrument_risk",
+    "evidence.manual_approval_is": "evidence.manual_approval",
+}
+
+
+def _clause_v0(key: str, expected: Any) -> _Clause | None:
+    test = compile_condition(key, expected)
+    if isinstance(test, LazyCondition):
+        return None
+    if test is never:
+        return _NEVER
+    numeric = NUMERIC_CONDITIONS.get(key)
+    if numeric is not None:
+        field, op, cast, _ = numeric
+        name = next(name for name, fn in _ORDERINGS.items() if fn is op)
+        try:
+            value = cast(expected)
+        except (TypeError, ValueError, OverflowError):
+            return None
+        return _Clause(field=field, op=name, value=value)
+    if key == "amount_currency_ne":
+        return _Clause(field="amount_currency", op="ne", value=expected)
+    if key == "evidence.payment_instrument_risk_in":
+        allowed = [v for v in expected if isinstance(v, str)]
+        return _Clause(field="evidence.payment_instrument_risk", op="in", value=allowed)
+    return _Clause(field=_V0_EQUALITY_FIELDS[key], op="is", value=expected)
+
+
+def _clauses_v0(expr: Any) -> tuple[_Clause, ...] | None:
+    # Non-object expressions match, like an empty one.
+    if not isinstance(expr, dict):
+        return ()
+    clauses: list[_Clause] = []
+    for key, expected in expr.items():
+        clause = _clause_v0(key, expected)
+        if clause is None:
+            return None
+        clauses.append(clause)
+    return tuple(clauses)
+
+
+def _clauses_v1(expr: Any) -> tuple[_Clause, ...] | None:
+    if not expr:
+        return ()
+    if not isinstance(expr, dict):
+        return None
+    clauses: list[_Clause] = []
+    for key, expected in expr.items():
+        condition = compile_condition_v1(key, expected)
+        if condition is None or condition.test is never:
+            clauses.append(_NEVER)
+            break  # later conditions are never evaluated
+        if not condition.total:
+            return None
+        clauses.append(_Clause(field=condition.field, op=condition.op, value=condition.expected))
+    return tuple(clauses)
+
+
+def _guard_v0(rule: Mapping[str, Any]) -> _Guard | None:
+    exprs = [rule.get("if")] if rule.get("if") is not None else []
+    if_all = rule.get("if_all")
+    if_any = rule.get("if_any")
+    # A non-list block never matches, but only once the conditions before it have run.
+    malformed = if_all is not None and not isinstance(if_all, list)
+    if not malformed:
+        exprs.extend(if_all or [])
+        malformed = if_any is not None and not isinstance(if_any, list)
+    clauses: list[_Clause] = []
+    for expr in exprs:
+        parsed = _clauses_v0(expr)
+        if parsed is None:
+            return None
+        clauses.extend(parsed)
+    if malformed:
+        return _Guard(clauses=(*clauses, _NEVER), alternatives=None)
+    if if_any is None:
+        return _Guard(clauses=tuple(clauses), alternatives=None)
+    alternatives: list[tuple[_Clause, ...]] = []
+    for expr in if_any:
+        parsed = _clauses_v0(expr)
+        if parsed is None:
+            return None
+        alternatives.append(parsed)
+    return _Guard(clauses=tuple(clauses), alternatives=tuple(alternatives))
+
+
+def _guard_v1(rule: Mapping[str, Any]) -> _Guard | None:
+    if_all = rule.get("if_all")
+    if_any = rule.get("if_any")
+    if (if_all and not isinstance(if_all, list)) or (if_any and not isinstance(if_any, list)):
+        return None
+    clauses: list[_Clause] = []
+    for expr in [rule.get("if"), *(if_all or [])]:
+        parsed = _clauses_v1(expr)
+        if parsed is None:
+            return None
+        clauses.extend(parsed)
+    if not if_any:
+        return _Guard(clauses=tuple(clauses), alternatives=None)
+    alternatives: list[tuple[_Clause, ...]] = []
+    for expr in if_any:
+        parsed = _clauses_v1(expr)
+        if parsed is None:
+            return None
+        alternatives.append(parsed)
+    return _Guard(clauses=tuple(clauses), alternatives=tuple(alternatives))
+
+
+def _rules_v0(policy: Mapping[str, Any]) -> list[_Rule]:
+    rules = policy.get("rules", [])
+    out: list[_Rule] = []
+    for stage in STAGES:
+        for index, rule in enumerate(rules if isinstance(rules, list) else []):
+            if not isinstance(rule, dict) or rule.get("stage") != stage:
+                continue
+            rule_id = str(rule.get("id"))
+            effect = compile_then(rule_id, stage, rule.get("then", {}))[0]
+            out.append(
+                _Rule(
+                    index=index,
+                    rule_id=rule_id,
+                    stage=stage,
+                    action_types=when_action_types(rule.get("when")),
+                    requires_missing_evidence=stage == "REQUIREMENTS"
+                    and not any(rule.get(k) is not None for k in ("if", "if_all", "if_any")),
+                    guard=_guard_v0(rule),
+                    precedence=-1 if effect is None else VERDICT_PRECEDENCE[effect],
+                    effect=effect,
+                )
+            )
+    return out
+
+
+def _rules_v1(policy: Mapping[str, Any]) -> list[_Rule]:
+    rules = policy.get("rules", [])
+    out: list[_Rule] = []
+    for stage in STAGES_V1:
+        for index, rule in enumerate(rules if isinstance(rules, list) else []):
+            if not isinstance(rule, dict) or rule.get("stage") != stage:
+                continue
+            try:
+                effect = then_v1(rule.get("then", {}))[0]
+            except Exception:
+                # Fails only once the rule matches; treat it as able to produce anything.
+                effect, precedence = None, max(VERDICT_PRECEDENCE_V1.values())
+            else:
+                precedence = -1 if effect is None else VERDICT_PRECEDENCE_V1[effect]
+            out.append(
+                _Rule(
+                    index=index,
+                    rule_id=str(rule.get("id")),
+                    stage=stage,
+                    action_types=when_action_types_v1(rule.get("when", {})),
+                    requires_missing_evidence=False,
+                    guard=_guard_v1(rule),
+                    precedence=precedence,
+                    effect=effect,
+                )
+            )
+    return out
+
+
+def _bounds(clauses: Iterable[_Clause]) -> tuple[float, bool, float, bool]:
+    """The `(low, low_strict, high, high_strict)` interval allowed by ordering clauses."""
+    low, low_strict, high, high_strict = -math.inf, False, math.inf, False
+    for c in clauses:
+        if c.op in ("gt", "gte") and (c.value > low or (c.value == low and c.op == "gt")):
+            low, low_strict = c.value, c.op == "gt"
+        elif c.op in ("lt", "lte") and (c.value < high or (c.value == high and c.op == "lt")):
+            high, high_strict = c.value, c.op == "lt"
+    return low, low_strict, high, high_strict
+
+
+def _field_satisfiable(clauses: list[_Clause]) -> bool:
+    ordering = [c for c in clauses if c.op in _ORDERINGS]
+    if any(c.value != c.value for c in ordering):  # NaN thresholds never hold
+        return False
+    low, low_strict, high, high_strict = _bounds(ordering)
+    if low > high or (low == high and (low_strict or high_strict)):
+        return False
+
+    equal = [c.value for c in clauses if c.op == "is"]
+    members = [c.value for c in clauses if c.op == "in"]
+    if not equal and not members:
+        return True
+    # The field can only take one of these values.
+    candidates = equal[:1] if equal else members[0]
+
+    def possible(value: Any) -> bool:
+        if ordering and not (
+            isinstance(value, int | float)
+            and all(_ORDERINGS[c.op](value, c.value) for c in ordering)
+        ):
+            return False
+        return (
+            all(value == e for e in equal)
+            and all(value in m for m in members)
+            and all(value != c.value for c in clauses if c.op == "ne")
+        )
+
+    return any(possible(value) for value in candidates)
+
+
+def _contradiction(clauses: Iterable[_Clause]) -> str | None:
+    """Why `clauses` cannot all hold at once; `None` when they might."""
+    by_field: dict[str, list[_Clause]] = {}
+    for clause in clauses:
+        if clause.op == "never":
+            return "has a condition that never holds"
+        by_field.setdefault(clause.field, []).append(clause)
+    for field, group in by_field.items():
+        if not _field_satisfiable(group):
+            return f"conditions on {field} cannot all hold"
+    return None
+
+
+def _declares_evidence(keys: Any) -> bool:
+    return isinstance(keys, list) and any(isinstance(k, str) for k in keys)
+
+
+def _unreachable(rule: _Rule, required_evidence: Mapping[str, Any]) -> tuple[str, str] | None:
+    """`(kind, detail)` when `rule` can never match; its guard must not be able to raise."""
+    if rule.guard is None:
+        return None
+    if rule.action_types is not None and not rule.action_types:
+        return "unreachable_when", "when block matches no action type"
+    if rule.precedence < 0:
+        return "unusable_then", "then block never yields a verdict"
+    if rule.requires_missing_evidence:
+        action_types = required_evidence.keys() if rule.action_types is None else rule.action_types
+        if not any(_declares_evidence(required_evidence.get(a)) for a in action_types):
+            return "no_required_evidence", "no required evidence declared for its action types"
+    reason = _contradiction(rule.guard.clauses)
+    if reason is not None:
+        return "contradiction", reason
+    alternatives = rule.guard.alternatives
+    if alternatives is not None and all(
+        _contradiction(rule.guard.clauses + alt) is not None for alt in alternatives
+    ):
+        return "contradiction", "no if_any alternative can hold"
+    return None
+
+
+def _implied(clauses: tuple[_Clause, ...], clause: _Clause) -> bool:
+    """Whether `clause` holds whenever all of `clauses` do."""
+    if clause in clauses:
+        return True
+    if clause.op not in _ORDERINGS:
+        return False
+    ordering = [c for c in clauses if c.field == clause.field and c.op in _ORDERINGS]
+    if not ordering:
+        return False
+    low, low_strict, high, high_strict = _bounds(ordering)
+    t: float = clause.value
+    if clause.op == "gt":
+        return low > t or (low == t and low_strict)
+    if clause.op == "gte":
+        return low >= t
+    if clause.op == "lt":
+        return high < t or (high == t and high_strict)
+    return high <= t
+
+
+def _shadows(earlier: _Rule, rule: _Rule) -> bool:
+    """Whether `earlier` always matches, with at least `rule`'s precedence, when `rule` does."""
+    if earlier.guard is None or rule.guard is None or earlier.effect is None:
+        return False
+    if earlier.precedence < rule.precedence:
+        return False
+    if earlier.guard.alternatives is not None:
+        return False
+    if earlier.action_types is not None and (
+        rule.action_types is None or not rule.action_types <= earlier.action_types
+    ):
+        return False
+    if earlier.requires_missing_evidence and not rule.requires_missing_evidence:
+        return False
+    return all(_implied(rule.guard.clauses, c) for c in earlier.guard.clauses)
+
+
+def _action_type_allowed(request_schema: Mapping[str, Any]) -> Callable[[str], bool]:
+    spec = request_schema.get("properties", {}).get("action", {}).get("properties", {})
+    spec = spec.get("type", {})
+    if "enum" in spec:
+        allowed = set(spec["enum"])
+        return lambda action_type: action_type in allowed
+    if "pattern" in spec:
+        pattern = re.compile(spec["pattern"])
+        return lambda action_type: pattern.search(action_type) is not None
+    return lambda action_type: True
+
+
+def find_unreachable_rules(
+    policy: Mapping[str, Any], *, schema_version: str | None = None
+) -> list[RuleFinding]:
+    """
+    Rules of `policy` that can never match any request, whatever its contents.
+
+    Only rules whose conditions cannot raise are considered, so leaving these rules out of
+    a compiled program never changes an evaluation's result (or error). `schema_version`
+    defaults to the policy's own.
+    """
+    return _analyze(policy, schema_version=schema_version, request_schema=None, shadowing=False)
+
+
+def analyze_policy(
+    policy: Mapping[str, Any], *, request_schema: Mapping[str, Any] | None = None
+) -> PolicyAnalysis:
+    """
+    Report rules that never fire (see `find_unreachable_rules()`) and rules that cannot
+    change a verdict.
+
+    Besides the pruned rules, this reports rules shadowed by an earlier rule that always
+    matches when they do with at least their verdict precedence (they still add reason codes
+    and obligations, so they are kept) and, given the `request_schema`, rules whose
+    `when` only names action types that requests cannot have.
+    """
+    return PolicyAnalysis(
+        findings=_analyze(policy, schema_version=None, request_schema=request_schema)
+    )
+
+
+def _analyze(
+    policy: Mapping[str, Any],
+    *,
+    schema_version: str | None,
+    request_schema: Mapping[str, Any] | None,
+    shadowing: bool = True,
+) -> list[RuleFinding]:
+    if schema_version is None:
+        schema_version = str(policy.get("schema_version", "policy.v0"))
+    if schema_version.startswith("policy.v1"):
+        rules, stages, required_evidence = _rules_v1(policy), STAGES_V1, {}
+    else:
+        rules, stages = _rules_v0(policy), STAGES
+        raw = policy.get("required_evidence")
+        required_evidence = raw if isinstance(raw, dict) else {}
+
+    findings: list[RuleFinding] = []
+    raw_rules = policy.get("rules", [])
+    for index, rule in enumerate(raw_rules if isinstance(raw_rules, list) else []):
+        if isinstance(rule, dict) and rule.get("stage") not in stages:
+            detail = f"stage {rule.get('stage')!r} is never evaluated"
+            findings.append(RuleFinding(str(rule.get("id")), index, "unknown_stage", detail, True))
+
+    allowed = None if request_schema is None else _action_type_allowed(request_schema)
+    live: list[_Rule] = []
+    for rule in rules:
+        unreachable = _unreachable(rule, required_evidence)
+        if unreachable is not None:
+            kind, detail = unreachable
+            findings.append(RuleFinding(rule.rule_id, rule.index, kind, detail, True))
+            continue
+        if allowed is not None and rule.action_types:
+            if not any(allowed(a) for a in rule.action_types):
+                detail = "when names no action type a valid request can have"
+                findings.append(
+                    RuleFinding(rule.rule_id, rule.index, "unknown_action_type", detail, False)
+                )
+        if shadowing:
+            earlier = next((e for e in live if _shadows(e, rule)), None)
+            if earlier is not None:
+                detail = f"shadowed by {earlier.rule_id} ({earlier.effect})"
+                findings.append(RuleFinding(rule.rule_id, rule.index, "shadowed", detail, False))
+        live.append(rule)
+
+    findings.sort(key=lambda f: f.index)
+    return findings
@@ -109,4 +109,7 @@ def build_decision_record(
         },
         "extensions": {},
     }
+    if evaluation.partial:
+        # Verdict-only evaluation: matched rules and reason codes do not explain every rule.
+        record["extensions"]["evaluation"] = {"mode": "verdict_only", "partial_explanation": True}
     return record
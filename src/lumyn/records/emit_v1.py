@@ -26,6 +26,8 @@ class EvaluationResultV1:
     matched_rules: list[MatchedRuleV1]
     queries: list[dict[str, str]]
     obligations: list[dict[str, Any]]
+    # True for verdict-only evaluations: only the rules needed to settle the verdict ran.
+    partial: bool = False
 
 
 @dataclass(frozen=True, slots=True)
@@ -121,4 +123,7 @@ def build_decision_record_v1(
         record["interaction_ref"] = interaction_ref
     if memory_snapshot is not None:
         record["determinism"]["memory"] = memory_snapshot
+    if evaluation.partial:
+        # Verdict-only evaluation: matched rules and reason codes do not explain every rule.
+        record["extensions"]["evaluation"] = {"mode": "verdict_only", "partial_explanation": True}
     return record
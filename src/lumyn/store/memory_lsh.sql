@@ -0,0 +1,12 @@
+-- Banded LSH buckets of memory item MinHash signatures, per LshConfig.key.
+CREATE TABLE IF NOT EXISTS memory_lsh_buckets (
+  config TEXT NOT NULL,
+  tenant_id TEXT,
+  action_type TEXT NOT NULL,
+  bucket INTEGER NOT NULL,
+  memory_id TEXT NOT NULL,
+  FOREIGN KEY (memory_id) REFERENCES memory_items(memory_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_memory_lsh_buckets_lookup ON memory_lsh_buckets (config, action_type, tenant_id, bucket, memory_id);
+CREATE INDEX IF NOT EXISTS idx_memory_lsh_buckets_memory_id ON memory_lsh_buckets (memory_id);
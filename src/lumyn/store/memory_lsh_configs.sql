@@ -0,0 +1,7 @@
+-- LshConfigs in use by approximate memory search. Every writer buckets new memory items
+-- under each of them, whatever its own configuration.
+CREATE TABLE IF NOT EXISTS memory_lsh_configs (
+  config TEXT PRIMARY KEY,
+  num_perm INTEGER NOT NULL,
+  bands INTEGER NOT NULL
+);
@@ -0,0 +1,7 @@
+-- Every item of an action_type scope shares its `action_type=<scope>` feature token, so its
+-- postings would list the whole scope. Keep it as a per-item flag instead.
+ALTER TABLE memory_items ADD COLUMN has_scope_token INTEGER NOT NULL DEFAULT 0;
+
+DELETE FROM memory_tokens WHERE token = 'action_type=' || action_type;
+
+CREATE INDEX IF NOT EXISTS idx_memory_items_scope_token ON memory_items (action_type, tenant_id, has_scope_token, token_count, memory_id);
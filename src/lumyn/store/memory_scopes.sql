@@ -0,0 +1,29 @@
+-- Interned feature tokens and per-(tenant, action_type) memory versions for in-process caches.
+CREATE TABLE IF NOT EXISTS memory_token_vocab (
+  token_id INTEGER PRIMARY KEY,
+  token TEXT NOT NULL UNIQUE
+);
+
+-- Sorted token IDs of the item's feature, packed as native 32-bit integers.
+ALTER TABLE memory_items ADD COLUMN token_ids BLOB;
+
+CREATE TABLE IF NOT EXISTS memory_scopes (
+  tenant_key TEXT NOT NULL,
+  action_type TEXT NOT NULL,
+  version INTEGER NOT NULL,
+  items INTEGER NOT NULL,
+  PRIMARY KEY (tenant_key, action_type)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_memory_items_scope_insert AFTER INSERT ON memory_items
+BEGIN
+  INSERT INTO memory_scopes (tenant_key, action_type, version, items)
+  VALUES (COALESCE(NEW.tenant_id, '__global__'), NEW.action_type, 1, 1)
+  ON CONFLICT (tenant_key, action_type) DO UPDATE SET version = version + 1, items = items + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_memory_items_scope_delete AFTER DELETE ON memory_items
+BEGIN
+  UPDATE memory_scopes SET version = version + 1, items = items - 1
+  WHERE tenant_key = COALESCE(OLD.tenant_id, '__global__') AND action_type = OLD.action_type;
+END;
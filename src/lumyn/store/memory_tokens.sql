@@ -0,0 +1,13 @@
+-- Inverted index over memory item features: one row per (memory item, feature token).
+ALTER TABLE memory_items ADD COLUMN token_count INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS memory_tokens (
+  memory_id TEXT NOT NULL,
+  tenant_id TEXT,
+  action_type TEXT NOT NULL,
+  token TEXT NOT NULL,
+  FOREIGN KEY (memory_id) REFERENCES memory_items(memory_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_memory_tokens_lookup ON memory_tokens (action_type, tenant_id, token, memory_id);
+CREATE INDEX IF NOT EXISTS idx_memory_tokens_memory_id ON memory_tokens (memory_id);
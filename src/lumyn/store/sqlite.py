@@ -1,13 +1,29 @@
 from __future__ import annotations
 
+import heapq
+import itertools
 import json
 import sqlite3
+import threading
+import weakref
+from array import array
+from collections import Counter
+from collections.abc import Callable, Collection, Iterator, Mapping, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, cast
 
 import ulid
 
+from lumyn.engine.similarity import (
+    LshConfig,
+    SimilarityMatch,
+    feature_tokens,
+    lsh_buckets,
+    minhash_signature,
+    top_k_matches,
+)
+
 
 def _utc_now_iso() -> str:
     from datetime import UTC, datetime
@@ -19,11 +35,369 @@ def _json_dumps(obj: Any) -> str:
     return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
 
-def _load_schema_sql() -> str:
-    schema_path = Path(__file__).with_name("schema.sql")
+def _load_schema_sql(name: str = "schema.sql") -> str:
+    schema_path = Path(__file__).with_name(name)
     return schema_path.read_text(encoding="utf-8")
 
 
+# Forward-only schema migrations as (version, script file). Released entries are never edited;
+# schema changes append a new entry. Version 1 is the original `schema.sql`, whose
+# `IF NOT EXISTS` statements also adopt databases created before migrations were tracked.
+_MIGRATIONS: tuple[tuple[int, str], ...] = (
+    (1, "schema.sql"),
+    (2, "memory_tokens.sql"),
+    (3, "memory_scopes.sql"),
+    (4, "memory_lsh.sql"),
+    (5, "memory_scope_token.sql"),
+    (6, "memory_lsh_configs.sql"),
+)
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+_CREATE_SCHEMA_MIGRATIONS_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+  version INTEGER PRIMARY KEY,
+  applied_at TEXT NOT NULL
+)
+"""
+
+
+def _split_sql_statements(script: str) -> list[str]:
+    statements: list[str] = []
+    buf = ""
+    for line in script.splitlines(keepends=True):
+        buf += line
+        if sqlite3.complete_statement(buf):
+            statement = buf.strip()
+            # Connection-level PRAGMAs are applied in `SqliteStore._open()`; they are no-ops
+            # inside the migration transaction.
+            if not statement.upper().startswith("PRAGMA"):
+                statements.append(statement)
+            buf = ""
+    if buf.strip():
+        statements.append(buf.strip())
+    return statements
+
+
+_INSERT_MEMORY_TOKEN_SQL = """
+INSERT INTO memory_tokens (memory_id, tenant_id, action_type, token) VALUES (?, ?, ?, ?)
+"""
+
+# Scores every memory item in one (tenant, action_type) scope that shares an indexed token
+# with the query, with unit-weight Jaccard |Q & M| / (|Q| + |M| - |Q & M|), and keeps the top
+# k. The scope token (see `_scope_token()`) is not indexed: `:scope_shared` adds it back.
+_TOP_K_MEMORY_SQL = """
+SELECT m.memory_id, m.label, m.summary, m.token_count,
+  t.shared + m.has_scope_token * :scope_shared AS total_shared
+FROM (
+  SELECT memory_id, COUNT(*) AS shared FROM memory_tokens
+  WHERE action_type = :action_type AND tenant_id IS :tenant_id
+    AND token IN (SELECT value FROM json_each(:tokens))
+  GROUP BY memory_id
+) AS t
+JOIN memory_items AS m ON m.memory_id = t.memory_id
+ORDER BY CAST(total_shared AS REAL) / (:n + m.token_count - total_shared) DESC, m.memory_id ASC
+LIMIT :top_k
+"""
+
+# Items sharing only the scope token with the query score 1 / (|Q| + |M| - 1): the best are
+# the smallest, read in order from `idx_memory_items_scope_token`.
+_TOP_K_SCOPE_TOKEN_ONLY_SQL = """
+SELECT memory_id, label, summary, token_count, 1 AS total_shared FROM memory_items
+WHERE action_type = :action_type AND tenant_id IS :tenant_id AND has_scope_token = 1
+  AND memory_id NOT IN (
+    SELECT memory_id FROM memory_tokens
+    WHERE action_type = :action_type AND tenant_id IS :tenant_id
+      AND token IN (SELECT value FROM json_each(:tokens))
+  )
+ORDER BY token_count ASC, memory_id ASC
+LIMIT :top_k
+"""
+
+
+def _scope_token(action_type: str) -> str:
+    """The `feature_tokens()` token every item of an `action_type` scope may share."""
+    return f"action_type={action_type}"
+
+
+def _memory_token_rows(
+    memory_id: str, tenant_id: str | None, action_type: str, tokens: Collection[str]
+) -> list[tuple[str, str | None, str, str]]:
+    scope_token = _scope_token(action_type)
+    return [
+        (memory_id, tenant_id, action_type, token)
+        for token in sorted(tokens)
+        if token != scope_token
+    ]
+
+
+def _backfill_memory_tokens(conn: sqlite3.Connection) -> None:
+    rows = conn.execute(
+        "SELECT memory_id, tenant_id, action_type, feature_json FROM memory_items"
+    ).fetchall()
+    for memory_id, tenant_id, action_type, feature_json in rows:
+        tokens = feature_tokens(json.loads(feature_json))
+        conn.executemany(
+            _INSERT_MEMORY_TOKEN_SQL,
+            _memory_token_rows(memory_id, tenant_id, action_type, tokens),
+        )
+        conn.execute(
+            "UPDATE memory_items SET token_count = ? WHERE memory_id = ?",
+            (len(tokens), memory_id),
+        )
+
+
+def _tenant_key(tenant_id: str | None) -> str:
+    return tenant_id if tenant_id is not None else "__global__"
+
+
+def _intern_tokens(conn: sqlite3.Connection, tokens: Collection[str]) -> dict[str, int]:
+    """The `memory_token_vocab` IDs of `tokens`, adding the ones not interned yet."""
+    conn.executemany(
+        "INSERT OR IGNORE INTO memory_token_vocab (token) VALUES (?)", [(t,) for t in tokens]
+    )
+    rows = conn.execute(
+        "SELECT token, token_id FROM memory_token_vocab "
+        "WHERE token IN (SELECT value FROM json_each(?))",
+        (_json_dumps(sorted(tokens)),),
+    ).fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
+def _pack_token_ids(token_ids: Collection[int]) -> bytes:
+    return array("i", sorted(token_ids)).tobytes()
+
+
+def _backfill_memory_token_ids(conn: sqlite3.Connection) -> None:
+    rows = conn.execute("SELECT memory_id, feature_json FROM memory_items").fetchall()
+    for memory_id, feature_json in rows:
+        token_ids = _intern_tokens(conn, feature_tokens(json.loads(feature_json)))
+        conn.execute(
+            "UPDATE memory_items SET token_ids = ? WHERE memory_id = ?",
+            (_pack_token_ids(token_ids.values()), memory_id),
+        )
+    conn.execute(
+        """
+        INSERT INTO memory_scopes (tenant_key, action_type, version, items)
+        SELECT COALESCE(tenant_id, '__global__'), action_type, 1, COUNT(*)
+        FROM memory_items GROUP BY 1, 2
+        """
+    )
+
+
+_INSERT_MEMORY_LSH_SQL = """
+INSERT INTO memory_lsh_buckets (config, tenant_id, action_type, bucket, memory_id)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def _memory_lsh_rows(
+    lsh: LshConfig, memory_id: str, tenant_id: str | None, action_type: str, tokens: Collection[str]
+) -> list[tuple[str, str | None, str, int, str]]:
+    signature = minhash_signature(tokens, num_perm=lsh.num_perm)
+    return [
+        (lsh.key, tenant_id, action_type, bucket, memory_id)
+        for bucket in lsh_buckets(signature, bands=lsh.bands)
+    ]
+
+
+def _lsh_configs(conn: sqlite3.Connection) -> list[LshConfig]:
+    rows = conn.execute("SELECT num_perm, bands FROM memory_lsh_configs ORDER BY config")
+    return [LshConfig(num_perm=num_perm, bands=bands) for num_perm, bands in rows.fetchall()]
+
+
+def _register_lsh_config(conn: sqlite3.Connection, lsh: LshConfig) -> bool:
+    cursor = conn.execute(
+        "INSERT OR IGNORE INTO memory_lsh_configs (config, num_perm, bands) VALUES (?, ?, ?)",
+        (lsh.key, lsh.num_perm, lsh.bands),
+    )
+    return cursor.rowcount > 0
+
+
+def _index_memory_lsh(conn: sqlite3.Connection, lsh: LshConfig) -> None:
+    conn.execute("DELETE FROM memory_lsh_buckets WHERE config = ?", (lsh.key,))
+    rows = conn.execute(
+        "SELECT memory_id, tenant_id, action_type, feature_json FROM memory_items"
+    ).fetchall()
+    for memory_id, tenant_id, action_type, feature_json in rows:
+        tokens = feature_tokens(json.loads(feature_json))
+        conn.executemany(
+            _INSERT_MEMORY_LSH_SQL,
+            _memory_lsh_rows(lsh, memory_id, tenant_id, action_type, tokens),
+        )
+
+
+def _backfill_memory_lsh_configs(conn: sqlite3.Connection) -> None:
+    # Buckets written before configs were registered keep being maintained.
+    rows = conn.execute("SELECT DISTINCT config FROM memory_lsh_buckets").fetchall()
+    for (key,) in rows:
+        num_perm, _, bands = key.partition("x")
+        _register_lsh_config(conn, LshConfig(num_perm=int(num_perm), bands=int(bands)))
+
+
+def _backfill_memory_scope_token(conn: sqlite3.Connection) -> None:
+    rows = conn.execute("SELECT memory_id, action_type, feature_json FROM memory_items")
+    conn.executemany(
+        "UPDATE memory_items SET has_scope_token = 1 WHERE memory_id = ?",
+        [
+            (memory_id,)
+            for memory_id, action_type, feature_json in rows.fetchall()
+            if _scope_token(action_type) in feature_tokens(json.loads(feature_json))
+        ],
+    )
+
+
+# Data migrations run right after the script of the same version (same transaction).
+_MIGRATION_BACKFILLS: dict[int, Callable[[sqlite3.Connection], None]] = {
+    2: _backfill_memory_tokens,
+    3: _backfill_memory_token_ids,
+    5: _backfill_memory_scope_token,
+    6: _backfill_memory_lsh_configs,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class _MemoryScope:
+    """The memory items of one `(tenant, action_type)`, as token-ID postings."""
+
+    # `memory_scopes.version` the items were loaded at.
+    version: int
+    memory_ids: tuple[str, ...]
+    labels: tuple[str, ...]
+    summaries: tuple[str, ...]
+    token_counts: tuple[int, ...]
+    token_ids: tuple[array[int], ...]
+    has_scope_token: tuple[int, ...]
+    # Token ID -> positions of the items whose feature has that token, except the scope
+    # token (see `_scope_token()`): the items having it are listed in `scope_token_items`,
+    # fewest tokens (i.e. most similar to a query sharing only that token) first.
+    postings: Mapping[int, tuple[int, ...]]
+    scope_token_items: tuple[int, ...]
+
+
+def _applied_schema_version(conn: sqlite3.Connection) -> int:
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return int(row[0] or 0)
+
+
+_INSERT_DECISION_SQL = """
+INSERT INTO decisions (
+  decision_id, created_at, tenant_id,
+  subject_type, subject_id,
+  action_type,
+  target_system, target_resource_type, target_resource_id,
+  amount_value, amount_currency,
+  context_digest,
+  policy_id, policy_version, policy_hash,
+  verdict,
+  reason_codes_json,
+  record_json
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_IDEMPOTENCY_KEY_SQL = """
+INSERT INTO idempotency_keys (tenant_key, request_id, decision_id, created_at)
+VALUES (?, ?, ?, ?)
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class DecisionRows:
+    """
+    A DecisionRecord already flattened (and JSON-serialized) into its `decisions` row and
+    optional idempotency key row, e.g. to queue it without keeping references to the record.
+    """
+
+    decision: tuple[Any, ...]
+    idempotency: tuple[str, str, str, str] | None
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> DecisionRows:
+        return cls(*_decision_rows(record))
+
+    @property
+    def record_json(self) -> str:
+        return cast(str, self.decision[-1])
+
+
+def _decision_rows(
+    record: dict[str, Any],
+) -> tuple[tuple[Any, ...], tuple[str, str, str, str] | None]:
+    """Flatten a DecisionRecord into its `decisions` row and optional idempotency key row."""
+    decision_id = str(record["decision_id"])
+    created_at = str(record["created_at"])
+
+    request = record.get("request") or {}
+    request_id = request.get("request_id") if isinstance(request.get("request_id"), str) else None
+    subject = request.get("subject") or {}
+    action = request.get("action") or {}
+    target = action.get("target") or {}
+    amount = action.get("amount") or {}
+    context = request.get("context") or {}
+
+    tenant_id = subject.get("tenant_id") if isinstance(subject.get("tenant_id"), str) else None
+    subject_type = subject.get("type") if isinstance(subject.get("type"), str) else None
+    subject_id = subject.get("id") if isinstance(subject.get("id"), str) else None
+
+    action_type = str(action.get("type"))
+    target_system = target.get("system") if isinstance(target.get("system"), str) else None
+    target_resource_type = (
+        target.get("resource_type") if isinstance(target.get("resource_type"), str) else None
+    )
+    target_resource_id = (
+        target.get("resource_id") if isinstance(target.get("resource_id"), str) else None
+    )
+
+    amount_value: float | None
+    if isinstance(amount.get("value"), int | float):
+        amount_value = float(amount["value"])
+    else:
+        amount_value = None
+    amount_currency = amount.get("currency") if isinstance(amount.get("currency"), str) else None
+
+    context_digest = str(context.get("digest"))
+
+    policy = record.get("policy") or {}
+    policy_id = str(policy.get("policy_id"))
+    policy_version = str(policy.get("policy_version"))
+    policy_hash = str(policy.get("policy_hash"))
+
+    verdict = str(record.get("verdict"))
+    reason_codes = record.get("reason_codes") or []
+    reason_codes_json = _json_dumps(reason_codes)
+
+    record_json = _json_dumps(record)
+
+    tenant_key = tenant_id or "__global__"
+
+    decision_row = (
+        decision_id,
+        created_at,
+        tenant_id,
+        subject_type,
+        subject_id,
+        action_type,
+        target_system,
+        target_resource_type,
+        target_resource_id,
+        amount_value,
+        amount_currency,
+        context_digest,
+        policy_id,
+        policy_version,
+        policy_hash,
+        verdict,
+        reason_codes_json,
+        record_json,
+    )
+    idempotency_row = (
+        (tenant_key, request_id, decision_id, created_at) if request_id is not None else None
+    )
+    return decision_row, idempotency_row
+
+
 @dataclass(frozen=True, slots=True)
 class MemoryItem:
     memory_id: str
@@ -44,119 +418,191 @@ class StoreStats:
     policy_snapshots: int
 
 
+class _ThreadConnection:
+    """A pooled connection held in one thread's `threading.local()` slot."""
+
+    __slots__ = ("conn", "generation", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection, generation: int) -> None:
+        self.conn = conn
+        self.generation = generation
+
+
+def _release_connection(
+    connections: set[sqlite3.Connection], lock: threading.Lock, conn: sqlite3.Connection
+) -> None:
+    with lock:
+        connections.discard(conn)
+    conn.close()
+
+
 class SqliteStore:
-    def __init__(self, path: str | Path) -> None:
+    """
+    SQLite-backed store for decision records, events, memory items and policy snapshots.
+
+    With `pooled=True` (the default) each thread reuses one persistent connection: the
+    directory check and PRAGMAs run once per thread and prepared statements stay in the
+    connection's statement cache. A thread's connection is closed when the thread exits
+    (e.g. a retired worker of a thread pool); call `close()` to release the remaining ones
+    (e.g. on application shutdown). The store reconnects lazily if it is used again
+    afterwards.
+
+    Memory items are stored with their interned feature token IDs, and similarity lookups
+    (`top_k_memory_matches()`) keep each `(tenant, action_type)` scope in process as compact
+    token-ID postings, refreshed when the scope changes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        pooled: bool = True,
+        memory_cache_items: int = 100_000,
+        lsh: LshConfig | None = None,
+    ) -> None:
         self._path = Path(path)
+        self._pooled = pooled
+        self._memory_cache_items = memory_cache_items
+        self._lsh = lsh
+        self._lsh_registered = False
+        self._memory_lock = threading.Lock()
+        self._memory_scopes: dict[tuple[str, str], _MemoryScope] = {}
+        # Interned token IDs; `memory_token_vocab` rows up to `_vocab_read_upto` are all in.
+        self._token_ids: dict[str, int] = {}
+        self._vocab_read_upto = 0
+        self._local = threading.local()
+        # Open pooled connections; each leaves the set when its thread exits.
+        self._connections: set[sqlite3.Connection] = set()
+        self._connections_lock = threading.Lock()
+        self._generation = 0
+        self._schema_ready = False
+        self._policy_hashes: set[str] | None = None
+        self.connections_opened = 0
 
-    def connect(self) -> sqlite3.Connection:
+    def _open(self) -> sqlite3.Connection:
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(self._path)
+        # Pooled connections are thread-confined; `check_same_thread=False` only lets
+        # `close()` release them from whichever thread shuts the store down.
+        conn = sqlite3.connect(
+            self._path, check_same_thread=not self._pooled, cached_statements=256
+        )
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys = ON;")
         conn.execute("PRAGMA journal_mode = WAL;")
         conn.execute("PRAGMA synchronous = NORMAL;")
+        with self._connections_lock:
+            self.connections_opened += 1
         return conn
 
-    def init(self) -> None:
-        with self.connect() as conn:
-            conn.executescript(_load_schema_sql())
+    def connect(self) -> sqlite3.Connection:
+        if not self._pooled:
+            return self._open()
+        held = cast(_ThreadConnection | None, getattr(self._local, "held", None))
+        if held is not None and held.generation == self._generation:
+            return held.conn
+        conn = self._open()
+        with self._connections_lock:
+            self._connections.add(conn)
+            held = _ThreadConnection(conn, self._generation)
+        # The thread-local slot is dropped when the thread exits (or is replaced after
+        # `close()`); the connection goes with it.
+        weakref.finalize(held, _release_connection, self._connections, self._connections_lock, conn)
+        self._local.held = held
+        return conn
 
-    def put_decision_record(self, record: dict[str, Any]) -> None:
-        decision_id = str(record["decision_id"])
-        created_at = str(record["created_at"])
+    def close(self) -> None:
+        """Close every pooled connection opened by this store."""
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+            self._generation += 1
+        for conn in connections:
+            conn.close()
 
-        request = record.get("request") or {}
-        request_id = (
-            request.get("request_id") if isinstance(request.get("request_id"), str) else None
-        )
-        subject = request.get("subject") or {}
-        action = request.get("action") or {}
-        target = action.get("target") or {}
-        amount = action.get("amount") or {}
-        context = request.get("context") or {}
-
-        tenant_id = subject.get("tenant_id") if isinstance(subject.get("tenant_id"), str) else None
-        subject_type = subject.get("type") if isinstance(subject.get("type"), str) else None
-        subject_id = subject.get("id") if isinstance(subject.get("id"), str) else None
-
-        action_type = str(action.get("type"))
-        target_system = target.get("system") if isinstance(target.get("system"), str) else None
-        target_resource_type = (
-            target.get("resource_type") if isinstance(target.get("resource_type"), str) else None
-        )
-        target_resource_id = (
-            target.get("resource_id") if isinstance(target.get("resource_id"), str) else None
-        )
+    def init(self) -> None:
+        """
+        Bring the database schema up to `SCHEMA_VERSION`.
 
-        amount_value: float | None
-        if isinstance(amount.get("value"), int | float):
-            amount_value = float(amount["value"])
-        else:
-            amount_value = None
-        amount_currency = (
-            amount.get("currency") if isinstance(amount.get("currency"), str) else None
-        )
+        Runs once per store: afterwards this is a no-op. On an up-to-date file the bootstrap
+        is a single read of `schema_migrations`; DDL only runs for pending migrations, which
+        are applied under one `BEGIN IMMEDIATE` transaction so concurrent processes do not
+        apply them twice.
+        """
+        if self._schema_ready:
+            return
+        conn = self.connect()
+        if _applied_schema_version(conn) < SCHEMA_VERSION:
+            self._migrate(conn)
+        self._schema_ready = True
+        self._load_policy_hashes(conn)
 
-        context_digest = str(context.get("digest"))
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(_CREATE_SCHEMA_MIGRATIONS_SQL)
+            applied = _applied_schema_version(conn)
+            for version, script in _MIGRATIONS:
+                if version <= applied:
+                    continue
+                for statement in _split_sql_statements(_load_schema_sql(script)):
+                    conn.execute(statement)
+                backfill = _MIGRATION_BACKFILLS.get(version)
+                if backfill is not None:
+                    backfill(conn)
+                conn.execute(
+                    "INSERT INTO schema_migrations (version, applied_at) VALUES (?, ?)",
+                    (version, _utc_now_iso()),
+                )
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
 
-        policy = record.get("policy") or {}
-        policy_id = str(policy.get("policy_id"))
-        policy_version = str(policy.get("policy_version"))
-        policy_hash = str(policy.get("policy_hash"))
+    def schema_version(self) -> int:
+        """Highest migration version applied to the database file (0 if uninitialized)."""
+        return _applied_schema_version(self.connect())
 
-        verdict = str(record.get("verdict"))
-        reason_codes = record.get("reason_codes") or []
-        reason_codes_json = _json_dumps(reason_codes)
+    def put_decision_record(self, record: dict[str, Any]) -> None:
+        self.put_decision_records([record])
 
-        record_json = _json_dumps(record)
+    def put_decision_records(self, records: Sequence[dict[str, Any] | DecisionRows]) -> None:
+        """
+        Persist decision records (and their idempotency keys) in a single transaction.
 
-        tenant_key = tenant_id or "__global__"
+        Records may be passed already flattened as `DecisionRows`. Either every record is
+        written or none is: an `sqlite3.IntegrityError` on any idempotency key rolls back the
+        whole batch.
+        """
+        decision_rows: list[tuple[Any, ...]] = []
+        idempotency_rows: list[tuple[str, str, str, str]] = []
+        for record in records:
+            rows = record if isinstance(record, DecisionRows) else DecisionRows.from_record(record)
+            decision_rows.append(rows.decision)
+            if rows.idempotency is not None:
+                idempotency_rows.append(rows.idempotency)
 
         with self.connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO decisions (
-                  decision_id, created_at, tenant_id,
-                  subject_type, subject_id,
-                  action_type,
-                  target_system, target_resource_type, target_resource_id,
-                  amount_value, amount_currency,
-                  context_digest,
-                  policy_id, policy_version, policy_hash,
-                  verdict,
-                  reason_codes_json,
-                  record_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    decision_id,
-                    created_at,
-                    tenant_id,
-                    subject_type,
-                    subject_id,
-                    action_type,
-                    target_system,
-                    target_resource_type,
-                    target_resource_id,
-                    amount_value,
-                    amount_currency,
-                    context_digest,
-                    policy_id,
-                    policy_version,
-                    policy_hash,
-                    verdict,
-                    reason_codes_json,
-                    record_json,
-                ),
-            )
-            if request_id is not None:
-                conn.execute(
-                    """
-                    INSERT INTO idempotency_keys (tenant_key, request_id, decision_id, created_at)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (tenant_key, request_id, decision_id, created_at),
-                )
+            conn.executemany(_INSERT_DECISION_SQL, decision_rows)
+            if idempotency_rows:
+                conn.executemany(_INSERT_IDEMPOTENCY_KEY_SQL, idempotency_rows)
+
+    def _load_policy_hashes(self, conn: sqlite3.Connection | None = None) -> set[str]:
+        conn = conn or self.connect()
+        rows = conn.execute("SELECT policy_hash FROM policy_snapshots").fetchall()
+        self._policy_hashes = {str(row["policy_hash"]) for row in rows}
+        return self._policy_hashes
+
+    def has_policy_snapshot(self, policy_hash: str) -> bool:
+        """
+        Whether a snapshot for `policy_hash` is persisted, answered from an in-process set.
+
+        The set is rebuilt from `policy_snapshots` by `init()` and kept current by
+        `put_policy_snapshot()`, so callers can skip reading policy text for known hashes.
+        """
+        hashes = self._policy_hashes
+        if hashes is None:
+            hashes = self._load_policy_hashes()
+        return policy_hash in hashes
 
     def put_policy_snapshot(
         self,
@@ -166,6 +612,8 @@ class SqliteStore:
         policy_version: str,
         policy_text: str,
     ) -> None:
+        if self._policy_hashes is not None and policy_hash in self._policy_hashes:
+            return
         created_at = _utc_now_iso()
         with self.connect() as conn:
             conn.execute(
@@ -176,6 +624,8 @@ class SqliteStore:
                 """,
                 (policy_hash, policy_id, policy_version, created_at, policy_text),
             )
+        if self._policy_hashes is not None:
+            self._policy_hashes.add(policy_hash)
 
     def get_policy_snapshot(self, policy_hash: str) -> str | None:
         with self.connect() as conn:
@@ -245,7 +695,9 @@ class SqliteStore:
             source_decision_id=source_decision_id,
         )
 
+        tokens = feature_tokens(item.feature)
         with self.connect() as conn:
+            token_ids = _intern_tokens(conn, tokens)
             conn.execute(
                 """
                 INSERT INTO memory_items (
@@ -256,8 +708,11 @@ class SqliteStore:
                   action_type,
                   feature_json,
                   summary,
-                  source_decision_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                  source_decision_id,
+                  token_count,
+                  token_ids,
+                  has_scope_token
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     item.memory_id,
@@ -268,11 +723,300 @@ class SqliteStore:
                     _json_dumps(item.feature),
                     item.summary,
                     item.source_decision_id,
+                    len(tokens),
+                    _pack_token_ids(token_ids.values()),
+                    int(_scope_token(item.action_type) in tokens),
                 ),
             )
+            conn.executemany(
+                _INSERT_MEMORY_TOKEN_SQL,
+                _memory_token_rows(item.memory_id, item.tenant_id, item.action_type, tokens),
+            )
+            # Read inside the write transaction, so an item is never missed by a config
+            # registered (and backfilled) concurrently.
+            for lsh in _lsh_configs(conn):
+                conn.executemany(
+                    _INSERT_MEMORY_LSH_SQL,
+                    _memory_lsh_rows(lsh, item.memory_id, item.tenant_id, item.action_type, tokens),
+                )
 
+        with self._memory_lock:
+            self._token_ids.update(token_ids)
+            self._memory_scopes.pop((_tenant_key(item.tenant_id), item.action_type), None)
         return item
 
+    def top_k_memory_matches(
+        self,
+        *,
+        tenant_id: str | None,
+        action_type: str,
+        tokens: Collection[str],
+        top_k: int,
+    ) -> list[SimilarityMatch]:
+        """
+        The `top_k` memory items of `(tenant_id, action_type)` most similar to a query.
+
+        `tokens` are the query's `feature_tokens()`. Only items sharing at least one token
+        are scored (items sharing none would score 0). Scores equal `weighted_jaccard()` with
+        unit weights and ties break by `memory_id`, like `top_k_matches()`. The scope's
+        `action_type=` token is shared by (nearly) every item, so it is not indexed: items
+        sharing only it are read smallest first, and only as many as can still rank.
+
+        Scopes of up to `memory_cache_items` items are scored in process from a cache of
+        their interned token IDs, reloaded when `memory_scopes.version` changes (i.e. when
+        any process adds or removes one of their items); larger ones are scored by SQLite
+        through the `memory_tokens` index.
+        """
+        if not tokens or top_k <= 0:
+            return []
+        conn = self.connect()
+        key = (_tenant_key(tenant_id), action_type)
+        row = conn.execute(
+            "SELECT version, items FROM memory_scopes WHERE tenant_key = ? AND action_type = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return []
+        if row["items"] > self._memory_cache_items:
+            return self._top_k_memory_matches_sql(conn, tenant_id, action_type, tokens, top_k)
+
+        scope = self._memory_scope(conn, key, tenant_id, int(row["version"]))
+        n = len(tokens)
+        scope_token = _scope_token(action_type)
+        scope_shared = int(scope_token in tokens)
+        lists = sorted(
+            (
+                (token_id, scope.postings.get(token_id, ()))
+                for token in tokens
+                if token != scope_token and (token_id := self._token_ids.get(token)) is not None
+            ),
+            key=lambda pair: len(pair[1]),
+        )
+
+        def ranked(i: int, shared: int) -> tuple[float, str, int]:
+            return (-(shared / (n + scope.token_counts[i] - shared)), scope.memory_ids[i], i)
+
+        # Postings are read rarest first. Items outside them share at most the unread tokens
+        # (and the scope token), so they score at most that many / n: once the k-th best item
+        # read so far beats that, the remaining (longer) postings are skipped.
+        counts: Counter[int] = Counter()
+        best: list[tuple[float, str, int]] = []
+        for j, (_, items) in enumerate(lists):
+            counts.update(items)
+            unread = [token_id for token_id, _ in lists[j + 1 :]]
+            if unread and len(counts) < top_k:
+                continue
+            best = heapq.nsmallest(
+                top_k,
+                (
+                    ranked(
+                        i,
+                        c
+                        + sum(1 for t in unread if t in scope.token_ids[i])
+                        + scope_shared * scope.has_scope_token[i],
+                    )
+                    for i, c in counts.items()
+                ),
+            )
+            if len(best) == top_k and -best[-1][0] > (len(unread) + scope_shared) / n:
+                break
+        else:
+            if scope_shared:
+                # Items sharing only the scope token, best (smallest) first.
+                only_scope = (i for i in scope.scope_token_items if i not in counts)
+                best = heapq.nsmallest(
+                    top_k, [*best, *(ranked(i, 1) for i in itertools.islice(only_scope, top_k))]
+                )
+        return [
+            SimilarityMatch(
+                memory_id=memory_id,
+                label=scope.labels[i],
+                score=-neg_score,
+                summary=scope.summaries[i],
+            )
+            for neg_score, memory_id, i in best
+        ]
+
+    def approximate_top_k_memory_matches(
+        self,
+        *,
+        tenant_id: str | None,
+        action_type: str,
+        query_feature: dict[str, Any],
+        top_k: int,
+    ) -> list[SimilarityMatch]:
+        """
+        Approximate `top_k_memory_matches()`: candidates come from the LSH buckets the
+        query's MinHash signature falls into and are re-ranked exactly with
+        `weighted_jaccard()`.
+
+        Requires a store created with an `LshConfig`. The first lookup registers that config
+        in the database and buckets the existing items; from then on every writer, whatever
+        its own config, also buckets new items under it.
+        """
+        lsh = self._registered_lsh()
+        if top_k <= 0:
+            return []
+        tokens = feature_tokens(query_feature)
+        buckets = lsh_buckets(minhash_signature(tokens, num_perm=lsh.num_perm), bands=lsh.bands)
+        if not buckets:
+            return []
+        candidates = self._memory_candidates(
+            """
+            SELECT memory_id, label, feature_json, summary FROM memory_items
+            WHERE memory_id IN (
+              SELECT memory_id FROM memory_lsh_buckets
+              WHERE config = ? AND action_type = ? AND tenant_id IS ?
+                AND bucket IN (SELECT value FROM json_each(?))
+            )
+            """,
+            (lsh.key, action_type, tenant_id, _json_dumps(buckets)),
+        )
+        matches = top_k_matches(query_feature=query_feature, candidates=candidates, top_k=top_k)
+        return [m for m in matches if m.score > 0]
+
+    def iter_memory_candidates(
+        self, *, tenant_id: str | None, action_type: str
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream a scope's memory items as `top_k_matches()` candidates, one row at a time.
+
+        Unlike `list_memory_items()` nothing is materialized up front, so e.g.
+        `top_k_matches(candidates=store.iter_memory_candidates(...))` ranks a scope of any
+        size in memory bounded by `top_k`.
+        """
+        return self._memory_candidates(
+            """
+            SELECT memory_id, label, feature_json, summary FROM memory_items
+            WHERE action_type = ? AND tenant_id IS ?
+            """,
+            (action_type, tenant_id),
+        )
+
+    def _memory_candidates(self, sql: str, params: tuple[Any, ...]) -> Iterator[dict[str, Any]]:
+        cursor = self.connect().execute(sql, params)
+        try:
+            for row in cursor:
+                yield {
+                    "memory_id": row["memory_id"],
+                    "label": row["label"],
+                    "feature": json.loads(row["feature_json"]),
+                    "summary": row["summary"],
+                }
+        finally:
+            cursor.close()
+
+    def index_memory_lsh(self) -> None:
+        """(Re)compute the LSH buckets of every memory item for this store's `LshConfig`."""
+        lsh = self._require_lsh()
+        with self.connect() as conn:
+            _register_lsh_config(conn, lsh)
+            _index_memory_lsh(conn, lsh)
+        self._lsh_registered = True
+
+    def _require_lsh(self) -> LshConfig:
+        if self._lsh is None:
+            raise ValueError("approximate memory search requires a store created with an LshConfig")
+        return self._lsh
+
+    def _registered_lsh(self) -> LshConfig:
+        lsh = self._require_lsh()
+        if not self._lsh_registered:
+            with self.connect() as conn:
+                if _register_lsh_config(conn, lsh):
+                    _index_memory_lsh(conn, lsh)
+            self._lsh_registered = True
+        return lsh
+
+    def _memory_scope(
+        self, conn: sqlite3.Connection, key: tuple[str, str], tenant_id: str | None, version: int
+    ) -> _MemoryScope:
+        with self._memory_lock:
+            scope = self._memory_scopes.get(key)
+        if scope is not None and scope.version == version:
+            return scope
+
+        rows = conn.execute(
+            "SELECT memory_id, label, summary, token_ids, has_scope_token FROM memory_items "
+            "WHERE tenant_id IS ? AND action_type = ?",
+            (tenant_id, key[1]),
+        ).fetchall()
+        scope_token_id = conn.execute(
+            "SELECT token_id FROM memory_token_vocab WHERE token = ?", (_scope_token(key[1]),)
+        ).fetchone()
+        postings: dict[int, list[int]] = {}
+        items_token_ids: list[array[int]] = []
+        for position, row in enumerate(rows):
+            token_ids = array("i")
+            token_ids.frombytes(row["token_ids"] or b"")
+            items_token_ids.append(token_ids)
+            for token_id in token_ids:
+                postings.setdefault(token_id, []).append(position)
+        if scope_token_id is not None:
+            postings.pop(scope_token_id[0], None)
+        token_counts = tuple(len(token_ids) for token_ids in items_token_ids)
+        memory_ids = tuple(row["memory_id"] for row in rows)
+        scope = _MemoryScope(
+            version=version,
+            memory_ids=memory_ids,
+            labels=tuple(row["label"] for row in rows),
+            summaries=tuple(row["summary"] for row in rows),
+            token_counts=token_counts,
+            token_ids=tuple(items_token_ids),
+            has_scope_token=tuple(row["has_scope_token"] for row in rows),
+            postings={token_id: tuple(items) for token_id, items in postings.items()},
+            scope_token_items=tuple(
+                sorted(
+                    (i for i, row in enumerate(rows) if row["has_scope_token"]),
+                    key=lambda i: (token_counts[i], memory_ids[i]),
+                )
+            ),
+        )
+
+        # Read the vocabulary after the items, so it has every token they reference.
+        vocab = conn.execute(
+            "SELECT token, token_id FROM memory_token_vocab WHERE token_id > ?",
+            (self._vocab_read_upto,),
+        ).fetchall()
+        with self._memory_lock:
+            for token, token_id in vocab:
+                self._token_ids[token] = token_id
+                self._vocab_read_upto = max(self._vocab_read_upto, token_id)
+            self._memory_scopes[key] = scope
+        return scope
+
+    def _top_k_memory_matches_sql(
+        self,
+        conn: sqlite3.Connection,
+        tenant_id: str | None,
+        action_type: str,
+        tokens: Collection[str],
+        top_k: int,
+    ) -> list[SimilarityMatch]:
+        params = {
+            "action_type": action_type,
+            "tenant_id": tenant_id,
+            "tokens": _json_dumps(sorted(tokens)),
+            "scope_shared": int(_scope_token(action_type) in tokens),
+            "n": len(tokens),
+            "top_k": top_k,
+        }
+        rows = conn.execute(_TOP_K_MEMORY_SQL, params).fetchall()
+        if params["scope_shared"]:
+            rows += conn.execute(_TOP_K_SCOPE_TOKEN_ONLY_SQL, params).fetchall()
+        matches = [
+            SimilarityMatch(
+                memory_id=row["memory_id"],
+                label=row["label"],
+                score=row["total_shared"]
+                / (len(tokens) + row["token_count"] - row["total_shared"]),
+                summary=row["summary"],
+            )
+            for row in rows
+        ]
+        matches.sort(key=lambda m: (-m.score, m.memory_id))
+        return matches[:top_k]
+
     def list_memory_items(
         self,
         *,
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from lumyn.store.sqlite import DecisionRows, SqliteStore
+
+logger = logging.getLogger(__name__)
+
+# Durability contracts for write-behind persistence.
+# - "group_commit": return once the group containing the record has committed.
+# - "enqueue": return once the record is queued; a crash can lose queued records.
+WRITE_BEHIND_DURABILITY = ("group_commit", "enqueue")
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    # Serialized by the submitting thread: later changes to the record (or to the request
+    # objects it shares) do not reach the database.
+    rows: DecisionRows | None
+    idempotency_key: tuple[str, str] | None
+    future: Future[None] = field(default_factory=Future)
+
+
+_STOP = object()
+
+
+def _idempotency_key(record: dict[str, Any]) -> tuple[str, str] | None:
+    request = record.get("request")
+    if not isinstance(request, dict):
+        return None
+    request_id = request.get("request_id")
+    if not isinstance(request_id, str):
+        return None
+    subject = request.get("subject")
+    tenant_id = subject.get("tenant_id") if isinstance(subject, dict) else None
+    return (tenant_id if isinstance(tenant_id, str) else "__global__", request_id)
+
+
+class GroupCommitWriter:
+    """
+    Write-behind persistence for decision records.
+
+    Records go onto a bounded in-process queue and a dedicated writer thread commits them in
+    groups (every `batch_size` records or `flush_interval_ms`, whichever comes first) through
+    `SqliteStore.put_decision_records`, i.e. one transaction and `executemany` per group.
+
+    A full queue blocks `submit()` (backpressure). Records that are queued but not yet
+    committed stay visible to idempotency lookups through `pending_record()`.
+    """
+
+    def __init__(
+        self,
+        store: SqliteStore,
+        *,
+        durability: str = "group_commit",
+        batch_size: int = 64,
+        flush_interval_ms: float = 5.0,
+        max_queue: int = 1024,
+    ) -> None:
+        if durability not in WRITE_BEHIND_DURABILITY:
+            raise ValueError(f"unsupported write-behind durability: {durability}")
+        self._store = store
+        self.durability = durability
+        self._batch_size = max(1, batch_size)
+        self._flush_interval_s = max(0.0, flush_interval_ms) / 1000.0
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max(1, max_queue))
+        self._pending: dict[tuple[str, str], _PendingWrite] = {}
+        self._pending_lock = threading.Lock()
+        self._healthy = True
+        # Guards `_closed` and every `put`, so nothing is queued after `_STOP`.
+        self._submit_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="lumyn-group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: dict[str, Any]) -> None:
+        """
+        Queue `record` for persistence and honor the durability contract.
+
+        Raises the commit error (e.g. `sqlite3.IntegrityError`, `OSError`) when waiting for the
+        group commit. After a failed group, `enqueue` durability also waits for the commit until
+        a group succeeds again, so storage failures keep surfacing to callers.
+        """
+        pending = _PendingWrite(
+            rows=DecisionRows.from_record(record), idempotency_key=_idempotency_key(record)
+        )
+        self._put(pending)
+        if self.durability == "group_commit" or not self._healthy:
+            pending.future.result()
+
+    def _put(self, pending: _PendingWrite) -> None:
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("write-behind writer is closed")
+            if pending.idempotency_key is not None:
+                with self._pending_lock:
+                    self._pending.setdefault(pending.idempotency_key, pending)
+            self._queue.put(pending)
+
+    def pending_record(self, *, tenant_key: str, request_id: str) -> dict[str, Any] | None:
+        with self._pending_lock:
+            pending = self._pending.get((tenant_key, request_id))
+        if pending is None or pending.rows is None:
+            return None
+        return cast(dict[str, Any], json.loads(pending.rows.record_json))
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        """Block until every record queued so far has been committed (or failed)."""
+        marker = _PendingWrite(rows=None, idempotency_key=None)
+        self._put(marker)
+        marker.future.result()
+
+    def close(self) -> None:
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+        # Nothing can be queued after `_STOP`; fail anything left rather than leave callers
+        # waiting forever.
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _PendingWrite):
+                self._resolve([(item, RuntimeError("write-behind writer is closed"))])
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch: list[_PendingWrite] = [item]
+            deadline = time.monotonic() + self._flush_interval_s
+            while len(batch) < self._batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    nxt = (
+                        self._queue.get(timeout=timeout)
+                        if timeout > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._commit(batch)
+
+    def _commit(self, batch: list[_PendingWrite]) -> None:
+        writes = [(p, p.rows) for p in batch if p.rows is not None]
+        # `id()` of each settled write -> its error (`None` once committed).
+        outcomes: dict[int, BaseException | None] = {}
+        try:
+            if writes:
+                try:
+                    self._store.put_decision_records([rows for _, rows in writes])
+                except sqlite3.IntegrityError:
+                    # One conflicting idempotency key rolled back the group; retry record by
+                    # record so only the conflicting writes fail.
+                    self._commit_individually(writes, outcomes)
+                else:
+                    outcomes.update((id(p), None) for p, _ in writes)
+            self._healthy = True
+        except Exception as e:
+            self._healthy = False
+            logger.warning("group commit of %d decision records failed: %s", len(writes), e)
+            for p, _ in writes:
+                outcomes.setdefault(id(p), e)
+        finally:
+            self._resolve([(p, outcomes.get(id(p))) for p in batch])
+
+    def _resolve(self, outcomes: list[tuple[_PendingWrite, BaseException | None]]) -> None:
+        # Drop the pending entries before waking the callers, so none of them can read back
+        # its own record from `pending_record()` once it has failed (or been committed).
+        with self._pending_lock:
+            for p, _ in outcomes:
+                if p.idempotency_key is not None:
+                    if self._pending.get(p.idempotency_key) is p:
+                        del self._pending[p.idempotency_key]
+        for p, error in outcomes:
+            if p.future.done():
+                continue
+            if error is None:
+                p.future.set_result(None)
+            else:
+                p.future.set_exception(error)
+
+    def _commit_individually(
+        self,
+        writes: list[tuple[_PendingWrite, DecisionRows]],
+        outcomes: dict[int, BaseException | None],
+    ) -> None:
+        for p, rows in writes:
+            try:
+                self._store.put_decision_records([rows])
+            except sqlite3.IntegrityError as e:
+                outcomes[id(p)] = e
+            else:
+                outcomes[id(p)] = None
@@ -1,3 +1,7 @@
+import importlib
+
+import pytest
+
 from lumyn.engine.normalize_v1 import NormalizedRequestV1
 from lumyn.memory.embed import ProjectionLayer
 
@@ -43,3 +47,27 @@ def test_embed_text_representation() -> None:
     # Action: login. Evidence: device=mobile, ip_score=0.9
     assert "Action: login" in text
     assert "Evidence: device=mobile, ip_score=0.9" in text
+
+
+def test_projection_layers_share_process_wide_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Building a ProjectionLayer must not load a new model when one is already registered.
+    """
+    embed_mod = importlib.import_module("lumyn.memory.embed")
+    created: list[str] = []
+
+    class StubTextEmbedding:
+        def __init__(self, model_name: str) -> None:
+            created.append(model_name)
+
+    monkeypatch.setattr(embed_mod, "TextEmbedding", StubTextEmbedding)
+    monkeypatch.setattr(embed_mod, "_MODELS", {})
+
+    embed_mod.warmup_embedding_model("stub/a")
+    a = ProjectionLayer(model_name="stub/a")
+    b = ProjectionLayer(model_name="stub/a")
+    c = ProjectionLayer(model_name="stub/b")
+
+    assert a.model is b.model
+    assert a.model is not c.model
+    assert created == ["stub/a", "stub/b"]
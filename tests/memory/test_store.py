@@ -53,3 +53,75 @@ def test_persistence() -> None:
     hits = store.search([0.1] * 384, limit=1)
     assert len(hits) == 1
     assert hits[0].experience.decision_id == "dec_01"
+
+
+def test_search_many_matches_single_searches() -> None:
+    store = MemoryStore(db_path=DB_PATH)
+    store.add_experiences(
+        [
+            Experience(decision_id="dec_02", vector=[0.9] * 384, outcome=1),
+            Experience(decision_id="dec_03", vector=[0.5] * 384, outcome=1),
+        ]
+    )
+
+    queries = [[0.1] * 384, [0.9] * 384, [0.5] * 384]
+    batched = store.search_many(queries, limit=2)
+    single = [store.search(q, limit=2) for q in queries]
+
+    assert [[h.experience.decision_id for h in hits] for hits in batched] == [
+        [h.experience.decision_id for h in hits] for hits in single
+    ]
+    assert [hits[0].experience.decision_id for hits in batched] == ["dec_01", "dec_02", "dec_03"]
+
+
+def test_shared_store_reuses_one_table_handle(tmp_path: Path) -> None:
+    from lumyn.memory.client import close_memory_stores, get_memory_store
+
+    db_path = tmp_path / "memory"
+    store = get_memory_store(db_path)
+    assert get_memory_store(str(db_path)) is store
+    assert store.search([0.1] * 384) == []
+
+    store.add_experiences([Experience(decision_id="dec_a", vector=[0.1] * 384, outcome=-1)])
+    listed: list[None] = []
+    real_table_names = store.db.table_names
+
+    def _counting_table_names() -> object:
+        listed.append(None)
+        return real_table_names()
+
+    store.db.table_names = _counting_table_names
+    assert [h.experience.decision_id for h in store.search([0.1] * 384)] == ["dec_a"]
+
+    # e.g. `lumyn label` in another process
+    MemoryStore(db_path=db_path).add_experiences(
+        [Experience(decision_id="dec_b", vector=[0.9] * 384, outcome=1)]
+    )
+    assert store.search([0.9] * 384, limit=1)[0].experience.decision_id == "dec_b"
+    assert listed == []
+
+    close_memory_stores()
+    assert get_memory_store(db_path) is not store
+    close_memory_stores()
+
+
+def test_unshared_engine_closes_only_its_own_memory_store(tmp_path: Path) -> None:
+    from lumyn import DecisionEngine, LumynConfig
+    from lumyn.memory.client import close_memory_stores, get_memory_store
+
+    base = {"store_path": tmp_path / "lumyn.db", "memory_path": tmp_path / "memory"}
+    shared_engine = DecisionEngine(LumynConfig(**base))
+    own_engine = DecisionEngine(LumynConfig(**base, memory_shared=False))
+    shared = shared_engine._memory()
+    own = own_engine._memory()
+    assert shared is get_memory_store(tmp_path / "memory")
+    assert own is not shared
+
+    shared.add_experiences([Experience(decision_id="dec_a", vector=[0.1] * 384, outcome=-1)])
+    assert [h.experience.decision_id for h in own.search([0.1] * 384)] == ["dec_a"]
+    own_engine.close()
+    shared_engine.close()
+    assert own._table is None
+    assert shared._table is not None
+    assert get_memory_store(tmp_path / "memory") is shared
+    close_memory_stores()
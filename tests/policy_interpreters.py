@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+from typing import Any
+
+from lumyn.engine.conditions import STAGES_V1, VERDICT_PRECEDENCE_V1
+from lumyn.engine.evaluator import (
+    STAGES,
+    VERDICT_PRECEDENCE,
+    EvaluationResult,
+    MatchedRule,
+    _eval_condition,
+)
+from lumyn.engine.evaluator_v1 import _expr_matches as _expr_matches_v1
+from lumyn.engine.normalize import NormalizedRequest, normalize_request
+from lumyn.engine.normalize_v1 import normalize_request_v1
+from lumyn.records.emit_v1 import EvaluationResultV1, MatchedRuleV1
+
+# Rule-by-rule reference interpreters: the compiled programs (`lumyn.engine.compiler`) must
+# agree with them on every result and error.
+
+
+def _when_matches(action_type: str, when: dict[str, Any] | None) -> bool:
+    if not when:
+        return True
+    if "action_type" in when:
+        value = when["action_type"]
+        return isinstance(value, str) and value == action_type
+    if "action_type_in" in when:
+        values = when["action_type_in"]
+        if not isinstance(values, list):
+            return False
+        allowed = [v for v in values if isinstance(v, str)]
+        return action_type in allowed
+    return False
+
+
+def _expr_matches(expr: dict[str, Any] | None, normalized: NormalizedRequest) -> bool:
+    if not expr:
+        return True
+    return all(_eval_condition(key, expected, normalized) for key, expected in expr.items())
+
+
+def _required_evidence_missing(
+    *,
+    action_type: str,
+    normalized: NormalizedRequest,
+    required_evidence: dict[str, Any],
+) -> bool:
+    required = required_evidence.get(action_type)
+    if not isinstance(required, list):
+        return False
+    for key in required:
+        if not isinstance(key, str):
+            continue
+        if key not in normalized.evidence or normalized.evidence.get(key) in (None, ""):
+            return True
+    return False
+
+
+def interpret_policy(
+    request: dict[str, Any],
+    *,
+    policy: dict[str, Any],
+) -> EvaluationResult:
+    """Reference interpreter for v0 policies; `compile_policy()` must agree with it."""
+    normalized = normalize_request(request)
+    action_type = normalized.action_type
+
+    matched_rules: list[MatchedRule] = []
+    reason_codes: list[str] = []
+    queries: list[dict[str, str]] = []
+    obligations: list[dict[str, Any]] = []
+
+    required_evidence = policy.get("required_evidence")
+    required_evidence_map: dict[str, Any] = (
+        dict(required_evidence) if isinstance(required_evidence, dict) else {}
+    )
+
+    rules = policy.get("rules", [])
+    rules_list = rules if isinstance(rules, list) else []
+
+    for stage in STAGES:
+        for rule in rules_list:
+            if not isinstance(rule, dict):
+                continue
+            if rule.get("stage") != stage:
+                continue
+            rule_id = str(rule.get("id"))
+
+            when = rule.get("when")
+            if not _when_matches(action_type, when if isinstance(when, dict) else None):
+                continue
+
+            if stage == "REQUIREMENTS" and not any(
+                rule.get(k) is not None for k in ("if", "if_all", "if_any")
+            ):
+                if not _required_evidence_missing(
+                    action_type=action_type,
+                    normalized=normalized,
+                    required_evidence=required_evidence_map,
+                ):
+                    continue
+
+            expr_if = rule.get("if")
+            if expr_if is not None and not _expr_matches(
+                expr_if if isinstance(expr_if, dict) else None, normalized
+            ):
+                continue
+
+            expr_if_all = rule.get("if_all")
+            if expr_if_all is not None:
+                if not isinstance(expr_if_all, list):
+                    continue
+                if not all(
+                    _expr_matches(expr if isinstance(expr, dict) else None, normalized)
+                    for expr in expr_if_all
+                ):
+                    continue
+
+            expr_if_any = rule.get("if_any")
+            if expr_if_any is not None:
+                if not isinstance(expr_if_any, list):
+                    continue
+                if not any(
+                    _expr_matches(expr if isinstance(expr, dict) else None, normalized)
+                    for expr in expr_if_any
+                ):
+                    continue
+
+            then = rule.get("then", {})
+            if not isinstance(then, dict):
+                continue
+            effect = then.get("verdict")
+            if effect not in VERDICT_PRECEDENCE:
+                continue
+            then_reason_codes = then.get("reason_codes", [])
+            if not isinstance(then_reason_codes, list) or not all(
+                isinstance(code, str) for code in then_reason_codes
+            ):
+                continue
+
+            matched_rules.append(
+                MatchedRule(
+                    rule_id=rule_id,
+                    stage=stage,
+                    effect=effect,
+                    reason_codes=list(then_reason_codes),
+                )
+            )
+            reason_codes.extend(then_reason_codes)
+
+            then_queries = then.get("queries", [])
+            if isinstance(then_queries, list):
+                for item in then_queries:
+                    if (
+                        isinstance(item, dict)
+                        and isinstance(item.get("field"), str)
+                        and isinstance(item.get("question"), str)
+                    ):
+                        queries.append({"field": item["field"], "question": item["question"]})
+
+            then_obligations = then.get("obligations", [])
+            if isinstance(then_obligations, list):
+                for item in then_obligations:
+                    if not isinstance(item, dict):
+                        continue
+                    obligation = dict(item)
+                    obligation.setdefault("source", {})
+                    source = obligation.get("source")
+                    if isinstance(source, dict):
+                        source.setdefault("rule_id", rule_id)
+                        source.setdefault("stage", stage)
+                    else:
+                        obligation["source"] = {"rule_id": rule_id, "stage": stage}
+                    obligations.append(obligation)
+
+    if not matched_rules:
+        defaults_raw = policy.get("defaults")
+        defaults: dict[str, Any] = defaults_raw if isinstance(defaults_raw, dict) else {}
+        default_verdict = defaults.get("default_verdict", "ESCALATE")
+        default_reason = defaults.get("default_reason_code", "NO_MATCH_DEFAULT_ESCALATE")
+        matched_rules.append(
+            MatchedRule(
+                rule_id="DEFAULT",
+                stage="DEFAULT",
+                effect=default_verdict,
+                reason_codes=[default_reason],
+            )
+        )
+        reason_codes.append(default_reason)
+
+    final_verdict = max(matched_rules, key=lambda r: VERDICT_PRECEDENCE.get(r.effect, -1)).effect
+
+    if final_verdict != "QUERY":
+        queries = []
+
+    return EvaluationResult(
+        verdict=final_verdict,
+        reason_codes=reason_codes,
+        matched_rules=matched_rules,
+        queries=queries,
+        obligations=obligations,
+    )
+
+
+def interpret_policy_v1(
+    request: dict[str, Any],
+    *,
+    policy: dict[str, Any],
+) -> EvaluationResultV1:
+    """Reference interpreter for v1 policies; `compile_policy_v1()` must agree with it."""
+    normalized = normalize_request_v1(request)
+    action_type = normalized.action_type
+
+    matched_rules: list[MatchedRuleV1] = []
+    reason_codes: list[str] = []
+    queries: list[dict[str, str]] = []
+    obligations: list[dict[str, Any]] = []
+
+    # v1 policy logic ...
+    # This logic mimics the v0 loop but uses v1 dataclasses/verdicts
+
+    rules = policy.get("rules", [])
+    rules_list = rules if isinstance(rules, list) else []
+
+    for stage in STAGES_V1:
+        for rule in rules_list:
+            if not isinstance(rule, dict):
+                continue
+            if rule.get("stage") != stage:
+                continue
+            rule_id = str(rule.get("id"))
+
+            when = rule.get("when", {})
+            # Simplified match
+            if when and when.get("action_type") and when["action_type"] != action_type:
+                continue
+
+            # Check if/if_all/if_any
+
+            # 1. "if": match ALL conditions in the dict (implicit AND)
+            expr_if = rule.get("if")
+            if expr_if and not _expr_matches_v1(expr_if, normalized):
+                continue
+
+            # 2. "if_all": list of condition dicts, ALL must match
+            expr_if_all = rule.get("if_all")
+            if expr_if_all:
+                if not all(_expr_matches_v1(cond, normalized) for cond in expr_if_all):
+                    continue
+
+            # 3. "if_any": list of condition dicts, AT LEAST ONE must match
+            expr_if_any = rule.get("if_any")
+            if expr_if_any:
+                if not any(_expr_matches_v1(cond, normalized) for cond in expr_if_any):
+                    continue
+
+            then = rule.get("then", {})
+            effect = then.get("verdict")
+            if effect not in VERDICT_PRECEDENCE_V1:
+                # Mapper from v0 terms if we are using v0 policies in v1 engine?
+                # TRUST -> ALLOW, QUERY -> DENY
+                if effect == "TRUST":
+                    effect = "ALLOW"
+                elif effect == "QUERY":
+                    effect = "DENY"
+                elif effect not in VERDICT_PRECEDENCE_V1:
+                    continue
+
+            then_reason_codes = then.get("reason_codes", [])
+
+            matched_rules.append(
+                MatchedRuleV1(
+                    rule_id=rule_id,
+                    stage=stage,
+                    effect=effect,
+                    reason_codes=list(then_reason_codes),
+                )
+            )
+            reason_codes.extend(then_reason_codes)
+
+            # Queries (on DENY)
+            if effect == "DENY":
+                then_queries = then.get("queries", [])
+                for q in then_queries:
+                    queries.append(q)
+
+            # Obligations (on ALLOW/DENY?)
+            for o in then.get("obligations", []):
+                obligations.append(o)
+
+    # Defaults
+    if not matched_rules:
+        defaults = policy.get("defaults", {})
+        default_verdict = defaults.get("default_verdict", "ESCALATE")
+        if default_verdict == "TRUST":
+            default_verdict = "ALLOW"
+        if default_verdict == "QUERY":
+            default_verdict = "DENY"
+
+        default_reason = defaults.get("default_reason_code", "NO_MATCH_DEFAULT_ESCALATE")
+
+        matched_rules.append(
+            MatchedRuleV1(
+                rule_id="DEFAULT",
+                stage="DEFAULT",
+                effect=default_verdict,
+                reason_codes=[default_reason],
+            )
+        )
+        reason_codes.append(default_reason)
+
+    final_verdict = max(matched_rules, key=lambda r: VERDICT_PRECEDENCE_V1.get(r.effect, -1)).effect
+
+    if final_verdict != "DENY":
+        queries = []  # Only return queries if DENY? Or if verdict requires info? V0 is QUERY only.
+
+    return EvaluationResultV1(
+        verdict=final_verdict,
+        reason_codes=reason_codes,
+        matched_rules=matched_rules,
+        queries=queries,
+        obligations=obligations,
+    )
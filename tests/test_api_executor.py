@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from lumyn.api.executor import DecisionExecutor, DecisionExecutorSaturated
+from lumyn.api.routes_v0 import ApiV0Deps, build_routes_v0
+from lumyn.core.decide import LumynConfig
+from lumyn.store.sqlite import SqliteStore
+
+
+def test_executor_runs_off_loop_and_rejects_when_full() -> None:
+    executor = DecisionExecutor(workers=1, max_pending=1)
+    release = threading.Event()
+    loop_thread = threading.get_ident()
+
+    def _blocking() -> int:
+        release.wait(timeout=5)
+        return threading.get_ident()
+
+    async def _scenario() -> None:
+        first = asyncio.ensure_future(executor.run(_blocking))
+        await asyncio.sleep(0.05)
+        stats = executor.stats()
+        assert stats["running"] == 1
+        assert stats["queue_depth"] == 0
+
+        with pytest.raises(DecisionExecutorSaturated):
+            await executor.run(_blocking)
+
+        release.set()
+        assert await first != loop_thread
+
+    asyncio.run(_scenario())
+    stats = executor.stats()
+    assert stats["completed_total"] == 1
+    assert stats["rejected_total"] == 1
+    executor.shutdown()
+
+
+def test_decide_returns_503_when_decision_queue_is_full(tmp_path: Path) -> None:
+    release = threading.Event()
+
+    class SlowEngine:
+        def decide(self, payload: dict[str, Any]) -> dict[str, Any]:
+            release.wait(timeout=5)
+            return {"verdict": "ALLOW"}
+
+    cfg = LumynConfig(store_path=tmp_path / "lumyn.db")
+    executor = DecisionExecutor(workers=1, max_pending=1)
+    deps = ApiV0Deps(
+        config=cfg,
+        store=SqliteStore(cfg.store_path),
+        engine=SlowEngine(),  # type: ignore[arg-type]
+        executor=executor,
+    )
+    app = FastAPI()
+    app.include_router(build_routes_v0(deps=deps))
+    client = TestClient(app)
+
+    responses: list[int] = []
+    slow = threading.Thread(
+        target=lambda: responses.append(client.post("/v0/decide", json={}).status_code)
+    )
+    slow.start()
+    try:
+        for _ in range(100):
+            if executor.stats()["running"] == 1:
+                break
+            time.sleep(0.01)
+        resp = client.post("/v0/decide", json={})
+        assert resp.status_code == 503
+        assert resp.json()["detail"] == {"reason_code": "DECISION_QUEUE_FULL"}
+        assert resp.headers["Retry-After"] == "1"
+    finally:
+        release.set()
+        slow.join()
+    assert responses == [200]
+    executor.shutdown()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import hashlib
 import hmac
 import json
+from dataclasses import replace
 from pathlib import Path
 
 from fastapi.testclient import TestClient
@@ -127,6 +128,28 @@ def test_api_policy_endpoint(tmp_path: Path) -> None:
     assert payload["policy_hash"].startswith("sha256:")
 
 
+def test_api_policy_endpoint_hot_reloads_policy_file(tmp_path: Path) -> None:
+    import os
+
+    policy_path = tmp_path / "policy.yml"
+    source = Path("policies/lumyn-support.v0.yml").read_text(encoding="utf-8")
+    policy_path.write_text(source, encoding="utf-8")
+    settings = _settings(store_path=tmp_path / "lumyn.db")
+    settings = replace(settings, lumyn=replace(settings.lumyn, policy_path=policy_path))
+    client = TestClient(create_app(settings=settings))
+    before = client.get("/v0/policy").json()
+
+    policy_path.write_text(
+        source.replace('policy_version: "0.1.0"', 'policy_version: "0.2.0"'), encoding="utf-8"
+    )
+    st = policy_path.stat()
+    os.utime(policy_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    after = client.get("/v0/policy").json()
+    assert after["policy_version"] == "0.2.0"
+    assert after["policy_hash"] != before["policy_hash"]
+
+
 def test_api_v1_policy_endpoint(tmp_path: Path) -> None:
     store_path = tmp_path / "lumyn.db"
     app = create_app(settings=_settings(store_path=store_path))
@@ -211,3 +234,15 @@ def test_api_v1_decide_requires_signature_when_configured(tmp_path: Path) -> Non
         headers={"content-type": "application/json", "X-Lumyn-Signature": sig},
     )
     assert ok.status_code == 200, ok.text
+
+
+def test_api_startup_warms_engine(tmp_path: Path) -> None:
+    store_path = tmp_path / "lumyn.db"
+    app = create_app(settings=_settings(store_path=store_path))
+
+    with TestClient(app) as client:
+        assert client.get("/healthz").status_code == 200
+        # Warmup bootstraps the schema and snapshots the policy before any decision.
+        stats = SqliteStore(store_path).get_stats()
+        assert stats.policy_snapshots == 1
+        assert stats.decisions == 0
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lumyn.engine.batch import evaluate_policy_batch
+from lumyn.engine.evaluator import evaluate_policy
+from lumyn.policy.loader import load_policy
+
+V0_POLICIES = [
+    "policies/lumyn-support.v0.yml",
+    "policies/packs/lumyn-account.v0.yml",
+    "policies/packs/lumyn-billing.v0.yml",
+]
+
+
+def _requests(seed: int, n: int) -> list[dict[str, Any]]:
+    bases = [
+        json.loads(p.read_text(encoding="utf-8"))["request"]
+        for p in sorted(Path("vectors/v0").rglob("*.json"))
+    ]
+    rng = random.Random(seed)
+    evidence_choices: dict[str, list[Any]] = {
+        "chargeback_risk": [0.1, 0.5, 0.95, "high", None, True],
+        "previous_refund_count_90d": [0, 3, 10, 2.0, 2**60],
+        "customer_age_days": [1, 30, 365, -1],
+        "payment_instrument_risk": ["low", "high", "medium", ["high"], None],
+        "account_takeover_risk": [0.0, 0.9, 1],
+        "manual_approval": [True, False, 1, "yes"],
+        "fx_rate_to_usd": [1.1, None, "x"],
+        "ticket_id": ["T-1", "", None],
+        "order_id": ["O-1", None],
+        "customer_id": ["C-1", ""],
+        "failure_similarity_score": [0.0, 0.4, 0.9],
+    }
+    out = []
+    for _ in range(n):
+        base = rng.choice(bases)
+        evidence = dict(base.get("evidence") or {})
+        for key, choices in evidence_choices.items():
+            roll = rng.random()
+            if roll < 0.3:
+                evidence[key] = rng.choice(choices)
+            elif roll < 0.4:
+                evidence.pop(key, None)
+        amount = {
+            "value": rng.choice([0, 10, 49.99, 50, 200, 200.01, 1500, 10_000]),
+            "currency": rng.choice(["USD", "USD", "EUR", "GBP"]),
+        }
+        out.append({**base, "action": {**base["action"], "amount": amount}, "evidence": evidence})
+    return out
+
+
+@pytest.mark.parametrize("policy_path", V0_POLICIES)
+def test_batch_matches_evaluate_policy_row_by_row(policy_path: str) -> None:
+    loaded = load_policy(policy_path)
+    policy = dict(loaded.policy)
+    requests = _requests(seed=len(policy_path), n=400)
+
+    batch = evaluate_policy_batch(requests, policy=policy, policy_hash=loaded.policy_hash)
+    assert len(batch) == len(requests)
+    for i, request in enumerate(requests):
+        expected = evaluate_policy(request, policy=policy)
+        assert batch.verdicts[i] == expected.verdict
+        assert batch.result(i) == expected
+
+
+def test_batch_falls_back_for_lazily_failing_conditions() -> None:
+    policy: dict[str, Any] = {
+        "rules": [
+            {
+                "id": "R1",
+                "stage": "ESCALATIONS",
+                "when": {"action_type": "never.seen"},
+                "if": {"unknown_key": 1},
+                "then": {"verdict": "ESCALATE", "reason_codes": ["X"]},
+            },
+            {
+                "id": "R2",
+                "stage": "TRUST_PATHS",
+                "if": {"amount_usd_lt": 100},
+                "then": {"verdict": "TRUST", "reason_codes": ["OK"]},
+            },
+        ]
+    }
+    requests = _requests(seed=1, n=20)
+    batch = evaluate_policy_batch(requests, policy=policy)
+    assert batch.results() == [evaluate_policy(r, policy=policy) for r in requests]
+
+
+def test_batch_of_nothing() -> None:
+    loaded = load_policy(V0_POLICIES[0])
+    assert len(evaluate_policy_batch([], policy=dict(loaded.policy))) == 0
@@ -42,3 +42,64 @@ def test_config_env_overrides_file(tmp_path: Path) -> None:
 def test_config_validates_mode() -> None:
     with pytest.raises(ValueError):
         load_settings(env={"LUMYN_MODE": "bad"})
+
+
+def test_config_validates_persistence() -> None:
+    assert load_settings(env={}).lumyn.persistence == "sync"
+    assert load_settings(env={"LUMYN_PERSISTENCE": "enqueue"}).lumyn.persistence == "enqueue"
+    with pytest.raises(ValueError):
+        load_settings(env={"LUMYN_PERSISTENCE": "bad"})
+
+
+def test_config_decide_executor_settings() -> None:
+    settings = load_settings(env={"LUMYN_DECIDE_WORKERS": "2", "LUMYN_DECIDE_MAX_PENDING": "9"})
+    assert settings.service.decide_workers == 2
+    assert settings.service.decide_max_pending == 9
+    with pytest.raises(ValueError):
+        load_settings(env={"LUMYN_DECIDE_WORKERS": "0"})
+
+
+def test_config_evaluation_memo_settings() -> None:
+    assert load_settings(env={}).lumyn.evaluation_memo_size == 0
+    settings = load_settings(
+        env={"LUMYN_EVALUATION_MEMO_SIZE": "128", "LUMYN_EVALUATION_MEMO_TTL_SECONDS": "5"}
+    )
+    assert settings.lumyn.evaluation_memo_size == 128
+    assert settings.lumyn.evaluation_memo_ttl_seconds == 5.0
+    with pytest.raises(ValueError):
+        load_settings(env={"LUMYN_EVALUATION_MEMO_SIZE": "-1"})
+    with pytest.raises(ValueError):
+        load_settings(env={"LUMYN_EVALUATION_MEMO_TTL_SECONDS": "0"})
+
+
+def test_config_memory_refresh_interval_setting() -> None:
+    assert load_settings(env={}).lumyn.memory_refresh_interval_s == 1.0
+    settings = load_settings(env={"LUMYN_MEMORY_REFRESH_INTERVAL_S": "0"})
+    assert settings.lumyn.memory_refresh_interval_s == 0.0
+    with pytest.raises(ValueError):
+        load_settings(env={"LUMYN_MEMORY_REFRESH_INTERVAL_S": "-1"})
+
+
+@pytest.mark.parametrize(
+    ("key", "value", "message"),
+    [
+        ("LUMYN_EVALUATION_MEMO_SIZE", "many", "must be an integer"),
+        ("LUMYN_EVALUATION_MEMO_TTL_SECONDS", "soon", "must be a number"),
+        ("LUMYN_EVALUATION_MEMO_TTL_SECONDS", "-1", "must be > 0"),
+        ("LUMYN_MEMORY_REFRESH_INTERVAL_S", "often", "must be a number"),
+        ("LUMYN_MEMORY_REFRESH_INTERVAL_S", "-0.5", "must be >= 0"),
+    ],
+)
+def test_config_numeric_settings_report_consistent_errors(
+    key: str, value: str, message: str
+) -> None:
+    with pytest.raises(ValueError, match=f"{key} {message}"):
+        load_settings(env={key: value})
+
+
+def test_config_evaluation_mode_setting() -> None:
+    assert load_settings(env={}).lumyn.evaluation_mode == "full"
+    settings = load_settings(env={"LUMYN_EVALUATION_MODE": "Verdict_Only"})
+    assert settings.lumyn.evaluation_mode == "verdict_only"
+    with pytest.raises(ValueError):
+        load_settings(env={"LUMYN_EVALUATION_MODE": "fast"})
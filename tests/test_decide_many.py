@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lumyn import DecisionEngine, LumynConfig, decide, decide_many
+from lumyn.memory.types import Experience, MemoryHit
+from lumyn.store.sqlite import SqliteStore
+
+
+def _request_v0(i: int, *, request_id: str | None = None) -> dict[str, Any]:
+    request: dict[str, Any] = {
+        "schema_version": "decision_request.v0",
+        "subject": {"type": "service", "id": "support-agent", "tenant_id": "acme"},
+        "action": {
+            "type": "support.refund",
+            "intent": f"Refund order {i}",
+            "amount": {"value": 10.0 + 100 * i, "currency": "USD"},
+        },
+        "evidence": {
+            "ticket_id": f"ZD-{i}",
+            "order_id": f"O-{i}",
+            "customer_id": "C-9",
+            "customer_age_days": 180,
+            "previous_refund_count_90d": 0,
+            "chargeback_risk": 0.05,
+            "payment_instrument_risk": "low",
+        },
+        "context": {"mode": "digest_only", "digest": "sha256:" + f"{i:064x}"},
+    }
+    if request_id is not None:
+        request["request_id"] = request_id
+    return request
+
+
+def test_decide_many_matches_sequential_decide(tmp_path: Path) -> None:
+    requests = [_request_v0(i) for i in range(4)]
+
+    batch_cfg = LumynConfig(
+        policy_path="policies/lumyn-support.v0.yml", store_path=tmp_path / "batch.db"
+    )
+    seq_cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=tmp_path / "s.db")
+
+    batch = decide_many(requests, config=batch_cfg)
+    sequential = [decide(r, config=seq_cfg) for r in requests]
+
+    assert [r["verdict"] for r in batch] == [r["verdict"] for r in sequential]
+    assert [r["reason_codes"] for r in batch] == [r["reason_codes"] for r in sequential]
+    assert [r["determinism"]["inputs_digest"] for r in batch] == [
+        r["determinism"]["inputs_digest"] for r in sequential
+    ]
+
+    store = SqliteStore(batch_cfg.store_path)
+    assert store.get_stats().decisions == 4
+    for record in batch:
+        assert store.get_decision_record(record["decision_id"]) == record
+
+
+def test_decide_many_persists_in_one_transaction(tmp_path: Path) -> None:
+    cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=tmp_path / "l.db")
+    store = SqliteStore(cfg.store_path)
+
+    batches: list[int] = []
+    real_put_many = store.put_decision_records
+
+    def _counting_put_many(records: Any) -> None:
+        batches.append(len(records))
+        real_put_many(records)
+
+    store.put_decision_records = _counting_put_many  # type: ignore[method-assign]
+
+    records = DecisionEngine(cfg, store=store).decide_many([_request_v0(i) for i in range(5)])
+    assert len(records) == 5
+    assert batches == [5]
+
+
+def test_decide_many_is_idempotent_with_request_id(tmp_path: Path) -> None:
+    cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=tmp_path / "l.db")
+    engine = DecisionEngine(cfg)
+
+    earlier = engine.decide(_request_v0(0, request_id="req-0"))
+    records = engine.decide_many(
+        [
+            _request_v0(0, request_id="req-0"),
+            _request_v0(1, request_id="req-1"),
+            _request_v0(1, request_id="req-1"),
+        ]
+    )
+
+    assert records[0]["decision_id"] == earlier["decision_id"]
+    assert records[1]["decision_id"] == records[2]["decision_id"]
+    assert engine.store.get_stats().decisions == 2
+
+
+def test_decide_many_abstains_if_storage_unavailable(tmp_path: Path) -> None:
+    cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=tmp_path / "l.db")
+    store = SqliteStore(cfg.store_path)
+    store.init()
+
+    def _boom(_: Any) -> None:
+        raise OSError("disk full")
+
+    store.put_decision_records = _boom  # type: ignore[method-assign]
+
+    records = decide_many([_request_v0(i) for i in range(3)], config=cfg, store=store)
+    assert [r["verdict"] for r in records] == ["ABSTAIN"] * 3
+    assert all("STORAGE_UNAVAILABLE" in r["reason_codes"] for r in records)
+
+
+def test_decide_many_v1_embeds_and_searches_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    decide_mod = importlib.import_module("lumyn.core.decide")
+    calls: dict[str, list[int]] = {"embed_batch": [], "search_many": []}
+
+    class StubProjectionLayer:
+        model_name = "stub/projection"
+
+        def embed_batch(self, requests: Any) -> list[list[float]]:
+            calls["embed_batch"].append(len(requests))
+            return [[float(i)] for i in range(len(requests))]
+
+    class StubMemoryStore:
+        def __init__(self, db_path: Any) -> None:
+            pass
+
+        def search_many(self, query_vectors: Any, limit: int = 5) -> list[list[MemoryHit]]:
+            calls["search_many"].append(len(query_vectors))
+            exp = Experience(decision_id="dec_001", vector=[0.0], outcome=-1)
+            return [[MemoryHit(experience=exp, score=0.5)] for _ in query_vectors]
+
+    monkeypatch.setattr(decide_mod, "ProjectionLayer", StubProjectionLayer)
+    monkeypatch.setattr(
+        decide_mod, "get_memory_store", lambda db_path, **_: StubMemoryStore(db_path)
+    )
+
+    cfg = LumynConfig(
+        policy_path="policies/starter.v1.yml",
+        store_path=tmp_path / "l.db",
+        memory_path=tmp_path / "memory",
+    )
+    requests = []
+    for i in range(3):
+        request = _request_v0(i)
+        request["schema_version"] = "decision_request.v1"
+        requests.append(request)
+
+    records = decide_many(requests, config=cfg)
+
+    assert calls == {"embed_batch": [3], "search_many": [3]}
+    assert [r["schema_version"] for r in records] == ["decision_record.v1"] * 3
+    for record in records:
+        assert record["risk_signals"]["failure_similarity"]["score"] == 0.5
+        assert record["determinism"]["memory"]["projection"]["model"] == "stub/projection"
@@ -39,3 +39,38 @@ def test_decide_redacts_inline_before_persistence(tmp_path: Path) -> None:
     stored = store.get_decision_record(record["decision_id"])
     assert stored is not None
     assert stored["request"]["context"]["inline"] == {}
+
+
+def test_decide_leaves_caller_request_untouched(tmp_path: Path) -> None:
+    import copy
+
+    cfg = LumynConfig(
+        policy_path="policies/lumyn-support.v0.yml",
+        store_path=tmp_path / "lumyn.db",
+        mode="advisory",
+    )
+    transcript = [{"role": "user", "text": "hello"}]
+    request = {
+        "schema_version": "decision_request.v0",
+        "subject": {"type": "service", "id": "support-agent", "tenant_id": "acme"},
+        "action": {"type": "support.update_ticket", "intent": "Update ticket"},
+        "evidence": {"ticket_id": "ZD-1", "history": transcript},
+        "policy": {},
+        "context": {
+            "mode": "inline",
+            "digest": "sha256:cccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccccc",
+            "inline": {"prompt": "secret", "keep": "x"},
+            "redaction": {"profile": "default"},
+        },
+    }
+    original = copy.deepcopy(request)
+
+    record = decide(request, config=cfg)
+
+    assert request == original
+    persisted = record["request"]
+    assert persisted["policy"] == {"mode": "advisory"}
+    assert "failure_similarity_score" in persisted["evidence"]
+    assert persisted["context"]["inline"] == {"keep": "x"}
+    # Unchanged subtrees are shared rather than copied.
+    assert persisted["evidence"]["history"] is transcript
@@ -98,7 +98,9 @@ def test_decide_v1_emits_memory_snapshot_digest(clean_store, tmp_path, monkeypat
             return [MemoryHit(experience=exp, score=0.95)]
 
     monkeypatch.setattr(decide_mod, "ProjectionLayer", StubProjectionLayer)
-    monkeypatch.setattr(decide_mod, "MemoryStore", StubMemoryStore)
+    monkeypatch.setattr(
+        decide_mod, "get_memory_store", lambda db_path, **_: StubMemoryStore(db_path)
+    )
 
     config = LumynConfig(
         store_path=clean_store,
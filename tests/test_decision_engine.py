@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lumyn import DecisionEngine, LumynConfig
+from lumyn.engine.similarity import LshConfig
+from lumyn.store.sqlite import SqliteStore
+
+
+def _request(digest_char: str) -> dict[str, Any]:
+    return {
+        "schema_version": "decision_request.v0",
+        "subject": {"type": "service", "id": "support-agent", "tenant_id": "acme"},
+        "action": {"type": "support.update_ticket", "intent": "Update ticket"},
+        "evidence": {"ticket_id": "ZD-4002"},
+        "context": {"mode": "digest_only", "digest": "sha256:" + (digest_char * 64)},
+    }
+
+
+def test_engine_loads_policy_and_inits_store_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    loader_mod = importlib.import_module("lumyn.policy.loader")
+    cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=tmp_path / "l.db")
+
+    load_calls: list[object] = []
+    real_load_policy_text = loader_mod._load_policy_text
+
+    def _counting_load_policy_text(policy_text: str, **kwargs: Any) -> Any:
+        load_calls.append(kwargs["path"])
+        return real_load_policy_text(policy_text, **kwargs)
+
+    monkeypatch.setattr(loader_mod, "_load_policy_text", _counting_load_policy_text)
+
+    store = SqliteStore(cfg.store_path)
+    init_calls: list[None] = []
+    real_init = store.init
+
+    def _counting_init() -> None:
+        init_calls.append(None)
+        real_init()
+
+    store.init = _counting_init  # type: ignore[method-assign]
+
+    engine = DecisionEngine(cfg, store=store)
+    records = [engine.decide(_request(c)) for c in "abc"]
+
+    assert len(load_calls) == 1
+    assert len(init_calls) == 1
+    assert len({r["decision_id"] for r in records}) == 3
+    assert store.get_stats().decisions == 3
+
+
+def test_engine_matches_function_wrapper(tmp_path: Path) -> None:
+    from lumyn import decide
+
+    cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=tmp_path / "l.db")
+    engine = DecisionEngine(cfg)
+
+    via_engine = engine.decide(_request("d"))
+    via_function = decide(_request("d"), config=cfg)
+
+    for key in ("verdict", "reason_codes", "matched_rules", "policy"):
+        assert via_engine[key] == via_function[key]
+    digests = {r["determinism"]["inputs_digest"] for r in (via_engine, via_function)}
+    assert len(digests) == 1
+
+
+def test_engine_skips_known_policy_snapshots(tmp_path: Path) -> None:
+    cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=tmp_path / "l.db")
+
+    def _counting_store() -> tuple[SqliteStore, list[str]]:
+        store = SqliteStore(cfg.store_path)
+        writes: list[str] = []
+        real_put_snapshot = store.put_policy_snapshot
+
+        def _counting_put_snapshot(**kwargs: Any) -> None:
+            writes.append(kwargs["policy_hash"])
+            real_put_snapshot(**kwargs)
+
+        store.put_policy_snapshot = _counting_put_snapshot  # type: ignore[method-assign]
+        return store, writes
+
+    store, writes = _counting_store()
+    engine = DecisionEngine(cfg, store=store)
+    engine.decide(_request("a"))
+    engine.decide(_request("b"))
+    assert writes == [engine.loaded_policy.policy_hash]
+
+    # A fresh process rebuilds the known hashes from policy_snapshots at startup.
+    store, writes = _counting_store()
+    DecisionEngine(cfg, store=store).decide(_request("c"))
+    assert writes == []
+    assert store.get_stats().policy_snapshots == 1
+
+
+def test_engine_approximate_memory_similarity(tmp_path: Path) -> None:
+    request = {
+        **_request("e"),
+        "action": {"type": "support.update_ticket", "intent": "Update ticket", "tags": ["vip"]},
+    }
+    store = SqliteStore(tmp_path / "l.db", lsh=LshConfig())
+    store.init()
+    store.add_memory_item(
+        tenant_id="acme",
+        label="failure",
+        action_type="support.update_ticket",
+        feature={
+            "action_type": "support.update_ticket",
+            "amount_currency": None,
+            "amount_usd_bucket": None,
+            "tags": ["vip"],
+        },
+        summary="same request failed before",
+        source_decision_id=None,
+    )
+    base = {"policy_path": "policies/lumyn-support.v0.yml", "store_path": tmp_path / "l.db"}
+
+    exact = DecisionEngine(LumynConfig(**base), store=store).decide(request)
+    approximate = DecisionEngine(LumynConfig(**base, memory_similarity="lsh"), store=store).decide(
+        {**request, "request_id": "lsh"}
+    )
+    for record in (exact, approximate):
+        assert record["risk_signals"]["failure_similarity"]["score"] == 1.0
+
+    with pytest.raises(ValueError, match="memory_similarity"):
+        DecisionEngine(LumynConfig(**base, memory_similarity="fuzzy"))
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from lumyn.core.decide import DecisionEngine, LumynConfig
+from lumyn.engine.compiler import cached_compile_policy
+from lumyn.engine.evaluator import evaluate_policy
+from lumyn.engine.evaluator_v1 import evaluate_policy_v1
+from lumyn.engine.memo import EvaluationMemo
+from lumyn.policy.loader import load_policy
+
+
+def _request(request_id: str, *, amount: float = 25.0, **evidence: Any) -> dict[str, Any]:
+    return {
+        "schema_version": "decision_request.v0",
+        "request_id": request_id,
+        "subject": {"type": "agent", "id": "agent-1", "tenant_id": "acme"},
+        "action": {
+            "type": "support.refund",
+            "intent": "Refund",
+            "amount": {"value": amount, "currency": "USD"},
+        },
+        "evidence": {"ticket_id": "ZD-1", "order_id": "O-1", "customer_id": "C-1", **evidence},
+        "context": {"mode": "digest_only", "digest": "sha256:" + request_id[-1] * 64},
+    }
+
+
+def test_memo_hits_on_near_duplicates_and_returns_fresh_results() -> None:
+    loaded = load_policy("policies/lumyn-support.v0.yml")
+    policy = dict(loaded.policy)
+    memo = EvaluationMemo(max_entries=8)
+
+    first = evaluate_policy(
+        _request("r1"), policy=policy, policy_hash=loaded.policy_hash, memo=memo
+    )
+    second = evaluate_policy(
+        _request("r2", unrelated_note="ignored"),
+        policy=policy,
+        policy_hash=loaded.policy_hash,
+        memo=memo,
+    )
+    assert second == first
+    assert second.reason_codes is not first.reason_codes
+    assert memo.stats()["hits"] == 1
+    assert memo.stats()["misses"] == 1
+
+    # Inputs the policy reads change the key.
+    evaluate_policy(
+        _request("r3", amount=5000.0), policy=policy, policy_hash=loaded.policy_hash, memo=memo
+    )
+    evaluate_policy(
+        _request("r4", chargeback_risk=0.99),
+        policy=policy,
+        policy_hash=loaded.policy_hash,
+        memo=memo,
+    )
+    assert memo.stats()["misses"] == 3
+
+    # Without a policy hash the memo is bypassed.
+    evaluate_policy(_request("r5"), policy=policy, memo=memo)
+    assert memo.stats()["hits"] == 1
+
+
+def test_memo_distinguishes_missing_and_null_evidence() -> None:
+    loaded = load_policy("policies/lumyn-support.v0.yml")
+    memo = EvaluationMemo()
+    present = _request("r1")
+    missing = _request("r2")
+    del missing["evidence"]["order_id"]
+    a = evaluate_policy(present, policy=loaded.policy, policy_hash=loaded.policy_hash, memo=memo)
+    b = evaluate_policy(missing, policy=loaded.policy, policy_hash=loaded.policy_hash, memo=memo)
+    assert memo.stats()["hits"] == 0
+    assert a.verdict != b.verdict
+
+
+def test_memo_expires_entries_and_keys_by_policy_hash() -> None:
+    now = [0.0]
+    memo = EvaluationMemo(ttl_seconds=10.0, clock=lambda: now[0])
+    loaded = load_policy("policies/lumyn-support.v0.yml")
+
+    evaluate_policy(_request("r1"), policy=loaded.policy, policy_hash=loaded.policy_hash, memo=memo)
+    evaluate_policy(_request("r2"), policy=loaded.policy, policy_hash="sha256:other", memo=memo)
+    assert memo.stats()["hits"] == 0
+
+    now[0] = 11.0
+    evaluate_policy(_request("r3"), policy=loaded.policy, policy_hash=loaded.policy_hash, memo=memo)
+    assert memo.stats() | {"size": 0} == {
+        "size": 0,
+        "max_entries": 4096,
+        "hits": 0,
+        "misses": 3,
+        "bypassed": 0,
+    }
+
+
+def test_memo_reads_are_derived_from_the_compiled_policy() -> None:
+    loaded = load_policy("policies/lumyn-support.v0.yml")
+    compiled = cached_compile_policy(loaded.policy, policy_hash=loaded.policy_hash)
+    assert compiled.reads is not None
+    assert "amount_usd" in compiled.reads
+    assert "evidence.ticket_id" in compiled.reads
+    assert "evidence.unrelated_note" not in compiled.reads
+
+
+def test_memo_v1() -> None:
+    loaded = load_policy("policies/starter.v1.yml")
+    memo = EvaluationMemo()
+    request = {
+        "schema_version": "decision_request.v1",
+        "action": {"type": "support.refund", "amount": {"value": 10, "currency": "USD"}},
+        "evidence": {"ticket_id": "T", "order_id": "O", "customer_id": "C"},
+    }
+    a = evaluate_policy_v1(request, policy=loaded.policy, policy_hash=loaded.policy_hash, memo=memo)
+    b = evaluate_policy_v1(request, policy=loaded.policy, policy_hash=loaded.policy_hash, memo=memo)
+    assert a == b
+    assert memo.stats()["hits"] == 1
+
+
+def test_engine_memo_is_off_by_default(tmp_path: Path) -> None:
+    assert DecisionEngine(LumynConfig(store_path=tmp_path / "a.db")).evaluation_memo is None
+
+    engine = DecisionEngine(
+        LumynConfig(store_path=tmp_path / "b.db", evaluation_memo_size=16, memory_enabled=False)
+    )
+    try:
+        first = engine.decide(_request("01JAAAAAAAAAAAAAAAAAAAAAA1"))
+        second = engine.decide(_request("01JAAAAAAAAAAAAAAAAAAAAAA2"))
+    finally:
+        engine.close()
+    assert first["verdict"] == second["verdict"]
+    assert first["reason_codes"] == second["reason_codes"]
+    assert engine.evaluation_memo is not None
+    assert engine.evaluation_memo.stats()["hits"] == 1
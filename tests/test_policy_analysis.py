@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Any
+
+import pytest
+from policy_interpreters import interpret_policy
+
+from lumyn.cli.commands.policy import analyze
+from lumyn.engine.compiler import compile_policy, compile_policy_v1
+from lumyn.engine.evaluator import evaluate_policy
+from lumyn.engine.evaluator_v1 import evaluate_policy_v1
+from lumyn.policy.validate import analyze_policy, find_unreachable_rules
+from lumyn.schemas.loaders import load_json_schema
+
+
+def _rule(rule_id: str, stage: str, verdict: str, **extra: Any) -> dict[str, Any]:
+    then = {"verdict": verdict, "reason_codes": [rule_id]}
+    return {"id": rule_id, "stage": stage, "then": then, **extra}
+
+
+def test_unreachable_rules_are_pruned_from_the_compiled_program_v0() -> None:
+    policy: dict[str, Any] = {
+        "required_evidence": {"a": ["ticket_id"]},
+        "rules": [
+            _rule("R-CONTRA", "HARD_BLOCKS", "ABSTAIN", **{"if": {"amount_usd_gt": 500}}),
+            _rule("R-MISSING", "REQUIREMENTS", "ABSTAIN", when={"action_type": "b"}),
+            _rule("R-OK", "ESCALATIONS", "ESCALATE", **{"if": {"amount_usd_gte": 100}}),
+            _rule("R-NO-VERDICT", "ESCALATIONS", "MAYBE"),
+            _rule("R-WHEN", "ESCALATIONS", "ESCALATE", when={"action_type_in": []}),
+            _rule("R-STAGE", "ALLOW_PATHS", "TRUST"),
+            _rule(
+                "R-ANY",
+                "TRUST_PATHS",
+                "TRUST",
+                if_all=[{"amount_currency_is": "USD"}],
+                if_any=[{"amount_currency_is": "EUR"}, {"amount_currency_ne": "USD"}],
+            ),
+            _rule("R-RISK", "HARD_BLOCKS", "ABSTAIN", if_all=[{"evidence.chargeback_risk_lt": 1}]),
+        ],
+    }
+    policy["rules"][0]["if"]["amount_usd_lt"] = 100
+    policy["rules"][7]["if_all"].append({"evidence.chargeback_risk_gte": 1})
+
+    findings = find_unreachable_rules(policy)
+    assert {f.rule_id: f.kind for f in findings} == {
+        "R-CONTRA": "contradiction",
+        "R-MISSING": "no_required_evidence",
+        "R-NO-VERDICT": "unusable_then",
+        "R-WHEN": "unreachable_when",
+        "R-STAGE": "unknown_stage",
+        "R-ANY": "contradiction",
+        "R-RISK": "contradiction",
+    }
+    assert all(f.pruned for f in findings)
+    assert [r.rule_id for r in compile_policy(policy).rules] == ["R-OK"]
+
+    for value in (0, 50, 100, 500, 1000):
+        for currency in ("USD", "EUR"):
+            request = {
+                "action": {"type": "b", "amount": {"value": value, "currency": currency}},
+                "evidence": {"chargeback_risk": value / 1000},
+            }
+            assert evaluate_policy(request, policy=policy) == interpret_policy(
+                request, policy=policy
+            )
+
+
+def test_rules_that_can_raise_are_never_pruned() -> None:
+    policy = {
+        "rules": [
+            _rule(
+                "R-LAZY",
+                "HARD_BLOCKS",
+                "ABSTAIN",
+                **{"if": {"amount_usd_gt": "lots", "amount_usd_lt": 100}},
+            ),
+            _rule("R-UNKNOWN", "HARD_BLOCKS", "ABSTAIN", if_all=[{"bogus": 1}], if_any=[]),
+            # A malformed if_all never matches, but only after its `if` has run.
+            _rule(
+                "R-MALFORMED",
+                "HARD_BLOCKS",
+                "ABSTAIN",
+                if_all="x",
+                **{"if": {"amount_usd_gt": "lots"}},
+            ),
+        ]
+    }
+    assert find_unreachable_rules(policy) == []
+    safe = {"rules": [_rule("R-SAFE", "HARD_BLOCKS", "ABSTAIN", if_all=[{}], if_any="x")]}
+    assert [(f.rule_id, f.kind) for f in find_unreachable_rules(safe)] == [
+        ("R-SAFE", "contradiction")
+    ]
+    request = {"action": {"type": "a", "amount": {"value": 10, "currency": "USD"}}}
+    with pytest.raises(ValueError):
+        evaluate_policy(request, policy=policy)
+
+
+def test_unreachable_rules_are_pruned_v1() -> None:
+    policy: dict[str, Any] = {
+        "schema_version": "policy.v1",
+        "rules": [
+            _rule("R-KEY", "HARD_BLOCKS", "DENY", **{"if": {"action_type": "a.b"}}),
+            _rule(
+                "R-IS",
+                "ESCALATIONS",
+                "ESCALATE",
+                if_all=[{"evidence.tier_is": "gold"}, {"evidence.tier_in": ["silver", "bronze"]}],
+            ),
+            _rule(
+                "R-NUM",
+                "ESCALATIONS",
+                "ESCALATE",
+                **{"if": {"evidence.score_is": "high", "evidence.score_gt": 1}},
+            ),
+            _rule("R-OK", "ALLOW_PATHS", "ALLOW", **{"if": {"evidence.tier_in": ["gold"]}}),
+        ],
+    }
+    assert [f.rule_id for f in find_unreachable_rules(policy)] == ["R-KEY", "R-IS", "R-NUM"]
+    assert [r.rule_id for r in compile_policy_v1(policy).rules] == ["R-OK"]
+    # Without a schema_version the compiler still analyses the policy as v1.
+    unversioned = {"rules": policy["rules"]}
+    assert [r.rule_id for r in compile_policy_v1(unversioned).rules] == ["R-OK"]
+
+    request = {"action": {"type": "a.b"}, "evidence": {"tier": "gold", "score": "high"}}
+    assert evaluate_policy_v1(request, policy=policy).verdict == "ALLOW"
+
+
+def test_shadowed_and_unknown_action_type_rules_are_reported_but_kept() -> None:
+    policy = {
+        "rules": [
+            _rule("R-BIG", "HARD_BLOCKS", "ABSTAIN", **{"if": {"amount_usd_gt": 1000}}),
+            _rule(
+                "R-HUGE",
+                "ESCALATIONS",
+                "ESCALATE",
+                when={"action_type": "support.refund"},
+                **{"if": {"amount_usd_gte": 5000, "amount_currency_is": "USD"}},
+            ),
+            _rule("R-ODD", "ESCALATIONS", "ESCALATE", when={"action_type": "Not A Type"}),
+            _rule("R-SMALL", "TRUST_PATHS", "TRUST", **{"if": {"amount_usd_lt": 10}}),
+        ]
+    }
+    analysis = analyze_policy(
+        policy, request_schema=load_json_schema("schemas/decision_request.v0.schema.json")
+    )
+    assert [(f.rule_id, f.kind, f.pruned) for f in analysis.findings] == [
+        ("R-HUGE", "shadowed", False),
+        ("R-ODD", "unknown_action_type", False),
+    ]
+    assert analysis.findings[0].detail == "shadowed by R-BIG (ABSTAIN)"
+    assert analysis.pruned_rule_ids == []
+    assert len(compile_policy(policy).rules) == 4
+
+
+def test_pruning_preserves_random_policy_results() -> None:
+    rng = random.Random(20)
+    keys = ["amount_usd_gt", "amount_usd_gte", "amount_usd_lt", "amount_usd_lte"]
+    verdicts = ["ABSTAIN", "QUERY", "ESCALATE", "TRUST"]
+    stages = ["REQUIREMENTS", "HARD_BLOCKS", "ESCALATIONS", "TRUST_PATHS"]
+    for _ in range(50):
+        rules = []
+        for i in range(6):
+            expr = {key: rng.choice([0, 100, 250, 500]) for key in rng.sample(keys, 2)}
+            if rng.random() < 0.3:
+                expr["amount_currency_is"] = rng.choice(["USD", "EUR"])
+            rule = _rule(f"R{i}", rng.choice(stages), rng.choice(verdicts), **{"if": expr})
+            if rng.random() < 0.3:
+                rule["if_any"] = [{"amount_currency_ne": "USD"}, {"amount_usd_lt": 50}]
+            rules.append(rule)
+        policy = {"rules": rules}
+        for value in (-1, 0, 50, 100, 150, 250, 400, 500, 900):
+            request = {
+                "action": {
+                    "type": "a",
+                    "amount": {"value": value, "currency": rng.choice(["USD", "EUR"])},
+                },
+                "evidence": {"fx_rate_to_usd": 1.0},
+            }
+            assert evaluate_policy(request, policy=policy) == interpret_policy(
+                request, policy=policy
+            )
+
+
+def test_cli_policy_analyze(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    policy_path = tmp_path / "policy.yml"
+    policy_path.write_text(
+        """schema_version: policy.v1
+policy_id: analyze-policy
+policy_version: 1.0.0
+defaults:
+  mode: enforce
+  default_verdict: ESCALATE
+  default_reason_code: NO_MATCH_DEFAULT_ESCALATE
+rules:
+  - id: R-DEAD
+    stage: HARD_BLOCKS
+    if: { amount_usd_gt: 500, amount_usd_lt: 100 }
+    then:
+      verdict: DENY
+      reason_codes: [REFUND_OVER_ESCALATION_LIMIT]
+  - id: R-LIVE
+    stage: ESCALATIONS
+    if: { amount_usd_gt: 100 }
+    then:
+      verdict: ESCALATE
+      reason_codes: [REFUND_OVER_ESCALATION_LIMIT]
+"""
+    )
+
+    analyze(workspace=tmp_path, path=policy_path)
+
+    out = capsys.readouterr().out
+    assert "policy_id: analyze-policy" in out
+    assert "pruned_rules: 1\n- R-DEAD [contradiction] conditions on amount_usd" in out
+    assert "warnings: 0" in out
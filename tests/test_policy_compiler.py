@@ -0,0 +1,522 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import pytest
+from policy_interpreters import interpret_policy, interpret_policy_v1
+
+from lumyn.engine.compiler import (
+    cached_compile_policy,
+    cached_compile_policy_v1,
+    compile_policy,
+    compile_policy_v1,
+)
+from lumyn.engine.conditions import compile_condition_v1, parse_condition_key_v1
+from lumyn.engine.evaluator import evaluate_policy
+from lumyn.engine.evaluator_v1 import evaluate_policy_v1
+from lumyn.engine.normalize import normalize_request
+from lumyn.engine.normalize_v1 import normalize_request_v1
+from lumyn.policy.loader import load_policy
+
+V0_POLICIES = [
+    "policies/lumyn-support.v0.yml",
+    "policies/packs/lumyn-account.v0.yml",
+    "policies/packs/lumyn-billing.v0.yml",
+]
+
+
+def _vector_requests() -> list[dict[str, Any]]:
+    paths = sorted(Path("vectors/v0").rglob("*.json"))
+    return [json.loads(p.read_text(encoding="utf-8"))["request"] for p in paths]
+
+
+def _variants(request: dict[str, Any]) -> list[dict[str, Any]]:
+    out = [request]
+    for amount in (0, 49.99, 50, 200, 200.01, 1000, 5000.5):
+        out.append(
+            {
+                **request,
+                "action": {**request["action"], "amount": {"value": amount, "currency": "USD"}},
+            }
+        )
+    out.append(
+        {**request, "action": {**request["action"], "amount": {"value": 300, "currency": "EUR"}}}
+    )
+    for evidence in (
+        {},
+        {"chargeback_risk": 0.9, "previous_refund_count_90d": 5, "customer_age_days": 3},
+        {"payment_instrument_risk": "high", "account_takeover_risk": 0.95},
+        {"manual_approval": True, "fx_rate_to_usd": 1.1, "failure_similarity_score": 0.5},
+        {"ticket_id": "", "customer_id": None},
+    ):
+        merged = {**(request.get("evidence") or {}), **evidence}
+        out.append({**request, "evidence": merged})
+    return out
+
+
+@pytest.mark.parametrize("policy_path", V0_POLICIES)
+def test_compiled_policy_matches_interpreter(policy_path: str) -> None:
+    policy = dict(load_policy(policy_path).policy)
+    compiled = compile_policy(policy)
+
+    for base in _vector_requests():
+        for request in _variants(base):
+            expected = interpret_policy(request, policy=policy)
+            assert evaluate_policy(request, policy=policy) == expected
+            assert compiled.evaluate(normalize_request(request)) == expected
+
+
+def test_compiled_policy_keeps_interpreter_quirks() -> None:
+    policy: dict[str, Any] = {
+        "defaults": {"default_verdict": "TRUST", "default_reason_code": "DEFAULT_OK"},
+        "rules": [
+            {"id": "R-BAD-THEN", "stage": "HARD_BLOCKS", "then": "nope"},
+            {
+                "id": "R-IF-ANY-EMPTY",
+                "stage": "HARD_BLOCKS",
+                "if_any": [],
+                "then": {"verdict": "ABSTAIN"},
+            },
+            {
+                "id": "R-NON-DICT-IF",
+                "stage": "ESCALATIONS",
+                "if": ["x"],
+                "then": {
+                    "verdict": "ESCALATE",
+                    "reason_codes": ["X"],
+                    "obligations": [{"type": "notify", "source": {"stage": "CUSTOM"}}],
+                },
+            },
+        ],
+    }
+    request = {"action": {"type": "a"}}
+    result = evaluate_policy(request, policy=policy)
+    # Compiling does not write obligation sources back into the policy.
+    assert policy["rules"][2]["then"]["obligations"][0]["source"] == {"stage": "CUSTOM"}
+    assert result == interpret_policy(request, policy=policy)
+    assert [r.rule_id for r in result.matched_rules] == ["R-NON-DICT-IF"]
+    assert result.obligations == [
+        {"type": "notify", "source": {"stage": "CUSTOM", "rule_id": "R-NON-DICT-IF"}}
+    ]
+
+    bad = {"rules": [{"id": "R", "stage": "HARD_BLOCKS", "if": {"nope": 1}, "then": {}}]}
+    compile_policy(bad)  # unsupported keys only fail when evaluated, like the interpreter
+    with pytest.raises(ValueError, match="unsupported condition key: nope"):
+        evaluate_policy(request, policy=bad)
+
+    # A malformed if_all never matches, but only after the `if` before it has run.
+    malformed = {
+        "rules": [
+            {
+                "id": "R",
+                "stage": "HARD_BLOCKS",
+                "if": {"amount_usd_gt": "lots"},
+                "if_all": "x",
+                "then": {"verdict": "ABSTAIN", "reason_codes": ["R"]},
+            }
+        ]
+    }
+    priced = {"action": {"type": "a", "amount": {"value": 10, "currency": "USD"}}}
+    for policy_under_test in (malformed, bad):
+        with pytest.raises(ValueError):
+            interpret_policy(priced, policy=policy_under_test)
+        with pytest.raises(ValueError):
+            evaluate_policy(priced, policy=policy_under_test)
+    assert evaluate_policy(request, policy=malformed) == interpret_policy(request, policy=malformed)
+
+
+def test_compiled_policy_is_cached_by_hash() -> None:
+    loaded = load_policy("policies/lumyn-support.v0.yml")
+    first = cached_compile_policy(loaded.policy, policy_hash=loaded.policy_hash)
+    again = cached_compile_policy(dict(loaded.policy), policy_hash=loaded.policy_hash)
+    assert again is first
+    assert first.policy_hash == loaded.policy_hash
+    # Without a hash, the policy's content hash is used.
+    assert cached_compile_policy(dict(loaded.policy)) is first
+    unhashable = {"rules": [], "defaults": {"default_verdict": "TRUST", "extra": {1, 2}}}
+    assert cached_compile_policy(unhashable).policy_hash is None
+
+
+def _v1_variants(request: dict[str, Any]) -> list[dict[str, Any]]:
+    out = [request]
+    action = request["action"]
+    for amount, currency in ((10, "USD"), (100, "USD"), (5000, "USD"), (300, "EUR")):
+        out.append(
+            {**request, "action": {**action, "amount": {"value": amount, "currency": currency}}}
+        )
+    for evidence in (
+        {},
+        {"ticket_id": None, "order_id": "O-1", "customer_id": "C-1"},
+        {"chargeback_risk": 0.95, "customer_age_days": 400, "fx_rate_to_usd": 1.1},
+        {"payment_instrument_risk": "high"},
+        {"payment_instrument_risk": ["unhashable"], "chargeback_risk": "0.9"},
+    ):
+        out.append({**request, "evidence": {**(request.get("evidence") or {}), **evidence}})
+    return out
+
+
+def test_compiled_policy_v1_matches_interpreter() -> None:
+    policy = dict(load_policy("policies/starter.v1.yml").policy)
+    compiled = compile_policy_v1(policy)
+    paths = sorted(Path("vectors/v1/evaluation").rglob("*.json"))
+    assert paths
+
+    for path in paths:
+        base = json.loads(path.read_text(encoding="utf-8"))["request"]
+        for request in _v1_variants(base):
+            expected = interpret_policy_v1(request, policy=policy)
+            assert evaluate_policy_v1(request, policy=policy) == expected
+            assert compiled.evaluate(normalize_request_v1(request)) == expected
+
+
+def test_compile_condition_v1_parses_key_once() -> None:
+    assert parse_condition_key_v1("evidence.customer_age_days_gte") == (
+        "evidence.customer_age_days",
+        "gte",
+    )
+    assert parse_condition_key_v1("amount_usd_lte") == ("amount_usd", "lte")
+    assert parse_condition_key_v1("evidence.fx_rate_to_usd_present") is None
+    assert parse_condition_key_v1("action_type") is None
+
+    condition = compile_condition_v1("evidence.chargeback_risk_gte", "0.5")
+    assert condition is not None
+    assert (condition.field, condition.op, condition.expected) == (
+        "evidence.chargeback_risk",
+        "gte",
+        0.5,
+    )
+
+
+def test_compiled_policy_v1_keeps_interpreter_quirks() -> None:
+    policy: dict[str, Any] = {
+        "rules": [
+            {
+                "id": "R1",
+                "stage": "HARD_BLOCKS",
+                "if": {"evidence.score_gt": "high", "evidence.flag_is": True},
+                "then": {"verdict": "DENY", "reason_codes": ["X"]},
+            },
+            {
+                "id": "R2",
+                "stage": "ESCALATIONS",
+                "if_any": [{"evidence.flag": True}, {"evidence.tags_in": "abc"}],
+                "then": {"verdict": "ESCALATE", "reason_codes": ["Y"]},
+            },
+        ]
+    }
+    for evidence in ({}, {"flag": True}, {"score": "n/a", "flag": True}):
+        request = {"action": {"type": "a"}, "evidence": evidence}
+        assert evaluate_policy_v1(request, policy=policy) == interpret_policy_v1(
+            request, policy=policy
+        )
+    # A non-numeric threshold only fails once a numeric value is compared.
+    request = {"action": {"type": "a"}, "evidence": {"score": 3}}
+    with pytest.raises(ValueError):
+        interpret_policy_v1(request, policy=policy)
+    with pytest.raises(ValueError):
+        evaluate_policy_v1(request, policy=policy)
+
+
+def test_compiled_policy_v1_is_cached_by_hash() -> None:
+    loaded = load_policy("policies/starter.v1.yml")
+    first = cached_compile_policy_v1(loaded.policy, policy_hash=loaded.policy_hash)
+    assert cached_compile_policy_v1(loaded.policy, policy_hash=loaded.policy_hash) is first
+
+
+def test_rule_index_keeps_policy_order_per_action_type() -> None:
+    def rule(rule_id: str, stage: str, when: dict[str, Any] | None) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "id": rule_id,
+            "stage": stage,
+            "then": {"verdict": "ESCALATE", "reason_codes": [rule_id]},
+        }
+        if when is not None:
+            out["when"] = when
+        return out
+
+    policy: dict[str, Any] = {
+        "rules": [
+            rule("E1", "ESCALATIONS", {"action_type": "a"}),
+            rule("W1", "ESCALATIONS", None),
+            rule("H1", "HARD_BLOCKS", {"action_type_in": ["a", "b", "a"]}),
+            rule("E2", "ESCALATIONS", {"action_type_in": ["b"]}),
+            rule("W2", "ESCALATIONS", {}),
+            rule("E3", "ESCALATIONS", {"action_type": "a"}),
+            rule("X1", "ESCALATIONS", {"other": "a"}),
+        ]
+    }
+    compiled = compile_policy(policy)
+
+    def ids(stage: str, action_type: str) -> list[str]:
+        return [r.rule_id for r in compiled.index.select(stage, action_type)]
+
+    assert ids("ESCALATIONS", "a") == ["E1", "W1", "W2", "E3"]
+    assert ids("ESCALATIONS", "b") == ["W1", "E2", "W2"]
+    assert ids("ESCALATIONS", "c") == ["W1", "W2"]
+    assert ids("HARD_BLOCKS", "a") == ["H1"]
+    assert ids("REQUIREMENTS", "a") == []
+
+    for action_type in ("a", "b", "c"):
+        request = {"action": {"type": action_type}}
+        result = evaluate_policy(request, policy=policy)
+        assert result == interpret_policy(request, policy=policy)
+
+
+class _CountingEvidence(dict[str, Any]):
+    reads = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        type(self).reads += 1
+        return super().get(key, default)
+
+
+def test_shared_conditions_are_tested_once_per_evaluation() -> None:
+    def rule(rule_id: str, stage: str, **guard: Any) -> dict[str, Any]:
+        return {"id": rule_id, "stage": stage, **guard, "then": {"verdict": "ESCALATE"}}
+
+    risky = {"evidence.chargeback_risk_gte": 0.5}
+    policy: dict[str, Any] = {
+        "rules": [
+            rule("R1", "HARD_BLOCKS", **{"if": {**risky, "amount_usd_gt": 200}}),
+            rule("R2", "ESCALATIONS", if_all=[risky, {"amount_usd_gt": 200}]),
+            rule("R3", "ESCALATIONS", if_any=[{"amount_usd_gt": 200.0}, risky]),
+            rule("R4", "TRUST_PATHS", **{"if": {"evidence.chargeback_risk_gte": "0.5"}}),
+        ]
+    }
+    compiled = compile_policy(policy)
+    # `200` and `200.0` (or `0.5` and `"0.5"`) are different conditions as written, but each
+    # pair is answered by one interval lookup on its field.
+    tests, intervals = compiled.predicates.wildcard
+    assert tests == ()
+    assert [len(i.breakpoints) for i in intervals] == [1, 1]
+
+    for risk in (0.1, 0.9, None):
+        evidence = _CountingEvidence(chargeback_risk=risk)
+        _CountingEvidence.reads = 0
+        request = {"action": {"type": "a", "amount": {"value": 300, "currency": "USD"}}}
+        normalized = replace(normalize_request(request), evidence=evidence)
+        result = compiled.evaluate(normalized)
+        assert _CountingEvidence.reads == 1
+        expected = interpret_policy(
+            {**request, "evidence": {"chargeback_risk": risk}}, policy=policy
+        )
+        assert result == expected
+
+    v1_policy: dict[str, Any] = {
+        "rules": [
+            rule("R1", "HARD_BLOCKS", **{"if": {"evidence.score_gte": 0.5}}),
+            rule(
+                "R2",
+                "ESCALATIONS",
+                if_any=[{"evidence.tier_is": "gold"}, {"evidence.score_gte": 0.5}],
+            ),
+        ]
+    }
+    tests, intervals = compile_policy_v1(v1_policy).predicates.wildcard
+    assert (len(tests), len(intervals)) == (2, 0)
+    for evidence in ({"score": 0.9}, {"score": 0.1, "tier": "gold"}, {}):
+        request = {"action": {"type": "a"}, "evidence": evidence}
+        assert evaluate_policy_v1(request, policy=v1_policy) == interpret_policy_v1(
+            request, policy=v1_policy
+        )
+
+
+def test_predicate_bits_match_interpreter_on_random_policies() -> None:
+    rng = random.Random(17)
+    v0_conditions: list[dict[str, Any]] = [
+        {"amount_usd_gt": 200},
+        {"amount_usd_lte": 50},
+        {"amount_currency_ne": "USD"},
+        {"evidence.chargeback_risk_gte": 0.5},
+        {"evidence.customer_age_days_lt": 30},
+        {"evidence.payment_instrument_risk_in": ["high", "medium"]},
+        {"evidence.manual_approval_is": True},
+        {"evidence.fx_rate_to_usd_present": False},
+    ]
+    v1_conditions: list[dict[str, Any]] = [
+        {"amount_usd_gt": 200},
+        {"amount_currency_is": "EUR"},
+        {"evidence.chargeback_risk_gte": 0.5},
+        {"evidence.customer_age_days_lt": 30},
+        {"evidence.payment_instrument_risk_in": ["high", "medium"]},
+        {"evidence.tier_ne": "gold"},
+    ]
+
+    def expr(conditions: list[dict[str, Any]]) -> dict[str, Any]:
+        out: dict[str, Any] = {}
+        for condition in rng.sample(conditions, rng.randint(1, 2)):
+            out.update(condition)
+        return out
+
+    def random_policy(conditions: list[dict[str, Any]], stages: tuple[str, ...]) -> dict[str, Any]:
+        rules = []
+        for i in range(30):
+            rule: dict[str, Any] = {
+                "id": f"R{i}",
+                "stage": rng.choice(stages),
+                "then": {"verdict": "ESCALATE", "reason_codes": [f"C{i}"]},
+            }
+            if rng.random() < 0.5:
+                rule["when"] = {"action_type": rng.choice(["a", "b"])}
+            for block in rng.sample(["if", "if_all", "if_any"], rng.randint(1, 3)):
+                n = rng.randint(1, 3)
+                rule[block] = (
+                    expr(conditions) if block == "if" else [expr(conditions) for _ in range(n)]
+                )
+            rules.append(rule)
+        return {"rules": rules}
+
+    v0_policy = random_policy(v0_conditions, ("HARD_BLOCKS", "ESCALATIONS", "TRUST_PATHS"))
+    v1_policy = random_policy(v1_conditions, ("HARD_BLOCKS", "ESCALATIONS", "ALLOW_PATHS"))
+    assert all(r.bits is not None for r in compile_policy(v0_policy).rules)
+    assert all(r.bits is not None for r in compile_policy_v1(v1_policy).rules)
+
+    for _ in range(300):
+        request = {
+            "action": {
+                "type": rng.choice(["a", "b", "c"]),
+                "amount": {
+                    "value": rng.choice([10, 100, 500]),
+                    "currency": rng.choice(["USD", "EUR"]),
+                },
+            },
+            "evidence": {
+                "chargeback_risk": rng.choice([0.1, 0.7, None]),
+                "customer_age_days": rng.choice([3, 300]),
+                "payment_instrument_risk": rng.choice(["low", "high"]),
+                "manual_approval": rng.choice([True, False]),
+                "fx_rate_to_usd": rng.choice([1.1, None]),
+                "tier": rng.choice(["gold", "silver"]),
+            },
+        }
+        assert evaluate_policy(request, policy=v0_policy) == interpret_policy(
+            request, policy=v0_policy
+        )
+        assert evaluate_policy_v1(request, policy=v1_policy) == interpret_policy_v1(
+            request, policy=v1_policy
+        )
+
+
+def test_interval_index_matches_interpreter_on_tiered_thresholds() -> None:
+    ops = ("gt", "gte", "lt", "lte")
+    bands = (0, 10, 49.99, 50, 100, 200, 200.5, 1000, 5000)
+    v0_rules: list[dict[str, Any]] = []
+    v1_rules: list[dict[str, Any]] = []
+    for i, (op, band) in enumerate((op, band) for op in ops for band in bands):
+        then = {"verdict": "ESCALATE", "reason_codes": [f"TIER_{i}"]}
+        v0_rules.append(
+            {"id": f"A{i}", "stage": "ESCALATIONS", "if": {f"amount_usd_{op}": band}, "then": then}
+        )
+        v1_rules.append(
+            {"id": f"A{i}", "stage": "ESCALATIONS", "if": {f"amount_usd_{op}": band}, "then": then}
+        )
+        v1_rules.append(
+            {
+                "id": f"S{i}",
+                "stage": "HARD_BLOCKS",
+                "if": {f"evidence.score_{op}": band / 100},
+                "then": then,
+            }
+        )
+    for i, op in enumerate(("gte", "lt")):
+        for count in (1, 3, "5"):
+            v0_rules.append(
+                {
+                    "id": f"C{i}{count}",
+                    "stage": "HARD_BLOCKS",
+                    "if": {f"evidence.previous_refund_count_90d_{op}": count},
+                    "then": {"verdict": "QUERY", "reason_codes": ["COUNT"]},
+                }
+            )
+    v0_policy: dict[str, Any] = {"rules": v0_rules}
+    v1_policy: dict[str, Any] = {"rules": v1_rules}
+
+    tests, intervals = compile_policy(v0_policy).predicates.wildcard
+    assert tests == ()
+    assert sorted(len(i.breakpoints) for i in intervals) == [3, len(bands)]
+    tests, intervals = compile_policy_v1(v1_policy).predicates.wildcard
+    assert tests == () and len(intervals) == 2
+
+    values: list[Any] = [None, "100", True, False, math.nan, math.inf, -math.inf, 2**64, -1]
+    for band in bands:
+        values.extend([band, band - 0.001, band + 0.001])
+    for value in values:
+        for count in (0, 1, 2, 3, 4, 5, 6, 2.5, True, None):
+            v0_request = {
+                "action": {"type": "a", "amount": {"value": value, "currency": "USD"}},
+                "evidence": {"previous_refund_count_90d": count},
+            }
+            assert evaluate_policy(v0_request, policy=v0_policy) == interpret_policy(
+                v0_request, policy=v0_policy
+            )
+        v1_request = {
+            "action": {"type": "a", "amount": {"value": value, "currency": "USD"}},
+            "evidence": {"score": value if not isinstance(value, int | float) else value / 100},
+        }
+        assert evaluate_policy_v1(v1_request, policy=v1_policy) == interpret_policy_v1(
+            v1_request, policy=v1_policy
+        )
+
+
+def test_thresholds_that_overflow_fail_only_when_compared() -> None:
+    from lumyn.policy.validate import analyze_policy
+
+    then = {"verdict": "ABSTAIN", "reason_codes": ["X"]}
+    v0_policy: dict[str, Any] = {
+        "rules": [
+            {
+                "id": "R-INF",
+                "stage": "HARD_BLOCKS",
+                "when": {"action_type": "b"},
+                "if": {"evidence.customer_age_days_lt": math.inf},
+                "then": then,
+            },
+            {
+                "id": "R-INF-ALL",
+                "stage": "HARD_BLOCKS",
+                "if_all": [{"evidence.previous_refund_count_90d_gte": -math.inf}],
+                "then": then,
+            },
+        ]
+    }
+    v1_policy: dict[str, Any] = {
+        "rules": [
+            {
+                "id": "R-HUGE",
+                "stage": "HARD_BLOCKS",
+                "if": {"evidence.score_gt": 10**400},
+                "then": then,
+            }
+        ]
+    }
+    compile_policy(v0_policy)
+    compile_policy_v1(v1_policy)
+    analyze_policy(v0_policy)
+
+    def outcome(fn: Any, request: dict[str, Any], policy: dict[str, Any]) -> Any:
+        try:
+            return fn(request, policy=policy)
+        except OverflowError:
+            return OverflowError
+
+    for action_type in ("a", "b"):
+        for evidence in (
+            {},
+            {"customer_age_days": 3},
+            {"previous_refund_count_90d": 2},
+            {"score": 1},
+        ):
+            request = {"action": {"type": action_type}, "evidence": evidence}
+            assert outcome(evaluate_policy, request, v0_policy) == outcome(
+                interpret_policy, request, v0_policy
+            )
+            assert outcome(evaluate_policy_v1, request, v1_policy) == outcome(
+                interpret_policy_v1, request, v1_policy
+            )
+    request = {"action": {"type": "a"}, "evidence": {}}
+    assert evaluate_policy(request, policy=v0_policy).verdict == "ESCALATE"
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import logging
+import os
 import textwrap
 from pathlib import Path
 
@@ -7,7 +9,7 @@ import pytest
 import yaml
 
 from lumyn.policy.errors import PolicyError
-from lumyn.policy.loader import compute_policy_hash, load_policy
+from lumyn.policy.loader import PolicyCache, compute_policy_hash, load_policy
 from lumyn.policy.validate import validate_policy_or_raise
 
 
@@ -39,3 +41,62 @@ def test_policy_validation_rejects_unknown_reason_code() -> None:
             policy_schema_path=Path("schemas/policy.v0.schema.json"),
             reason_codes_path=Path("schemas/reason_codes.v0.json"),
         )
+
+
+def test_policy_cache_reloads_only_on_content_change(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    source = Path("policies/lumyn-support.v0.yml").read_text(encoding="utf-8")
+    policy_path = tmp_path / "policy.yml"
+    policy_path.write_text(source, encoding="utf-8")
+
+    cache = PolicyCache(policy_path)
+    first = cache.get()
+    assert cache.get() is first
+    assert first.policy_hash == load_policy(policy_path).policy_hash
+
+    # Touching the file without changing content keeps the compiled policy.
+    st = policy_path.stat()
+    os.utime(policy_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cache.get() is first
+
+    edited = source.replace('policy_version: "0.1.0"', 'policy_version: "0.1.1"')
+    assert edited != source
+    policy_path.write_text(edited, encoding="utf-8")
+    os.utime(policy_path, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000))
+    with caplog.at_level(logging.INFO, logger="lumyn.policy.loader"):
+        second = cache.get()
+    assert second.policy["policy_version"] == "0.1.1"
+    assert second.policy_hash != first.policy_hash
+    assert second.policy_hash in caplog.text
+    assert cache.policy_text_for(second.policy_hash) == edited
+
+
+def test_policy_cache_keeps_last_good_policy_on_invalid_edit(tmp_path: Path) -> None:
+    policy_path = tmp_path / "policy.yml"
+    policy_path.write_text(
+        Path("policies/lumyn-support.v0.yml").read_text(encoding="utf-8"), encoding="utf-8"
+    )
+    cache = PolicyCache(policy_path)
+    good = cache.get()
+
+    policy_path.write_text("- not a policy\n", encoding="utf-8")
+    assert cache.get() is good
+
+
+def test_policy_cache_picks_up_a_file_created_after_the_builtin_fallback(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = Path("policies/lumyn-support.v0.yml").read_text(encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    cache = PolicyCache("policies/lumyn-support.v0.yml")
+    builtin = cache.get()
+    assert cache.get() is builtin
+
+    policy = yaml.safe_load(source)
+    policy["policy_version"] = "0.2.0"
+    Path("policies").mkdir()
+    Path("policies/lumyn-support.v0.yml").write_text(yaml.safe_dump(policy), encoding="utf-8")
+    local = cache.get()
+    assert local.policy["policy_version"] == "0.2.0"
+    assert local.policy_hash != builtin.policy_hash
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import importlib
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lumyn import DecisionEngine, LumynConfig
+from lumyn.policy.loader import load_policy
+from lumyn.policy.spec import LoadedPolicy
+from lumyn.store.sqlite import SqliteStore
+
+
+def _v0_request() -> dict[str, Any]:
+    return {
+        "schema_version": "decision_request.v0",
+        "subject": {"type": "service", "id": "support-agent", "tenant_id": "acme"},
+        "action": {"type": "support.update_ticket", "intent": "Update ticket"},
+        "evidence": {"ticket_id": "ZD-4002"},
+        "context": {"mode": "digest_only", "digest": "sha256:" + ("a" * 64)},
+    }
+
+
+def _blocking_shadow(loaded: LoadedPolicy, *, verdict: str) -> LoadedPolicy:
+    policy = {
+        **loaded.policy,
+        "policy_version": "shadow",
+        "rules": [
+            {
+                "id": "R-SHADOW-BLOCK",
+                "stage": "HARD_BLOCKS",
+                "then": {"verdict": verdict, "reason_codes": ["SHADOW_BLOCK"]},
+            }
+        ],
+    }
+    return LoadedPolicy(policy=policy, policy_hash="sha256:" + ("f" * 64))
+
+
+def test_shadow_policies_are_reported_without_changing_the_decision(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=tmp_path / "l.db")
+    enforced = load_policy(cfg.policy_path)
+    same = LoadedPolicy(policy=enforced.policy, policy_hash=enforced.policy_hash)
+    blocking = _blocking_shadow(enforced, verdict="ABSTAIN")
+
+    baseline = DecisionEngine(cfg, store=SqliteStore(tmp_path / "b.db")).decide(_v0_request())
+
+    # The enforced and shadow evaluations share the engine's normalized request.
+    evaluator_mod = importlib.import_module("lumyn.engine.evaluator")
+
+    def _no_normalize(request: dict[str, Any]) -> Any:
+        raise AssertionError("request normalized again")
+
+    monkeypatch.setattr(evaluator_mod, "normalize_request", _no_normalize)
+
+    store = SqliteStore(cfg.store_path)
+    engine = DecisionEngine(cfg, store=store)
+    record = engine.decide(_v0_request(), shadow_policies=[same, blocking])
+
+    assert record["verdict"] == baseline["verdict"]
+    assert record["reason_codes"] == baseline["reason_codes"]
+    shadow = record["extensions"]["shadow"]
+    assert [s["policy_hash"] for s in shadow] == [enforced.policy_hash, blocking.policy_hash]
+    assert shadow[0]["verdict"] == baseline["verdict"]
+    assert shadow[0]["reason_codes"] == baseline["reason_codes"]
+    assert shadow[1] == {
+        "policy_id": str(enforced.policy["policy_id"]),
+        "policy_version": "shadow",
+        "policy_hash": blocking.policy_hash,
+        "verdict": "ABSTAIN",
+        "reason_codes": ["SHADOW_BLOCK"],
+        "matched_rules": ["R-SHADOW-BLOCK"],
+    }
+
+    assert store.get_stats().decisions == 1
+    stored = store.get_decision_record(record["decision_id"])
+    assert stored is not None
+    assert stored["extensions"]["shadow"] == shadow
+
+    plain = engine.decide({**_v0_request(), "request_id": "no-shadow"})
+    assert "shadow" not in plain["extensions"]
+
+
+def test_shadow_policies_v1_and_batch(tmp_path: Path) -> None:
+    cfg = LumynConfig(
+        policy_path="policies/starter.v1.yml",
+        store_path=tmp_path / "l.db",
+        memory_enabled=False,
+    )
+    enforced = load_policy(cfg.policy_path)
+    blocking = _blocking_shadow(enforced, verdict="DENY")
+    requests = [
+        json.loads(p.read_text(encoding="utf-8"))["request"]
+        for p in sorted(Path("vectors/v1/evaluation").glob("*.json"))
+    ]
+
+    engine = DecisionEngine(cfg)
+    records = engine.decide_many(requests, shadow_policies=[blocking])
+    single = DecisionEngine(cfg, store=SqliteStore(tmp_path / "s.db")).decide(
+        requests[0], shadow_policies=[blocking]
+    )
+
+    for record in [*records, single]:
+        assert record["extensions"]["shadow"] == [
+            {
+                "policy_id": str(enforced.policy["policy_id"]),
+                "policy_version": "shadow",
+                "policy_hash": blocking.policy_hash,
+                "verdict": "DENY",
+                "reason_codes": ["SHADOW_BLOCK"],
+                "matched_rules": ["R-SHADOW-BLOCK"],
+            }
+        ]
+    assert records[0]["verdict"] == single["verdict"] == "ALLOW"
+
+
+def test_shadow_policy_must_match_the_enforced_schema_version(tmp_path: Path) -> None:
+    cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=tmp_path / "l.db")
+    v1_policy = load_policy("policies/starter.v1.yml")
+    store = SqliteStore(cfg.store_path)
+
+    with pytest.raises(ValueError, match="must be policy.v0"):
+        DecisionEngine(cfg, store=store).decide(_v0_request(), shadow_policies=[v1_policy])
+    store.init()
+    assert store.get_stats().decisions == 0
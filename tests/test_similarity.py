@@ -35,3 +35,58 @@ def test_similarity_is_deterministic_with_ties() -> None:
     assert matches[0].memory_id == "mem_a"
     assert matches[1].memory_id == "mem_b"
     assert matches[2].memory_id == "mem_c"
+
+
+def test_minhash_signature_estimates_jaccard() -> None:
+    import pytest
+
+    from lumyn.engine.similarity import LshConfig, lsh_buckets, minhash_signature
+
+    a = {f"t{i}" for i in range(40)}
+    b = {f"t{i}" for i in range(20, 60)}  # Jaccard 1/3
+    sig_a = minhash_signature(a, num_perm=256)
+    sig_b = minhash_signature(b, num_perm=256)
+    estimate = sum(x == y for x, y in zip(sig_a, sig_b, strict=True)) / 256
+    assert abs(estimate - 1 / 3) < 0.1
+
+    assert minhash_signature(sorted(a), num_perm=256) == sig_a
+    assert lsh_buckets(sig_a, bands=32) == lsh_buckets(minhash_signature(a, num_perm=256), bands=32)
+    near = minhash_signature(a - {"t0"}, num_perm=256)  # Jaccard 39/40
+    assert set(lsh_buckets(sig_a, bands=32)) & set(lsh_buckets(near, bands=32))
+
+    with pytest.raises(ValueError, match="num_perm"):
+        LshConfig(num_perm=60, bands=16)
+
+
+def test_top_k_matches_streams_and_agrees_with_a_full_sort() -> None:
+    import random
+
+    from lumyn.engine.similarity import weighted_jaccard
+
+    rng = random.Random(5)
+    tokens = ["a", "b", "c", "d", "e", "f"]
+    candidates = [
+        {
+            "memory_id": f"mem_{rng.randrange(400):03d}",
+            "label": "failure",
+            "feature": {t: 1 for t in rng.sample(tokens, rng.randint(0, 6))},
+        }
+        for _ in range(300)
+    ]
+    for weights in (None, {"a": 3.0, "b": 0.5}):
+        for top_k in (1, 5, 50, 500):
+            query = {t: 1 for t in rng.sample(tokens, rng.randint(1, 6))}
+            expected = sorted(
+                (
+                    (weighted_jaccard(query, c["feature"], weights=weights), c["memory_id"])
+                    for c in candidates
+                ),
+                key=lambda m: (-m[0], m[1]),
+            )[:top_k]
+            matches = top_k_matches(
+                query_feature=query,
+                candidates=(c for c in candidates),
+                top_k=top_k,
+                weights=weights,
+            )
+            assert [(m.score, m.memory_id) for m in matches] == expected
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any
 
+import pytest
+
+from lumyn.engine.similarity import LshConfig
 from lumyn.store.sqlite import SqliteStore
 
 
@@ -87,3 +91,383 @@ def test_sqlite_store_memory_items_roundtrip(tmp_path: Path) -> None:
     assert len(items) == 1
     assert items[0].memory_id == "mem_0001"
     assert items[0].feature["amount_bucket"] == "small"
+
+
+def test_sqlite_store_pools_one_connection_per_thread(tmp_path: Path) -> None:
+    import threading
+
+    store = SqliteStore(tmp_path / "lumyn.db")
+    store.init()
+    for _ in range(5):
+        store.get_stats()
+    assert store.connections_opened == 1
+
+    worker = threading.Thread(target=store.get_stats)
+    worker.start()
+    worker.join()
+    assert store.connections_opened == 2
+
+    store.close()
+    assert store.get_stats().decisions == 0
+    assert store.connections_opened == 3
+
+
+def test_sqlite_store_closes_connections_of_exited_threads(tmp_path: Path) -> None:
+    import gc
+    import threading
+
+    store = SqliteStore(tmp_path / "lumyn.db")
+    store.init()
+    for _ in range(50):
+        worker = threading.Thread(target=store.get_stats)
+        worker.start()
+        worker.join()
+    gc.collect()
+    assert store.connections_opened == 51
+    # Only the main thread's connection is still open.
+    assert len(store._connections) == 1
+    assert store.get_stats().decisions == 0
+
+
+def test_sqlite_store_unpooled_connects_per_call(tmp_path: Path) -> None:
+    store = SqliteStore(tmp_path / "lumyn.db", pooled=False)
+    store.init()
+    store.get_stats()
+    assert store.connections_opened == 2
+
+
+def test_sqlite_store_init_runs_migrations_once(tmp_path: Path) -> None:
+    from lumyn.store.sqlite import SCHEMA_VERSION
+
+    db_path = tmp_path / "lumyn.db"
+    SqliteStore(db_path).init()
+
+    store = SqliteStore(db_path)
+    statements: list[str] = []
+    store.connect().set_trace_callback(statements.append)
+    store.init()
+    store.init()
+
+    assert store.schema_version() == SCHEMA_VERSION
+    assert not [s for s in statements if "CREATE" in s.upper()]
+
+
+def test_sqlite_store_init_adopts_untracked_database(tmp_path: Path) -> None:
+    import sqlite3
+
+    from lumyn.store.sqlite import SCHEMA_VERSION
+
+    db_path = tmp_path / "lumyn.db"
+    schema = Path("src/lumyn/store/schema.sql").read_text(encoding="utf-8")
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(schema)
+        conn.execute(
+            "INSERT INTO policy_snapshots VALUES (?, ?, ?, ?, ?)",
+            ("sha256:x", "p", "1", "2026-01-01T00:00:00Z", "t"),
+        )
+    conn.close()
+
+    store = SqliteStore(db_path)
+    assert store.schema_version() == 0
+    store.init()
+    assert store.schema_version() == SCHEMA_VERSION
+    assert store.get_stats().policy_snapshots == 1
+
+
+def _memory_feature(rng: Any, action_type: str) -> dict[str, Any]:
+    return {
+        "action_type": action_type,
+        "amount_currency": rng.choice(["USD", "EUR", None]),
+        "amount_usd_bucket": rng.choice(["small", "medium", "large", None]),
+        "tags": rng.sample(["vip", "duplicate_charge", "fraud", "late", "b2b"], rng.randint(0, 3)),
+    }
+
+
+def test_sqlite_store_top_k_memory_matches_agree_with_exact_scan(tmp_path: Path) -> None:
+    import random
+
+    from lumyn.engine.similarity import feature_tokens, top_k_matches
+
+    rng = random.Random(21)
+    store = SqliteStore(tmp_path / "lumyn.db")
+    store.init()
+    items = []
+    for i in range(600):
+        tenant_id = rng.choice(["acme", None])
+        action_type = rng.choice(["support.refund", "support.update_ticket"])
+        feature = _memory_feature(rng, action_type)
+        if i % 50 == 0:
+            feature = {"unrelated": i}
+        items.append(
+            store.add_memory_item(
+                tenant_id=tenant_id,
+                label=rng.choice(["failure", "success"]),
+                action_type=action_type,
+                feature=feature,
+                summary=f"item {i}",
+                source_decision_id=None,
+                memory_id=f"mem_{i:04d}",
+            )
+        )
+    # Scored by SQLite through the token index instead of the in-process scope cache.
+    uncached = SqliteStore(tmp_path / "lumyn.db", memory_cache_items=0)
+
+    for q in range(60):
+        tenant_id = rng.choice(["acme", None])
+        action_type = rng.choice(["support.refund", "support.update_ticket"])
+        query = _memory_feature(rng, action_type)
+        if q % 4 == 0:
+            # Shares nothing but the scope's action_type token with any item.
+            query = {"action_type": action_type, "tags": ["never-seen"]}
+        top_k = rng.choice([1, 5, 40])
+        scope = [i for i in items if i.tenant_id == tenant_id and i.action_type == action_type]
+        expected = top_k_matches(
+            query_feature=query,
+            candidates=[
+                {
+                    "memory_id": i.memory_id,
+                    "label": i.label,
+                    "feature": i.feature,
+                    "summary": i.summary,
+                }
+                for i in scope
+            ],
+            top_k=len(scope),
+        )
+        expected = [m for m in expected if m.score > 0][:top_k]
+        streamed = top_k_matches(
+            query_feature=query,
+            candidates=store.iter_memory_candidates(tenant_id=tenant_id, action_type=action_type),
+            top_k=top_k,
+        )
+        assert [m for m in streamed if m.score > 0] == expected
+        for lookup in (store, uncached):
+            got = lookup.top_k_memory_matches(
+                tenant_id=tenant_id,
+                action_type=action_type,
+                tokens=feature_tokens(query),
+                top_k=top_k,
+            )
+            assert got == expected
+
+
+def test_sqlite_store_migration_indexes_existing_memory_items(tmp_path: Path) -> None:
+    import sqlite3
+
+    db_path = tmp_path / "lumyn.db"
+    schema = Path("src/lumyn/store/schema.sql").read_text(encoding="utf-8")
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(schema)
+        conn.execute(
+            "INSERT INTO memory_items VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                "mem_old",
+                "acme",
+                "2026-01-01T00:00:00Z",
+                "failure",
+                "support.refund",
+                '{"action_type":"support.refund","tags":["vip"]}',
+                "old",
+                None,
+            ),
+        )
+    conn.close()
+
+    store = SqliteStore(db_path)
+    store.init()
+    matches = store.top_k_memory_matches(
+        tenant_id="acme",
+        action_type="support.refund",
+        tokens={"action_type=support.refund", "tags[]=late"},
+        top_k=5,
+    )
+    assert [(m.memory_id, m.score) for m in matches] == [("mem_old", 1 / 3)]
+    # LSH is opt-in: nothing is bucketed until a store using it asks.
+    assert store.connect().execute("SELECT COUNT(*) FROM memory_lsh_buckets").fetchone()[0] == 0
+    approximate = SqliteStore(db_path, lsh=LshConfig()).approximate_top_k_memory_matches(
+        tenant_id="acme",
+        action_type="support.refund",
+        query_feature={"action_type": "support.refund", "tags": ["vip"]},
+        top_k=5,
+    )
+    assert [(m.memory_id, m.score) for m in approximate] == [("mem_old", 1.0)]
+
+
+def test_sqlite_store_memory_scope_cache_tracks_new_items(tmp_path: Path) -> None:
+    db_path = tmp_path / "lumyn.db"
+    store = SqliteStore(db_path)
+    store.init()
+    other = SqliteStore(db_path)  # e.g. `lumyn label` in another process
+
+    def add(target: SqliteStore, memory_id: str, tags: list[str]) -> None:
+        target.add_memory_item(
+            tenant_id="acme",
+            label="failure",
+            action_type="support.refund",
+            feature={"action_type": "support.refund", "tags": tags},
+            summary=memory_id,
+            source_decision_id=None,
+            memory_id=memory_id,
+        )
+
+    def lookup() -> list[tuple[str, float]]:
+        matches = store.top_k_memory_matches(
+            tenant_id="acme",
+            action_type="support.refund",
+            tokens={"action_type=support.refund", "tags[]=vip"},
+            top_k=5,
+        )
+        return [(m.memory_id, m.score) for m in matches]
+
+    add(store, "mem_a", [])
+    assert lookup() == [("mem_a", 0.5)]
+
+    statements: list[str] = []
+    store.connect().set_trace_callback(statements.append)
+    assert lookup() == [("mem_a", 0.5)]
+    assert len(statements) == 1 and "memory_scopes" in statements[0]
+
+    add(store, "mem_b", ["late"])
+    assert lookup() == [("mem_a", 0.5), ("mem_b", 1 / 3)]
+    add(other, "mem_c", ["vip"])
+    assert lookup() == [("mem_c", 1.0), ("mem_a", 0.5), ("mem_b", 1 / 3)]
+
+
+def test_sqlite_store_approximate_memory_matches_rank_lsh_candidates_exactly(
+    tmp_path: Path,
+) -> None:
+    import random
+
+    from lumyn.engine.similarity import feature_tokens, weighted_jaccard
+
+    rng = random.Random(23)
+    store = SqliteStore(tmp_path / "lumyn.db", lsh=LshConfig())
+    store.init()
+    features: dict[str, dict[str, Any]] = {}
+    for i in range(300):
+        feature = _memory_feature(rng, "support.refund")
+        features[f"mem_{i:04d}"] = feature
+        store.add_memory_item(
+            tenant_id="acme",
+            label="failure",
+            action_type="support.refund",
+            feature=feature,
+            summary=f"item {i}",
+            source_decision_id=None,
+            memory_id=f"mem_{i:04d}",
+        )
+
+    for _ in range(30):
+        query = _memory_feature(rng, "support.refund")
+        exact = store.top_k_memory_matches(
+            tenant_id="acme",
+            action_type="support.refund",
+            tokens=feature_tokens(query),
+            top_k=5,
+        )
+        approximate = store.approximate_top_k_memory_matches(
+            tenant_id="acme", action_type="support.refund", query_feature=query, top_k=5
+        )
+        assert 0 < len(approximate) <= 5
+        for m in approximate:
+            assert m.score == weighted_jaccard(query, features[m.memory_id]) > 0
+        # Identical items always share every band, so the best exact score is always found.
+        if exact[0].score == 1.0:
+            assert approximate[0].score == 1.0
+        assert (
+            store.approximate_top_k_memory_matches(
+                tenant_id=None, action_type="support.refund", query_feature=query, top_k=5
+            )
+            == []
+        )
+
+    # Another configuration buckets the existing items on first use, and every writer
+    # (including stores without LSH) buckets new items under each registered configuration.
+    wide = SqliteStore(tmp_path / "lumyn.db", lsh=LshConfig(num_perm=32, bands=32))
+    [match] = wide.approximate_top_k_memory_matches(
+        tenant_id="acme", action_type="support.refund", query_feature=features["mem_0007"], top_k=1
+    )
+    assert match.score == 1.0
+    plain = SqliteStore(tmp_path / "lumyn.db")
+    feature = _memory_feature(rng, "support.refund")
+    plain.add_memory_item(
+        tenant_id="acme",
+        label="success",
+        action_type="support.refund",
+        feature=feature,
+        summary="new",
+        source_decision_id=None,
+        memory_id="mem_new",
+    )
+    for lookup in (store, wide):
+        [match] = lookup.approximate_top_k_memory_matches(
+            tenant_id="acme", action_type="support.refund", query_feature=feature, top_k=1
+        )
+        assert match.score == 1.0
+    with pytest.raises(ValueError, match="LshConfig"):
+        plain.approximate_top_k_memory_matches(
+            tenant_id="acme", action_type="support.refund", query_feature=feature, top_k=1
+        )
+
+
+def test_sqlite_store_memory_lookup_reads_fewer_items_than_the_scope(tmp_path: Path) -> None:
+    import dataclasses
+
+    from lumyn.engine.similarity import feature_tokens
+
+    store = SqliteStore(tmp_path / "lumyn.db")
+    store.init()
+    for i in range(400):
+        store.add_memory_item(
+            tenant_id="acme",
+            label="failure",
+            action_type="support.refund",
+            feature={
+                "action_type": "support.refund",
+                "amount_currency": "USD" if i % 20 else "EUR",
+                "tags": [f"order_{i}", "vip" if i % 40 == 1 else "standard"],
+            },
+            summary=f"item {i}",
+            source_decision_id=None,
+            memory_id=f"mem_{i:04d}",
+        )
+    uncached = SqliteStore(tmp_path / "lumyn.db", memory_cache_items=0)
+
+    def lookup(target: SqliteStore, feature: dict[str, Any]) -> list[Any]:
+        return target.top_k_memory_matches(
+            tenant_id="acme",
+            action_type="support.refund",
+            tokens=feature_tokens(feature),
+            top_k=5,
+        )
+
+    common = {"action_type": "support.refund", "amount_currency": "USD", "tags": ["vip"]}
+    rare = {"action_type": "support.refund", "tags": ["order_7", "vip"]}
+    expected = {"common": lookup(uncached, common), "rare": lookup(uncached, rare)}
+    assert lookup(store, common) == expected["common"]  # loads the scope cache
+
+    # Count the items read from the in-process postings.
+    read: list[int] = []
+
+    class _Counted(tuple[int, ...]):
+        def __iter__(self) -> Any:
+            read.append(len(self))
+            return super().__iter__()
+
+    [(key, scope)] = store._memory_scopes.items()
+    store._memory_scopes[key] = dataclasses.replace(
+        scope, postings={t: _Counted(items) for t, items in scope.postings.items()}
+    )
+    # The scope's action_type token is not indexed, and the top 5 by `vip` (10 items) outscore
+    # anything the nearly universal `amount_currency=USD` could still add.
+    assert lookup(store, common) == expected["common"]
+    assert sum(read) == 10
+    read.clear()
+    assert lookup(store, rare) == expected["rare"]
+    assert sum(read) == 11
+
+    indexed = store.connect().execute(
+        "SELECT COUNT(DISTINCT memory_id) FROM memory_tokens "
+        "WHERE token IN ('action_type=support.refund', 'tags[]=order_7', 'tags[]=vip')"
+    )
+    assert indexed.fetchone()[0] == 11
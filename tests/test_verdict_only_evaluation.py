@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lumyn import DecisionEngine, LumynConfig
+from lumyn.engine.evaluator import evaluate_policy
+from lumyn.engine.evaluator_v1 import evaluate_policy_v1
+from lumyn.policy.loader import load_policy
+
+V0_POLICIES = [
+    "policies/lumyn-support.v0.yml",
+    "policies/packs/lumyn-account.v0.yml",
+    "policies/packs/lumyn-billing.v0.yml",
+]
+
+
+def _requests(root: str) -> list[dict[str, Any]]:
+    out = []
+    for path in sorted(Path(root).rglob("*.json")):
+        request = json.loads(path.read_text(encoding="utf-8"))["request"]
+        out.append(request)
+        for amount in (0, 60, 250, 5000):
+            action = {**request["action"], "amount": {"value": amount, "currency": "USD"}}
+            out.append({**request, "action": action})
+        out.append({**request, "evidence": {}})
+    return out
+
+
+def _check(full: Any, fast: Any) -> None:
+    assert fast.verdict == full.verdict
+    assert fast.partial and not full.partial
+    full_ids = [r.rule_id for r in full.matched_rules]
+    assert all(r.rule_id in full_ids for r in fast.matched_rules)
+    assert len(fast.matched_rules) <= len(full.matched_rules)
+
+
+@pytest.mark.parametrize("policy_path", V0_POLICIES)
+def test_verdict_only_matches_full_verdict_v0(policy_path: str) -> None:
+    loaded = load_policy(policy_path)
+    policy = dict(loaded.policy)
+    for request in _requests("vectors/v0"):
+        full = evaluate_policy(request, policy=policy, policy_hash=loaded.policy_hash)
+        fast = evaluate_policy(
+            request, policy=policy, policy_hash=loaded.policy_hash, verdict_only=True
+        )
+        _check(full, fast)
+
+
+def test_verdict_only_matches_full_verdict_v1() -> None:
+    loaded = load_policy("policies/starter.v1.yml")
+    policy = dict(loaded.policy)
+    for request in _requests("vectors/v1/evaluation"):
+        full = evaluate_policy_v1(request, policy=policy)
+        _check(full, evaluate_policy_v1(request, policy=policy, verdict_only=True))
+
+
+def test_verdict_only_stops_once_the_verdict_is_settled() -> None:
+    policy: dict[str, Any] = {
+        "required_evidence": {"a": ["ticket_id"]},
+        "rules": [
+            {
+                "id": "R-MISSING",
+                "stage": "REQUIREMENTS",
+                "then": {"verdict": "ABSTAIN", "reason_codes": ["MISSING"]},
+            },
+            {
+                "id": "R-BROKEN",
+                "stage": "HARD_BLOCKS",
+                "if": {"amount_usd_gt": "lots"},
+                "then": {"verdict": "ABSTAIN", "reason_codes": ["BROKEN"]},
+            },
+            {
+                "id": "R-ESCALATE",
+                "stage": "ESCALATIONS",
+                "then": {"verdict": "ESCALATE", "reason_codes": ["ESC"]},
+            },
+        ],
+    }
+    request = {"action": {"type": "a", "amount": {"value": 10, "currency": "USD"}}}
+    with pytest.raises(ValueError):
+        evaluate_policy(request, policy=policy)
+
+    fast = evaluate_policy(request, policy=policy, verdict_only=True)
+    assert fast.verdict == "ABSTAIN"
+    assert fast.reason_codes == ["MISSING"]
+    assert [r.rule_id for r in fast.matched_rules] == ["R-MISSING"]
+
+
+def _v0_request(request_id: str) -> dict[str, Any]:
+    return {
+        "schema_version": "decision_request.v0",
+        "request_id": request_id,
+        "subject": {"type": "service", "id": "support-agent", "tenant_id": "acme"},
+        "action": {"type": "support.update_ticket", "intent": "Update ticket"},
+        "evidence": {"ticket_id": "ZD-4002"},
+        "context": {"mode": "digest_only", "digest": "sha256:" + ("a" * 64)},
+    }
+
+
+def test_verdict_only_records_are_marked_partial(tmp_path: Path) -> None:
+    base = {"policy_path": "policies/lumyn-support.v0.yml"}
+    full = DecisionEngine(LumynConfig(**base, store_path=tmp_path / "f.db")).decide(
+        _v0_request("r1")
+    )
+    fast = DecisionEngine(
+        LumynConfig(**base, store_path=tmp_path / "v.db", evaluation_mode="verdict_only")
+    ).decide(_v0_request("r1"))
+
+    assert fast["verdict"] == full["verdict"]
+    assert "evaluation" not in full["extensions"]
+    assert fast["extensions"]["evaluation"] == {
+        "mode": "verdict_only",
+        "partial_explanation": True,
+    }
+
+    with pytest.raises(ValueError, match="evaluation_mode"):
+        DecisionEngine(LumynConfig(**base, store_path=tmp_path / "x.db", evaluation_mode="fast"))
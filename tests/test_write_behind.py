@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lumyn import DecisionEngine, LumynConfig
+from lumyn.store.sqlite import SqliteStore
+from lumyn.store.write_behind import GroupCommitWriter
+
+
+def _request(i: int, *, request_id: str | None = None) -> dict[str, Any]:
+    request: dict[str, Any] = {
+        "schema_version": "decision_request.v0",
+        "subject": {"type": "service", "id": "support-agent", "tenant_id": "acme"},
+        "action": {"type": "support.update_ticket", "intent": "Update ticket"},
+        "evidence": {"ticket_id": f"ZD-{i}"},
+        "context": {"mode": "digest_only", "digest": "sha256:" + f"{i:064x}"},
+    }
+    if request_id is not None:
+        request["request_id"] = request_id
+    return request
+
+
+def _counting_store(path: Path) -> tuple[SqliteStore, list[int]]:
+    store = SqliteStore(path)
+    groups: list[int] = []
+    real_put_many = store.put_decision_records
+
+    def _counting_put_many(records: Any) -> None:
+        groups.append(len(records))
+        real_put_many(records)
+
+    store.put_decision_records = _counting_put_many  # type: ignore[method-assign]
+    return store, groups
+
+
+def test_group_commit_batches_concurrent_decisions(tmp_path: Path) -> None:
+    cfg = LumynConfig(
+        policy_path="policies/lumyn-support.v0.yml",
+        store_path=tmp_path / "l.db",
+        persistence="group_commit",
+        write_flush_interval_ms=50.0,
+    )
+    store, groups = _counting_store(cfg.store_path)
+    engine = DecisionEngine(cfg, store=store)
+    engine.warmup()
+
+    records: list[dict[str, Any]] = []
+    threads = [
+        threading.Thread(target=lambda i=i: records.append(engine.decide(_request(i))))
+        for i in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.close()
+
+    # group_commit returns only after the commit: everything is readable already.
+    assert len(records) == 8
+    for record in records:
+        assert store.get_decision_record(record["decision_id"]) == record
+    assert sum(groups) == 8
+    assert len(groups) < 8
+
+
+def test_enqueue_durability_flushes_on_close_and_keeps_idempotency(tmp_path: Path) -> None:
+    cfg = LumynConfig(
+        policy_path="policies/lumyn-support.v0.yml",
+        store_path=tmp_path / "l.db",
+        persistence="enqueue",
+        write_flush_interval_ms=200.0,
+    )
+    engine = DecisionEngine(cfg)
+
+    first = engine.decide(_request(1, request_id="req-1"))
+    again = engine.decide(_request(1, request_id="req-1"))
+    assert again["decision_id"] == first["decision_id"]
+
+    engine.close()
+    assert engine.store.get_stats().decisions == 1
+    assert engine.store.get_decision_record(first["decision_id"]) == first
+
+
+def test_enqueued_records_ignore_later_changes_to_the_request(tmp_path: Path) -> None:
+    import copy
+
+    cfg = LumynConfig(
+        policy_path="policies/lumyn-support.v0.yml",
+        store_path=tmp_path / "l.db",
+        persistence="enqueue",
+        write_flush_interval_ms=200.0,
+    )
+    engine = DecisionEngine(cfg)
+    request = _request(1, request_id="req-1")
+    request["action"]["tags"] = ["vip"]
+
+    record = engine.decide(request)
+    snapshot = copy.deepcopy(record)
+    request["action"]["tags"].append("changed-after-decide")
+    request["evidence"]["ticket_id"] = "ZD-CHANGED"
+
+    # Idempotent replays of the still-queued record see it as decided, too.
+    assert engine.decide(_request(1, request_id="req-1"))["request"] == snapshot["request"]
+    engine.close()
+    assert engine.store.get_decision_record(record["decision_id"]) == snapshot
+
+
+@pytest.mark.parametrize("persistence", ["group_commit", "enqueue"])
+def test_write_behind_abstains_if_storage_unavailable(tmp_path: Path, persistence: str) -> None:
+    cfg = LumynConfig(
+        policy_path="policies/lumyn-support.v0.yml",
+        store_path=tmp_path / "l.db",
+        persistence=persistence,
+    )
+    store = SqliteStore(cfg.store_path)
+
+    def _boom(_: Any) -> None:
+        raise OSError("disk full")
+
+    store.put_decision_records = _boom  # type: ignore[method-assign]
+    engine = DecisionEngine(cfg, store=store)
+
+    first = engine.decide(_request(1))
+    if persistence == "enqueue":
+        # The failure is only observed once the group commit runs.
+        assert first["verdict"] != "ABSTAIN"
+        writer = engine._write_behind()
+        assert writer is not None
+        writer.flush()
+        first = engine.decide(_request(2))
+    engine.close()
+
+    assert first["verdict"] == "ABSTAIN"
+    assert "STORAGE_UNAVAILABLE" in first["reason_codes"]
+
+
+def test_conflicting_idempotency_key_fails_only_its_own_write(tmp_path: Path) -> None:
+    cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=tmp_path / "l.db")
+    engine = DecisionEngine(cfg)
+    existing = engine.decide(_request(1, request_id="req-1"))
+    duplicate = dict(existing, decision_id="01DUPLICATEDECISION0000000")
+    fresh = dict(existing, decision_id="01FRESHDECISION00000000000")
+    fresh["request"] = dict(existing["request"], request_id="req-2")
+
+    writer = GroupCommitWriter(engine.store, durability="enqueue", flush_interval_ms=200.0)
+    writer.submit(duplicate)
+    writer.submit(fresh)
+    writer.close()
+
+    assert engine.store.get_decision_record(fresh["decision_id"]) == fresh
+    assert engine.store.get_decision_record(duplicate["decision_id"]) is None
+
+    writer = GroupCommitWriter(engine.store, durability="group_commit")
+    with pytest.raises(sqlite3.IntegrityError):
+        writer.submit(duplicate)
+    # Its pending entry is gone by the time the caller is woken with the error.
+    assert writer.pending_record(tenant_key="acme", request_id="req-1") is None
+    writer.close()
+
+
+def test_closed_writer_rejects_records_instead_of_hanging(tmp_path: Path) -> None:
+    cfg = LumynConfig(policy_path="policies/lumyn-support.v0.yml", store_path=tmp_path / "l.db")
+    engine = DecisionEngine(cfg)
+    record = engine.decide(_request(1))
+    writer = GroupCommitWriter(engine.store, durability="group_commit")
+    writer.close()
+    writer.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.submit(dict(record, decision_id="01CLOSEDDECISION0000000000"))
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.flush()